@@ -0,0 +1,4 @@
+"""
+性能基准测试包
+基准脚本需在项目根目录下以模块方式运行，例如：python -m benchmarks.bench_driver_pool
+"""
@@ -0,0 +1,74 @@
+"""
+浏览器配置档对比基准
+分别使用 default / fast 配置档打开本地登录页替身并执行登录用例，
+输出页面加载耗时（Navigation Timing）和单个用例耗时
+
+运行方式：
+    python -m benchmarks.bench_browser_profile [用例数量]
+"""
+import sys
+import time
+from config.config import Config
+from pages.login_page import LoginPage
+from utils.driver_factory import DriverFactory
+from benchmarks.standin_server import serve_standin, summarize
+
+NAVIGATION_TIMING_JS = """
+var nav = performance.getEntriesByType('navigation')[0];
+return nav ? {dcl: nav.domContentLoadedEventEnd, load: nav.loadEventEnd} : null;
+"""
+
+
+def bench_profile(profile, rounds):
+    """
+    使用指定配置档运行若干次登录用例
+
+    Returns:
+        (DOMContentLoaded 耗时列表, load 耗时列表, 用例耗时列表)，单位秒
+    """
+    Config.BROWSER_PROFILE = profile
+    dcl, load, total = [], [], []
+    driver = DriverFactory.get_driver()
+    try:
+        for i in range(rounds):
+            start = time.perf_counter()
+            login_page = LoginPage(driver)
+            login_page.navigate_to_login()
+            timing = driver.execute_script(NAVIGATION_TIMING_JS)
+            if i % 2:
+                login_page.login('invalid_user', 'password123')
+                assert login_page.is_login_failed() or not login_page.is_login_successful()
+            else:
+                login_page.login('jkcsdw', '123456')
+                assert login_page.is_login_successful()
+            total.append(time.perf_counter() - start)
+            if timing:
+                dcl.append(timing['dcl'] / 1000)
+                load.append(timing['load'] / 1000)
+            driver.delete_all_cookies()
+            driver.execute_script("localStorage.clear(); sessionStorage.clear();")
+    finally:
+        driver.quit()
+    return dcl, load, total
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    results = {}
+    with serve_standin() as base_url:
+        Config.BASE_URL = f'{base_url}/login.html'
+        for profile in ('default', 'fast'):
+            results[profile] = bench_profile(profile, rounds)
+
+    print(f"\n配置档对比（毫秒为页面加载，秒为用例耗时），用例数: {rounds}")
+    print(f"{'配置档':<10}{'DCL(ms)':>10}{'load(ms)':>10}{'用例中位数(s)':>16}{'用例总计(s)':>14}")
+    for profile, (dcl, load, total) in results.items():
+        s_dcl = summarize(dcl)['median'] * 1000 if dcl else float('nan')
+        s_load = summarize(load)['median'] * 1000 if load else float('nan')
+        s_total = summarize(total)
+        print(f"{profile:<10}{s_dcl:>10.1f}{s_load:>10.1f}{s_total['median']:>16.2f}{s_total['total']:>14.2f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,75 @@
+"""
+测试数据编译缓存基准测试
+对比直接解析 xlsx/csv 与读取编译缓存（reports/.datacache/*.tdc）的加载耗时
+
+无需浏览器
+运行方式：
+    python -m benchmarks.bench_data_cache [行数 ...]
+"""
+import csv
+import sys
+import tempfile
+import time
+from pathlib import Path
+import openpyxl
+from test_data import compiled_cache
+from test_data.test_data_config import TestDataConfig
+
+HEADERS = ['username', 'password', 'description', 'expected_result']
+
+
+def make_row(i):
+    return [f'user{i:06d}', f'P@ssw0rd{i}', f'边界值用例 {i}', 'failure' if i % 3 else 'success']
+
+
+def build_files(base_path, rows):
+    xlsx_file = base_path / f'rows{rows}_test_data.xlsx'
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet('data')
+    sheet.append(HEADERS)
+    for i in range(rows):
+        sheet.append(make_row(i))
+    workbook.save(xlsx_file)
+
+    csv_file = base_path / f'rows{rows}_test_data.csv'
+    with open(csv_file, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADERS)
+        writer.writerows(make_row(i) for i in range(rows))
+    return {'xlsx': xlsx_file, 'csv': csv_file}
+
+
+def timed(func, repeat=1):
+    """返回 (最短耗时秒, 结果)"""
+    best, result = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1000, 100000]
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        base_path = Path(tmp)
+        for rows in sizes:
+            for fmt, source in build_files(base_path, rows).items():
+                cache_file = base_path / f'{source.name}.tdc'
+                parse_time, data = timed(lambda: TestDataConfig._parse_file(source, fmt))
+                compile_time, _ = timed(lambda: compiled_cache.write(cache_file, source, data))
+                cached_time, cached = timed(lambda: compiled_cache.read(cache_file, source), repeat=3)
+                assert cached == data
+                results.append((rows, fmt, parse_time, compile_time, cached_time, cache_file.stat().st_size))
+
+    print(f"\n{'行数':>8}{'格式':>6}{'解析(s)':>12}{'编译(s)':>12}{'缓存读取(s)':>14}{'加速比':>10}{'缓存大小(KB)':>14}")
+    for rows, fmt, parse_time, compile_time, cached_time, size in results:
+        print(f"{rows:>8}{fmt:>6}{parse_time:>12.4f}{compile_time:>12.4f}{cached_time:>14.4f}"
+              f"{parse_time / cached_time:>9.1f}x{size / 1024:>14.1f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
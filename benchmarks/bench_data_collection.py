@@ -0,0 +1,82 @@
+"""
+测试数据收集基准测试
+模拟 pytest 收集阶段：数百个模块各自在 parametrize 中调用 get_test_data，
+对比旧方式（每次调用 exists + rglob + 解析）、注册表冷启动（首个 worker）、
+注册表磁盘缓存命中（其余 worker）三种情况的耗时
+
+无需浏览器
+运行方式：
+    python -m benchmarks.bench_data_collection [模块数] [每个文件行数]
+"""
+import csv
+import sys
+import tempfile
+import time
+from pathlib import Path
+from test_data.test_data_config import TestDataConfig
+
+
+def build_dataset(base_path, modules, rows):
+    """生成 modules 个模块的 CSV 数据文件（分散在若干子目录中）"""
+    for i in range(modules):
+        folder = base_path / f'group_{i % 10}'
+        folder.mkdir(parents=True, exist_ok=True)
+        with open(folder / f'module{i}_test_data.csv', 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['username', 'password', 'description', 'expected_result'])
+            for r in range(rows):
+                writer.writerow([f'user{r}', f'pwd{r}', f'边界值用例 {r}', 'failure'])
+
+
+def legacy_load(base_path, module_name, data_format='auto'):
+    """旧版 load_test_data 的查找方式：每次调用都 exists + rglob，然后重新解析"""
+    for fmt in ['csv', 'json', 'xlsx']:
+        file_path = base_path / f'{module_name}_test_data.{fmt}'
+        if file_path.exists():
+            return TestDataConfig._parse_file(file_path, fmt)
+        matches = list(base_path.rglob(f'{module_name}_test_data.{fmt}'))
+        if matches:
+            return TestDataConfig._parse_file(matches[0], fmt)
+    raise FileNotFoundError(module_name)
+
+
+def collect(loader, modules, calls_per_module):
+    start = time.perf_counter()
+    for i in range(modules):
+        for _ in range(calls_per_module):
+            loader(f'module{i}')
+    return time.perf_counter() - start
+
+
+def main():
+    modules = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    rows = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    calls_per_module = 2  # 同一数据文件通常被多个用例 parametrize 引用
+
+    with tempfile.TemporaryDirectory() as tmp:
+        base_path = Path(tmp) / 'test_type'
+        build_dataset(base_path, modules, rows)
+        TestDataConfig.DATA_DIR = base_path
+        TestDataConfig.CACHE_DIR = Path(tmp) / '.datacache'
+        TestDataConfig.DISK_CACHE = True
+
+        legacy = collect(lambda m: legacy_load(base_path, m), modules, calls_per_module)
+
+        TestDataConfig._registry = None
+        TestDataConfig.invalidate_cache()
+        cold = collect(TestDataConfig.load_test_data, modules, calls_per_module)
+
+        # 新进程（其他 worker）：内存缓存为空，磁盘缓存已存在
+        TestDataConfig._registry = None
+        warm = collect(TestDataConfig.load_test_data, modules, calls_per_module)
+
+    print(f"\n模块数: {modules}，每个文件 {rows} 行，每个模块调用 {calls_per_module} 次")
+    print(f"{'场景':<28}{'收集耗时(s)':>12}")
+    print(f"{'旧方式 rglob + 解析':<28}{legacy:>12.2f}")
+    print(f"{'注册表冷启动（首个 worker）':<28}{cold:>12.2f}")
+    print(f"{'注册表磁盘缓存（其余 worker）':<28}{warm:>12.2f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,112 @@
+"""
+测试数据内存基准测试
+使用 tracemalloc 对比旧的整表加载方式与流式读取（iter_test_data）的内存峰值
+
+无需浏览器
+运行方式：
+    python -m benchmarks.bench_data_memory [CSV/JSON 行数] [Excel 行数]
+"""
+import csv
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+import openpyxl
+from test_data.test_data_config import TestDataConfig
+
+HEADERS = ['username', 'password', 'description', 'expected_result', 'comment']
+
+
+def make_row(i):
+    return [f'user{i:06d}', f'P@ssw0rd{i}', f'边界值用例 {i}', 'failure', '批量生成的账号数据']
+
+
+def build_files(base_path, rows, xlsx_rows):
+    with open(base_path / 'bulk_test_data.csv', 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADERS)
+        f.write('# 注释行会被跳过\n')
+        for i in range(rows):
+            writer.writerow(make_row(i))
+
+    with open(base_path / 'bulk_test_data.json', 'w', encoding='utf-8') as f:
+        json.dump({'bulk_test_data': [dict(zip(HEADERS, make_row(i))) for i in range(rows)]}, f, ensure_ascii=False)
+
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet('data')
+    sheet.append(HEADERS)
+    for i in range(xlsx_rows):
+        sheet.append(make_row(i))
+    workbook.save(base_path / 'bulk_test_data.xlsx')
+
+
+def legacy_csv(path):
+    """旧版 _load_csv_data：先把所有行读入列表，再构造字典列表"""
+    data = []
+    with open(path, 'r', encoding='utf-8') as file:
+        lines = [line for line in file if line.strip() and not line.strip().startswith('#')]
+        for row in csv.DictReader(lines):
+            row_dict = dict(row)
+            if any(value.strip() if isinstance(value, str) else value for value in row_dict.values()):
+                data.append(row_dict)
+    return data
+
+
+def legacy_json(path):
+    """旧版 _load_json_data：json.load 整个文件"""
+    with open(path, 'r', encoding='utf-8') as file:
+        return json.load(file)['bulk_test_data']
+
+
+def legacy_xlsx(path):
+    """旧版 get_sheet_data + _load_excel_data：整表转字典列表后再复制一遍过滤空行"""
+    workbook = openpyxl.load_workbook(path, read_only=True)
+    sheet = workbook[workbook.sheetnames[0]]
+    headers = [cell.value for cell in sheet[1]]
+    data = []
+    for row in sheet.iter_rows(min_row=2, values_only=True):
+        if not any(row):
+            continue
+        data.append({headers[i]: value for i, value in enumerate(row) if i < len(headers)})
+    workbook.close()
+    return [row for row in data if any(v for v in row.values() if v is not None and str(v).strip())]
+
+
+def measure(func):
+    """返回 (内存峰值 MB, 耗时秒, 行数)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024 / 1024, elapsed, count
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    xlsx_rows = int(sys.argv[2]) if len(sys.argv) > 2 else 50000
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        base_path = Path(tmp)
+        build_files(base_path, rows, xlsx_rows)
+        TestDataConfig.DATA_DIR = base_path
+        TestDataConfig.DISK_CACHE = False
+
+        for fmt, legacy in [('csv', legacy_csv), ('json', legacy_json), ('xlsx', legacy_xlsx)]:
+            path = base_path / f'bulk_test_data.{fmt}'
+            old = measure(lambda: len(legacy(path)))
+            new = measure(lambda: sum(1 for _ in TestDataConfig.iter_test_data('bulk', fmt)))
+            results.append((fmt, old, new))
+
+    print(f"\nCSV/JSON {rows} 行，Excel {xlsx_rows} 行")
+    print(f"{'格式':<6}{'整表峰值(MB)':>14}{'流式峰值(MB)':>14}{'整表耗时(s)':>13}{'流式耗时(s)':>13}")
+    for fmt, (old_peak, old_time, _), (new_peak, new_time, _) in results:
+        print(f"{fmt:<6}{old_peak:>14.1f}{new_peak:>14.1f}{old_time:>13.2f}{new_time:>13.2f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
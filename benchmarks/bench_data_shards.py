@@ -0,0 +1,101 @@
+"""
+测试数据分片基准测试
+模拟 8 / 32 个 xdist worker：每个 worker 收集数据驱动用例的参数，并运行分配给自己的数据行，
+对比完整加载（每个 worker 解析全部数据）与分片读取的收集耗时和 worker 内存峰值（RSS）
+
+无需浏览器（仅支持 Linux/macOS，依赖 resource 模块）
+运行方式：
+    python -m benchmarks.bench_data_shards [CSV 行数] [Excel 行数] [worker 数 ...]
+"""
+import csv
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+import openpyxl
+
+HEADERS = ['username', 'password', 'description', 'expected_result']
+MODES = ('full', 'shard')
+
+
+def make_row(i):
+    return [f'user{i:06d}', f'P@ssw0rd{i}', f'边界值用例 {i}', 'failure' if i % 3 else 'success']
+
+
+def build_files(base_path, rows, xlsx_rows):
+    with open(base_path / 'bulk_test_data.csv', 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADERS)
+        writer.writerows(make_row(i) for i in range(rows))
+
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet('data')
+    sheet.append(HEADERS)
+    for i in range(xlsx_rows):
+        sheet.append(make_row(i))
+    workbook.save(base_path / 'sheet_test_data.xlsx')
+
+
+def run_worker(args):
+    """
+    模拟一个 worker：收集参数（parametrize 时执行），再读取分配给自己的行
+
+    Returns:
+        (收集耗时秒, 运行耗时秒, 运行的行数, RSS 峰值 MB)
+    """
+    data_dir, mode, workers, worker_id = args
+    os.environ['PYTEST_XDIST_WORKER_COUNT'] = str(workers)
+    from test_data.test_data_config import TestDataConfig
+    TestDataConfig.DATA_DIR = Path(data_dir)
+    TestDataConfig.DISK_CACHE = False
+    TestDataConfig.SHARD_MODE = 'range' if mode == 'shard' else 'off'
+
+    start = time.perf_counter()
+    params = [TestDataConfig.load_sharded_test_data(module, fmt) for module, fmt in [('bulk', 'csv'), ('sheet', 'xlsx')]]
+    collect_time = time.perf_counter() - start
+
+    # 分片模式下 loadgroup 把 shard{worker_id} 分给该 worker；完整加载时按 load 调度平均分配
+    start = time.perf_counter()
+    executed = 0
+    for rows in params:
+        for i, (group, row) in enumerate(rows):
+            mine = group.endswith(f'-shard{worker_id}') if group else i % workers == worker_id
+            if mine:
+                executed += bool(row.get('username'))
+    run_time = time.perf_counter() - start
+
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    rss_mb = rss / 1024 / 1024 if sys.platform == 'darwin' else rss / 1024
+    return collect_time, run_time, executed, rss_mb
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    xlsx_rows = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+    worker_counts = [int(arg) for arg in sys.argv[3:]] or [8, 32]
+    context = multiprocessing.get_context('spawn')
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        build_files(Path(tmp), rows, xlsx_rows)
+        for workers in worker_counts:
+            for mode in MODES:
+                with context.Pool(workers, maxtasksperchild=1) as pool:
+                    stats = pool.map(run_worker, [(tmp, mode, workers, k) for k in range(workers)], chunksize=1)
+                assert sum(s[2] for s in stats) == rows + xlsx_rows
+                results.append((workers, mode, stats))
+
+    print(f"\nCSV {rows} 行，Excel {xlsx_rows} 行（每个 worker 独立进程、并发运行）")
+    print(f"{'worker':>7}{'方式':>7}{'收集平均(s)':>13}{'运行平均(s)':>13}{'RSS平均(MB)':>13}{'RSS最大(MB)':>13}{'RSS合计(MB)':>13}")
+    for workers, mode, stats in results:
+        collect = sum(s[0] for s in stats) / workers
+        run = sum(s[1] for s in stats) / workers
+        rss = [s[3] for s in stats]
+        print(f"{workers:>7}{mode:>7}{collect:>13.3f}{run:>13.3f}{sum(rss) / workers:>13.1f}{max(rss):>13.1f}{sum(rss):>13.1f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
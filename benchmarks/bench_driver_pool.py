@@ -0,0 +1,80 @@
+"""
+驱动池基准测试
+对比“每个用例新建浏览器”和“驱动池复用浏览器”两种模式下单个用例的耗时
+
+运行方式：
+    python -m benchmarks.bench_driver_pool [用例数量]
+"""
+import sys
+import time
+from config.config import Config
+from pages.login_page import LoginPage
+from utils.driver_factory import DriverFactory
+from utils.driver_pool import DriverPool
+from benchmarks.standin_server import serve_standin, summarize
+
+# 与 login_test_data.csv 一致的两类场景：成功登录、无效用户
+CASES = [('jkcsdw', '123456'), ('invalid_user', 'password123')]
+
+
+def _run_case(driver, username, password):
+    """执行一次登录用例（与 test_login_csv_driven 的主体一致）"""
+    login_page = LoginPage(driver)
+    login_page.navigate_to_login()
+    login_page.login(username, password)
+    if username == 'jkcsdw':
+        assert login_page.is_login_successful()
+    else:
+        assert login_page.is_login_failed() or not login_page.is_login_successful()
+
+
+def bench_fresh(rounds):
+    """每个用例新建并退出浏览器（原 fixture 行为）"""
+    samples = []
+    for i in range(rounds):
+        start = time.perf_counter()
+        driver = DriverFactory.get_driver()
+        try:
+            _run_case(driver, *CASES[i % len(CASES)])
+        finally:
+            driver.quit()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def bench_pool(rounds):
+    """从驱动池借出浏览器，用例结束后重置并归还"""
+    samples = []
+    pool = DriverPool(size=1)
+    try:
+        for i in range(rounds):
+            start = time.perf_counter()
+            driver = pool.acquire()
+            try:
+                _run_case(driver, *CASES[i % len(CASES)])
+            finally:
+                pool.release(driver)
+            samples.append(time.perf_counter() - start)
+    finally:
+        pool.close()
+    return samples
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    with serve_standin() as base_url:
+        Config.BASE_URL = f'{base_url}/login.html'
+        results = {'fresh': bench_fresh(rounds), 'pool': bench_pool(rounds)}
+
+    print(f"\n单个用例耗时（秒），用例数: {rounds}")
+    print(f"{'模式':<8}{'min':>8}{'median':>8}{'mean':>8}{'max':>8}{'total':>9}")
+    for mode, samples in results.items():
+        s = summarize(samples)
+        print(f"{mode:<8}{s['min']:>8.2f}{s['median']:>8.2f}{s['mean']:>8.2f}{s['max']:>8.2f}{s['total']:>9.2f}")
+    speedup = summarize(results['fresh'])['total'] / summarize(results['pool'])['total']
+    print(f"驱动池模式总耗时提升: {speedup:.1f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
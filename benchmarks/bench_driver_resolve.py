@@ -0,0 +1,53 @@
+"""
+驱动解析基准测试
+对比冷启动解析（无缓存、无清单）、磁盘清单命中、进程内缓存命中三种情况下的驱动解析耗时
+
+运行方式：
+    python -m benchmarks.bench_driver_resolve [浏览器] [重复次数]
+"""
+import sys
+import time
+from utils.driver_resolver import DriverResolver
+from benchmarks.standin_server import summarize
+
+
+def _timed(func, rounds):
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def main():
+    browser = sys.argv[1] if len(sys.argv) > 1 else 'chrome'
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    def cold():
+        DriverResolver.clear_cache(manifest=True)
+        DriverResolver.resolve(browser)
+
+    def manifest():
+        DriverResolver.clear_cache()
+        DriverResolver.resolve(browser)
+
+    def in_process():
+        DriverResolver.resolve(browser)
+
+    results = {
+        'cold': _timed(cold, rounds),
+        'manifest': _timed(manifest, rounds),
+        'in-process': _timed(in_process, rounds),
+    }
+
+    print(f"\n{browser} 驱动解析耗时（毫秒），重复次数: {rounds}，解析结果: {DriverResolver.resolve(browser)}")
+    print(f"{'场景':<12}{'min':>10}{'median':>10}{'max':>10}")
+    for name, samples in results.items():
+        s = summarize(samples)
+        print(f"{name:<12}{s['min'] * 1000:>10.3f}{s['median'] * 1000:>10.3f}{s['max'] * 1000:>10.3f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
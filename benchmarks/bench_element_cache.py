@@ -0,0 +1,107 @@
+"""
+元素缓存基准测试
+在本地替身登录页上分别关闭 / 开启元素缓存（ELEMENT_CACHE_ENABLED），统计各场景的 findElement 次数、总请求次数和耗时：
+- 登录用例：与 test_login_csv_driven 相同的主体（成功、无效用户两行数据）
+- 同页重试：错误密码登录 → clear_login_form → 再次登录
+- 重复读取：同一页面对象多次读取登录表单的文本、属性和可见性
+最后在页面对象之外刷新页面，验证缓存的元素失效后能自动重新查找
+
+运行方式：
+    python -m benchmarks.bench_element_cache [轮数]
+"""
+import sys
+import time
+from config.config import Config
+from pages.base_page import BasePage
+from pages.login_page import LoginPage
+from utils.driver_factory import DriverFactory
+from benchmarks.command_counter import count_commands
+from benchmarks.standin_server import serve_standin
+
+CASES = [('jkcsdw', '123456', True), ('invalid_user', 'password123', False)]
+
+
+def login_suite(driver):
+    for username, password, success in CASES:
+        page = LoginPage(driver)
+        page.navigate_to_login()
+        page.login(username, password)
+        if success:
+            assert page.is_login_successful()
+        else:
+            assert page.is_login_failed() or not page.is_login_successful()
+
+
+def retry_on_same_page(driver):
+    page = LoginPage(driver)
+    page.navigate_to_login()
+    page.login('jkcsdw', 'wrong')
+    assert page.is_login_failed()
+    page.clear_login_form()
+    page.login('jkcsdw', 'wrong-again')
+    assert page.is_login_failed()
+
+
+def repeated_reads(driver):
+    page = LoginPage(driver)
+    page.navigate_to_login()
+    page.select_login_option()
+    for _ in range(5):
+        page.get_text(page.LOGIN_OPTIONS)
+        page.get_attribute(page.USERNAME_INPUT, 'placeholder')
+        page.get_attribute(page.PASSWORD_INPUT, 'placeholder')
+        page.is_element_visible(page.LOGIN_BUTTON)
+
+
+SCENARIOS = {'登录用例(2 行)': login_suite, '同页重试': retry_on_same_page, '重复读取(5 次)': repeated_reads}
+
+
+def measure(driver, scenario, rounds):
+    """返回 (每轮 findElement 次数, 每轮总请求次数, 每轮耗时秒)"""
+    with count_commands(driver) as counter:
+        start = time.perf_counter()
+        for _ in range(rounds):
+            scenario(driver)
+        elapsed = time.perf_counter() - start
+    return counter['findElement'] / rounds, sum(counter.values()) / rounds, elapsed / rounds
+
+
+def stale_recovery(driver):
+    """在页面对象之外刷新页面，缓存的元素失效后自动重新查找"""
+    page = LoginPage(driver)
+    page.navigate_to_login()
+    expected = page.get_text(page.LOGIN_OPTIONS)
+    driver.refresh()
+    assert page.get_text(page.LOGIN_OPTIONS) == expected
+    return page.cache_stats
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    driver = DriverFactory.get_driver()
+    rows = {}
+    try:
+        with serve_standin() as base_url:
+            Config.BASE_URL = f'{base_url}/login.html?toast=500&latency=50'
+            for enabled in (False, True):
+                Config.ELEMENT_CACHE_ENABLED = enabled
+                for name, scenario in SCENARIOS.items():
+                    rows.setdefault(name, []).append(measure(driver, scenario, rounds))
+            totals = dict(BasePage.cache_totals)
+            stale = stale_recovery(driver)
+    finally:
+        driver.quit()
+        Config.ELEMENT_CACHE_ENABLED = True
+
+    print(f"\n轮数: {rounds}")
+    print(f"{'场景':<16}{'无缓存:find':>12}{'无缓存:请求':>12}{'无缓存:ms':>11}{'缓存:find':>11}{'缓存:请求':>11}{'缓存:ms':>10}")
+    for name, ((old_find, old_cmds, old_time), (new_find, new_cmds, new_time)) in rows.items():
+        print(f"{name:<16}{old_find:>12.1f}{old_cmds:>12.1f}{old_time * 1000:>11.1f}"
+              f"{new_find:>11.1f}{new_cmds:>11.1f}{new_time * 1000:>10.1f}")
+    print(f"缓存统计（两种模式合计）: 命中 {totals['hits']}  未命中 {totals['misses']}  失效 {totals['stale']}")
+    print(f"页面外刷新后重新查找: {stale}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
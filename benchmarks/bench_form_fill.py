@@ -0,0 +1,77 @@
+"""
+表单填写基准测试
+在本地替身登录页（按钮只读取 input 事件维护的 Vue 风格数据模型）上对比：
+- 逐个字段 find_element → clear → send_keys（FILL_FORM_SCRIPT=False，原 enter_username / enter_password）
+- BasePage.fill_form 一次脚本调用赋值并派发 input / change 事件
+分别统计填写表单和完整登录（LoginPage.login）的 WebDriver 请求次数与耗时，并校验数据模型已更新
+
+运行方式：
+    python -m benchmarks.bench_form_fill [轮数]
+"""
+import sys
+import time
+from config.config import Config
+from pages.login_page import LoginPage
+from utils.driver_factory import DriverFactory
+from benchmarks.command_counter import count_commands
+from benchmarks.standin_server import serve_standin, summarize
+
+USERNAME, PASSWORD = 'invalid_user', 'password123'
+
+
+def fill(page):
+    page.fill_form({page.USERNAME_INPUT: USERNAME, page.PASSWORD_INPUT: PASSWORD},
+                   keystroke_fields=page.KEYSTROKE_FIELDS)
+
+
+def measure(driver, func, rounds):
+    """返回 (每轮请求次数, 耗时样本)"""
+    samples = []
+    with count_commands(driver) as counter:
+        for _ in range(rounds):
+            start = time.perf_counter()
+            func()
+            samples.append(time.perf_counter() - start)
+    return sum(counter.values()) / rounds, samples
+
+
+def bench_mode(driver, scripted, rounds):
+    Config.FILL_FORM_SCRIPT = scripted
+    page = LoginPage(driver)
+    page.navigate_to_login()
+    page.select_login_option()
+    fill_commands, fill_samples = measure(driver, lambda: fill(page), rounds)
+    model = driver.execute_script('return model')
+    assert model == {'username': USERNAME, 'password': PASSWORD}, f"数据模型未更新: {model}"
+
+    def login():
+        page.navigate_to_login()
+        page.login(USERNAME, PASSWORD)
+        assert page.is_login_failed()
+
+    login_commands, login_samples = measure(driver, login, rounds)
+    return fill_commands, fill_samples, login_commands, login_samples
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    driver = DriverFactory.get_driver()
+    try:
+        with serve_standin() as base_url:
+            # 提示框停留时间和接口耗时都很短，完整登录的耗时主要由客户端请求决定
+            Config.BASE_URL = f'{base_url}/login.html?toast=500&latency=50'
+            results = {'send_keys': bench_mode(driver, False, rounds), 'fill_form': bench_mode(driver, True, rounds)}
+    finally:
+        driver.quit()
+        Config.FILL_FORM_SCRIPT = True
+
+    print(f"\n轮数: {rounds}（填写 2 个字段；完整登录含导航、切换登录方式、点击和等待提示框）")
+    print(f"{'方式':<12}{'填写:请求':>10}{'填写:中位数(ms)':>17}{'登录:请求':>10}{'登录:中位数(ms)':>17}")
+    for mode, (fill_commands, fill_samples, login_commands, login_samples) in results.items():
+        print(f"{mode:<12}{fill_commands:>10.1f}{summarize(fill_samples)['median'] * 1000:>17.1f}"
+              f"{login_commands:>10.1f}{summarize(login_samples)['median'] * 1000:>17.1f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,122 @@
+"""
+导入耗时基准测试（回归防护）
+用 python -X importtime 测量常用模块的累计导入耗时，并检查：
+- 轻量模块不会连带导入 selenium / openpyxl / webdriver_manager
+- 导入 config.config 不会创建目录
+- pytest --collect-only 的总耗时（每个 xdist worker 启动时都要经历一次）
+任一检查超出预算时以退出码 1 结束，可放在 CI 中作为回归防护
+
+运行方式：
+    python -m benchmarks.bench_import_time [重复次数]
+"""
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+HEAVY_MODULES = ('selenium', 'openpyxl', 'webdriver_manager')
+
+# 模块 -> 累计导入耗时预算（毫秒），None 表示只测量；lightweight 为 True 时不得导入 HEAVY_MODULES
+TARGETS = {
+    'config.config': (20, True),
+    'utils': (20, True),
+    'utils.duration_store': (40, True),
+    'utils.excel_reader': (40, True),
+    'test_data.test_data_config': (60, True),
+    'pages.login_page': (None, False),
+}
+
+COLLECT_BUDGET = 3.0  # pytest --collect-only 总耗时预算（秒）
+
+
+def _python(code, *options):
+    return subprocess.run(
+        [sys.executable, *options, '-c', code],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, encoding='utf-8',
+        env=dict(os.environ, PYTHONDONTWRITEBYTECODE='1'),
+    )
+
+
+def import_time_ms(module, repeat):
+    """
+    python -X importtime 中导入该模块的累计耗时（多次取最小值，毫秒）
+
+    取解释器启动（site）之后所有顶层条目的累计耗时之和，包含父包（如 pages）的导入
+    """
+    best = None
+    for _ in range(repeat):
+        entries = []
+        for line in _python(f'import {module}', '-X', 'importtime').stderr.splitlines():
+            parts = line.split('|')
+            if len(parts) == 3 and parts[1].strip().isdigit():
+                name = parts[2][1:]
+                if name == 'site':
+                    entries = []
+                elif not name.startswith(' '):
+                    entries.append(int(parts[1]))
+        value = sum(entries) / 1000
+        best = value if best is None else min(best, value)
+    return best
+
+
+def heavy_imports(module):
+    """导入模块后已加载的重量级依赖"""
+    code = f"import sys, {module}; print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    return _python(code).stdout.split()
+
+
+def config_mkdir_calls():
+    """导入 config.config 期间的 Path.mkdir 调用次数"""
+    code = (
+        "import pathlib; calls = []; pathlib.Path.mkdir = lambda self, *a, **k: calls.append(self); "
+        "import config.config; print(len(calls))"
+    )
+    return int(_python(code).stdout.strip() or -1)
+
+
+def collect_seconds(repeat):
+    """pytest --collect-only 的墙钟耗时（多次取最小值）"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-m', 'pytest', '--collect-only', '-q', '-p', 'no:cacheprovider'],
+                       cwd=PROJECT_ROOT, capture_output=True)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    failures = []
+
+    print(f"{'模块':<30}{'导入耗时':>10}{'预算':>8}  重量级依赖")
+    for module, (budget, lightweight) in TARGETS.items():
+        elapsed = import_time_ms(module, repeat)
+        heavy = heavy_imports(module)
+        print(f"{module:<30}{elapsed:>8.1f}ms{'-' if budget is None else f'{budget}ms':>8}  {' '.join(heavy) or '-'}")
+        if budget is not None and elapsed > budget:
+            failures.append(f"{module} 导入耗时 {elapsed:.1f}ms 超出预算 {budget}ms")
+        if lightweight and heavy:
+            failures.append(f"{module} 导入了 {', '.join(heavy)}")
+
+    mkdir_calls = config_mkdir_calls()
+    print(f"导入 config.config 时创建目录: {mkdir_calls} 次")
+    if mkdir_calls:
+        failures.append("导入 config.config 时创建了目录")
+
+    collect = collect_seconds(repeat)
+    print(f"pytest --collect-only: {collect:.2f}s（预算 {COLLECT_BUDGET}s）")
+    if collect > COLLECT_BUDGET:
+        failures.append(f"pytest --collect-only 耗时 {collect:.2f}s 超出预算 {COLLECT_BUDGET}s")
+
+    for failure in failures:
+        print(f"✗ {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""
+命令埋点开销基准测试
+用立即返回的桩驱动代替浏览器，对比包装 driver.execute 前后单个 WebDriver 命令的耗时，
+以及 WaitEngine 一次等待增加的开销；真实命令为一次 HTTP 往返（通常 1ms 以上），可据此估算埋点占比
+
+无需浏览器
+运行方式：
+    python -m benchmarks.bench_instrumentation [命令数]
+"""
+import sys
+import tempfile
+import time
+from utils.instrumentation import Instrumentation, load_profiles, summarize
+from utils.wait_engine import WaitEngine
+
+ELEMENT = {'element-6066-11e4-a52e-4f735466cecf': 'e1'}
+
+
+class StubDriver:
+    """立即返回的桩驱动：查找命令返回同一个元素，其余命令返回 None"""
+
+    def execute(self, driver_command, params=None):
+        if driver_command == 'findElement':
+            return {'value': ELEMENT}
+        return {'value': None}
+
+
+def run_commands(driver, count):
+    """按 查找 → 点击 → 读取文本 的顺序执行 count 个命令，返回每个命令的平均耗时（秒）"""
+    find = {'using': 'css selector', 'value': '#username'}
+    element = {'id': 'e1'}
+    start = time.perf_counter()
+    for _ in range(count // 3):
+        driver.execute('findElement', find)
+        driver.execute('clickElement', element)
+        driver.execute('getElementText', element)
+    return (time.perf_counter() - start) / (count // 3 * 3)
+
+
+def run_waits(driver, count):
+    """执行 count 次立即满足的等待，返回每次等待的平均耗时（秒）"""
+    waiter = WaitEngine(driver, timeout=0)
+
+    def presence_of_element_located(d):
+        return d.execute('findElement', {'using': 'css selector', 'value': '#prompt'})
+
+    start = time.perf_counter()
+    for _ in range(count):
+        waiter.until(presence_of_element_located, locator=('css selector', '#prompt'))
+    return (time.perf_counter() - start) / count
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 300000
+    driver = StubDriver()
+
+    Instrumentation.enabled = False
+    plain_command = run_commands(driver, count)
+    plain_wait = run_waits(driver, count // 10)
+
+    Instrumentation.enabled = True
+    Instrumentation.set_current_test('bench::test_commands')
+    Instrumentation.attach(driver)
+    traced_command = run_commands(driver, count)
+    traced_wait = run_waits(driver, count // 10)
+    Instrumentation.detach(driver)
+
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        Instrumentation.export('bench::test_commands', directory)
+        export_seconds = time.perf_counter() - start
+        profile = load_profiles(directory)[0]
+    test = summarize([profile])['tests'][0]
+
+    print(f"命令数: {count}  缓冲区保留: {len(profile['commands'])} 条记录  丢弃: {test['dropped']} 条")
+    print(f"{'':<12}{'未埋点':>12}{'埋点':>12}{'增加':>12}")
+    print(f"{'单个命令':<10}{plain_command * 1e6:>11.2f}µs{traced_command * 1e6:>11.2f}µs"
+          f"{(traced_command - plain_command) * 1e6:>11.2f}µs")
+    print(f"{'单次等待':<10}{plain_wait * 1e6:>11.2f}µs{traced_wait * 1e6:>11.2f}µs"
+          f"{(traced_wait - plain_wait) * 1e6:>11.2f}µs")
+    print(f"导出用例 JSON 耗时: {export_seconds * 1000:.1f}ms")
+    print(f"按 1ms 的真实命令往返估算，埋点占比约 {(traced_command - plain_command) / 1e-3 * 100:.2f}%")
+
+
+if __name__ == '__main__':
+    main()
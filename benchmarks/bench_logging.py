@@ -0,0 +1,140 @@
+"""
+日志开销基准测试
+用立即返回的桩驱动执行 BasePage.click，对比测试线程中每次点击的日志开销：
+- 不输出日志（基准）
+- 旧方式：同步 StreamHandler + FileHandler，f-string 消息
+- 新方式：QueueHandler 入队，后台 QueueListener 写控制台 / 文本 / JSON 日志，%-style 消息
+另外对比日志级别关闭时 f-string 与 %-style 调试日志的开销
+
+控制台输出重定向到 os.devnull，文件写入临时目录；无需浏览器
+运行方式：
+    python -m benchmarks.bench_logging [点击次数]
+"""
+import logging
+import os
+import queue
+import sys
+import tempfile
+import time
+from logging.handlers import QueueHandler, QueueListener
+from pathlib import Path
+from config.config import Config
+from pages.base_page import BasePage
+from selenium.webdriver.support import expected_conditions as EC
+from utils.logger import ContextQueueHandler, Logger
+
+LOCATOR = ('css selector', '#login-button')
+
+
+class StubElement:
+    def is_displayed(self):
+        return True
+
+    def is_enabled(self):
+        return True
+
+    def click(self):
+        pass
+
+
+class StubDriver:
+    """立即返回的桩驱动"""
+
+    def find_element(self, by, value):
+        return StubElement()
+
+
+def legacy_click(page, locator, timeout=None):
+    """旧版 BasePage.click：f-string 日志消息"""
+    try:
+        element = page.waiter.until(EC.element_to_be_clickable(locator), timeout=timeout, locator=locator)
+        element.click()
+        page.logger.info(f"点击元素: {locator}")
+    except Exception as e:
+        page.logger.error(f"点击元素失败: {locator}, 错误: {e}")
+        raise
+
+
+def make_logger(name, handlers):
+    logger = logging.getLogger(name)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    for handler in handlers:
+        logger.addHandler(handler)
+    return logger
+
+
+def per_click(page, click, count):
+    start = time.perf_counter()
+    for _ in range(count):
+        click(page, LOCATOR)
+    return (time.perf_counter() - start) / count
+
+
+def disabled_debug(logger, lazy, count):
+    """日志级别为 INFO 时调用 debug 的平均耗时"""
+    locator = LOCATOR
+    start = time.perf_counter()
+    if lazy:
+        for _ in range(count):
+            logger.debug("找到元素: %s", locator)
+    else:
+        for _ in range(count):
+            logger.debug(f"找到元素: {locator}")
+    return (time.perf_counter() - start) / count
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    devnull = open(os.devnull, 'w', encoding='utf-8')
+    page = BasePage(StubDriver())
+
+    with tempfile.TemporaryDirectory() as directory:
+        log_dir = Path(directory)
+
+        # 旧方式：同步写控制台和文件
+        console = logging.StreamHandler(devnull)
+        console.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+        file_handler = logging.FileHandler(log_dir / 'legacy.log', encoding='utf-8')
+        file_handler.setFormatter(logging.Formatter(Config.LOG_FORMAT))
+        legacy_logger = make_logger('bench.legacy', [console, file_handler])
+
+        # 新方式：队列 + 后台线程（处理器与 Logger 相同）
+        handlers = Logger.build_handlers(log_dir)
+        handlers[0].setStream(devnull)
+        log_queue = queue.SimpleQueue()
+        listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        listener.start()
+        queue_logger = make_logger('bench.queue', [ContextQueueHandler(log_queue)])
+
+        silent_logger = make_logger('bench.silent', [])
+        silent_logger.setLevel(logging.CRITICAL + 1)
+
+        page.logger = silent_logger
+        baseline = per_click(page, BasePage.click, count)
+        page.logger = legacy_logger
+        legacy = per_click(page, legacy_click, count)
+        page.logger = queue_logger
+        start = time.perf_counter()
+        queued = per_click(page, BasePage.click, count)
+        listener.stop()
+        drained = (time.perf_counter() - start) / count
+
+        f_string = disabled_debug(queue_logger, lazy=False, count=count * 10)
+        lazy = disabled_debug(queue_logger, lazy=True, count=count * 10)
+
+        for handler in handlers + [console, file_handler]:
+            handler.close()
+    devnull.close()
+
+    print(f"点击次数: {count}")
+    print(f"{'方式':<22}{'每次点击':>10}{'日志开销':>10}")
+    print(f"{'不输出日志':<20}{baseline * 1e6:>9.2f}µs{'-':>10}")
+    print(f"{'同步处理器 + f-string':<18}{legacy * 1e6:>9.2f}µs{(legacy - baseline) * 1e6:>8.2f}µs")
+    print(f"{'队列 + 后台线程':<19}{queued * 1e6:>9.2f}µs{(queued - baseline) * 1e6:>8.2f}µs"
+          f"  （含 JSON 日志；后台写完全部日志折合 {drained * 1e6:.2f}µs/次）")
+    print(f"关闭级别的 debug 调用: f-string {f_string * 1e9:.0f}ns  %-style {lazy * 1e9:.0f}ns")
+
+
+if __name__ == '__main__':
+    main()
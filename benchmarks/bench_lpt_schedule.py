@@ -0,0 +1,75 @@
+"""
+LPT 并行调度基准测试
+生成一组以 sleep 模拟耗时的用例（少量慢用例集中在数据文件末尾，模拟等待提示框消失的登录数据行；
+动态分配时它们最后才被分出，形成长尾），
+对比 xdist 默认 load 调度与按历史耗时的 LPT 调度的 makespan 和墙钟耗时
+
+无需浏览器（sleep 不占用 CPU，单核机器上也能反映调度效果）
+运行方式：
+    python -m benchmarks.bench_lpt_schedule [worker 数] [用例数] [慢用例数]
+"""
+import os
+import re
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+TEST_TEMPLATE = '''
+import time
+import pytest
+
+DURATIONS = [{slow} if i >= {count} - {slow_count} else {fast} for i in range({count})]
+
+
+@pytest.mark.parametrize('row', range({count}))
+def test_login_row(row):
+    time.sleep(DURATIONS[row])
+'''
+
+SUMMARY = re.compile(r'预测 makespan: (\S+)\s+实际 makespan: ([\d.]+)s\s+墙钟耗时: ([\d.]+)s')
+
+
+def run_pytest(workdir, workers, durations_file, lpt):
+    args = [sys.executable, '-m', 'pytest', '-c', os.devnull, '--rootdir', str(workdir),
+            '-p', 'utils.lpt_scheduler', '-n', str(workers), '-q', 'test_bench_rows.py']
+    if lpt:
+        args.append('--lpt')
+    env = dict(os.environ, PYTHONPATH=str(PROJECT_ROOT), TEST_DURATIONS_FILE=str(durations_file))
+    output = subprocess.run(args, cwd=workdir, env=env, capture_output=True, text=True).stdout
+    match = SUMMARY.search(output)
+    if not match:
+        raise RuntimeError(output)
+    return match.group(1), float(match.group(2)), float(match.group(3))
+
+
+def main():
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 120
+    slow_count = int(sys.argv[3]) if len(sys.argv) > 3 else 10
+    slow, fast = 2.0, 0.2
+    ideal = (slow_count * slow + (count - slow_count) * fast) / workers
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        (workdir / 'test_bench_rows.py').write_text(
+            TEST_TEMPLATE.format(slow=slow, fast=fast, slow_count=slow_count, count=count), encoding='utf-8'
+        )
+        durations_file = workdir / 'durations.json'
+        results = [
+            ('load（首次，记录耗时）', run_pytest(workdir, workers, durations_file, lpt=False)),
+            ('load', run_pytest(workdir, workers, durations_file, lpt=False)),
+            ('lpt', run_pytest(workdir, workers, durations_file, lpt=True)),
+        ]
+
+    print(f"\n{workers} 个 worker，{count} 个用例（{slow_count} 个 {slow}s 慢用例 + {fast}s 快用例），理想 makespan {ideal:.2f}s")
+    print(f"{'调度':<22}{'预测 makespan':>16}{'实际 makespan(s)':>18}{'墙钟(s)':>10}")
+    for name, (predicted, actual, wall) in results:
+        print(f"{name:<22}{predicted:>16}{actual:>18.2f}{wall:>10.2f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,71 @@
+"""
+多浏览器矩阵基准测试
+对比依次运行各浏览器（串行三遍）与 run_tests.py matrix（各浏览器同时运行、错开启动）的总耗时
+
+需要本机安装对应浏览器；用例访问本地替身登录页
+运行方式：
+    python -m benchmarks.bench_matrix [每种浏览器的用例数] [浏览器 ...]
+"""
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+import run_tests
+from benchmarks.standin_server import serve_standin
+
+TEST_TEMPLATE = '''
+import os
+import pytest
+from pages.login_page import LoginPage
+from utils.driver_factory import DriverFactory
+
+CASES = [('jkcsdw', '123456', True), ('invalid_user', 'password123', False)] * ({rows} // 2)
+
+
+@pytest.fixture
+def driver():
+    driver = DriverFactory.get_driver()
+    yield driver
+    driver.quit()
+
+
+@pytest.mark.parametrize('username,password,success', CASES)
+def test_standin_login(driver, username, password, success):
+    page = LoginPage(driver)
+    page.url = os.environ['STANDIN_URL'] + '/login.html'
+    page.navigate_to_login()
+    page.login(username, password)
+    assert page.is_login_successful() == success
+'''
+
+
+def timed(func):
+    start = time.perf_counter()
+    exit_code = func()
+    return time.perf_counter() - start, exit_code
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    browsers = sys.argv[2:] or ['chrome', 'firefox', 'edge']
+    with serve_standin() as base_url, tempfile.TemporaryDirectory() as tmp:
+        os.environ['STANDIN_URL'] = base_url
+        test_file = Path(tmp) / 'test_matrix_standin.py'
+        test_file.write_text(TEST_TEMPLATE.format(rows=rows), encoding='utf-8')
+
+        sequential = {}
+        for browser in browsers:
+            sequential[browser] = timed(lambda: run_tests.run_matrix_tests([browser], str(test_file)))
+        matrix = timed(lambda: run_tests.run_matrix_tests(browsers, str(test_file)))
+
+    print(f"\n每种浏览器 {rows} 个用例")
+    for browser, (elapsed, code) in sequential.items():
+        print(f"  单独运行 {browser:<8}: {elapsed:6.1f}s  退出代码 {code}")
+    print(f"  依次运行合计      : {sum(e for e, _ in sequential.values()):6.1f}s")
+    print(f"  矩阵同时运行      : {matrix[0]:6.1f}s  退出代码 {matrix[1]}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""
+批量查询基准测试
+对比逐个调用 BasePage 辅助方法与 query_many 一次脚本调用在 WebDriver 请求次数和耗时上的差异
+
+运行方式：
+    python -m benchmarks.bench_query_many
+"""
+import sys
+import time
+from config.config import Config
+from pages.login_page import LoginPage
+from utils.driver_factory import DriverFactory
+from benchmarks.command_counter import count_commands
+from benchmarks.standin_server import serve_standin
+
+
+def legacy_form_state(page):
+    """逐个调用辅助方法读取登录表单状态"""
+    return {
+        'tab': page.get_text(page.LOGIN_OPTIONS),
+        'username': page.get_attribute(page.USERNAME_INPUT, 'placeholder'),
+        'password': page.get_attribute(page.PASSWORD_INPUT, 'placeholder'),
+        'button': page.is_element_visible(page.LOGIN_BUTTON),
+        'prompt': page.is_element_present(page.PROMPT_MESSAGE),
+    }
+
+
+def batched_form_state(page):
+    """query_many 一次读取登录表单状态"""
+    return page.query_many({
+        'tab': (page.LOGIN_OPTIONS, ('text',)),
+        'username': (page.USERNAME_INPUT, ('attr:placeholder',)),
+        'password': (page.PASSWORD_INPUT, ('attr:placeholder',)),
+        'button': (page.LOGIN_BUTTON, ('visible',)),
+        'prompt': (page.PROMPT_MESSAGE, ('present',)),
+    })
+
+
+def legacy_is_login_failed(page):
+    """旧版 is_login_failed：等待提示框可见后再读取文本"""
+    if page.is_element_visible(page.PROMPT_MESSAGE, timeout=5):
+        return bool(page.get_text(page.PROMPT_MESSAGE))
+    return False
+
+
+def measure(driver, func, rounds):
+    """返回 (每次调用的请求次数, 平均耗时秒)"""
+    with count_commands(driver) as counter:
+        start = time.perf_counter()
+        for _ in range(rounds):
+            func()
+        elapsed = time.perf_counter() - start
+    return sum(counter.values()) / rounds, elapsed / rounds
+
+
+def main():
+    rounds = 20
+    driver = DriverFactory.get_driver()
+    try:
+        with serve_standin() as base_url:
+            # 提示框停留足够长，保证测量期间一直可见
+            Config.BASE_URL = f'{base_url}/login.html?toast=60000'
+            page = LoginPage(driver)
+            page.navigate_to_login()
+            page.select_login_option()
+
+            rows = [
+                ('表单状态(5 个元素)', measure(driver, lambda: legacy_form_state(page), rounds),
+                 measure(driver, lambda: batched_form_state(page), rounds)),
+            ]
+
+            page.login('invalid_user', 'password123')
+            rows.append(('is_login_failed', measure(driver, lambda: legacy_is_login_failed(page), rounds),
+                         measure(driver, page.is_login_failed, rounds)))
+    finally:
+        driver.quit()
+
+    print(f"\n{'场景':<22}{'逐个:请求':>10}{'逐个:耗时(ms)':>15}{'批量:请求':>10}{'批量:耗时(ms)':>15}")
+    for name, (old_cmds, old_time), (new_cmds, new_time) in rows:
+        print(f"{name:<22}{old_cmds:>10.1f}{old_time * 1000:>15.1f}{new_cmds:>10.1f}{new_time * 1000:>15.1f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,55 @@
+"""
+录制 / 回放基准测试
+以子进程运行登录用例（test_cases/test_login_csv_driven.py），对比：
+- live：直接访问线上站点
+- replay：从回放包（Config.REPLAY_BUNDLE）返回页面、CSS、JS 和接口响应，不访问网络
+- replay + 延迟：每个响应注入 REPLAY_LATENCY_MS 毫秒，模拟较慢的网络
+回放包不存在时先以 REPLAY_MODE=record 运行一次录制
+
+运行方式：
+    python -m benchmarks.bench_replay [轮数] [注入延迟毫秒]
+"""
+import os
+import subprocess
+import sys
+import time
+from config.config import Config
+from benchmarks.standin_server import summarize
+
+SUITE = 'test_cases/test_login_csv_driven.py'
+
+
+def run_suite(mode, latency_ms=0):
+    """运行一次登录用例，返回 (耗时秒, 退出码)"""
+    env = dict(os.environ, REPLAY_MODE=mode, REPLAY_LATENCY_MS=str(latency_ms))
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-m', 'pytest', SUITE, '-q', '-p', 'no:cacheprovider'],
+                            cwd=Config.BASE_DIR, env=env, capture_output=True)
+    return time.perf_counter() - start, result.returncode
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    latency_ms = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+
+    if not (Config.REPLAY_BUNDLE / 'index.json').exists():
+        elapsed, code = run_suite('record')
+        print(f"已录制回放包: {Config.REPLAY_BUNDLE}（{elapsed:.1f}s，退出码 {code}）")
+
+    modes = {'live': ('off', 0), 'replay': ('replay', 0), f'replay+{latency_ms}ms': ('replay', latency_ms)}
+    print(f"\n轮数: {rounds}  用例: {SUITE}")
+    print(f"{'模式':<18}{'中位数(s)':>10}{'最小(s)':>9}{'最大(s)':>9}  退出码")
+    for name, (mode, latency) in modes.items():
+        samples, codes = [], set()
+        for _ in range(rounds):
+            elapsed, code = run_suite(mode, latency)
+            samples.append(elapsed)
+            codes.add(code)
+        stats = summarize(samples)
+        print(f"{name:<18}{stats['median']:>10.2f}{stats['min']:>9.2f}{stats['max']:>9.2f}  "
+              f"{','.join(map(str, sorted(codes)))}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,48 @@
+"""
+截图基准测试
+对比同步截图（driver.save_screenshot）与后台写盘截图在测试线程上的耗时
+
+运行方式：
+    python -m benchmarks.bench_screenshot [截图数量]
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+from config.config import Config
+from utils.driver_factory import DriverFactory
+from utils.screenshot import Screenshot
+from benchmarks.standin_server import serve_standin
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    driver = DriverFactory.get_driver()
+    with tempfile.TemporaryDirectory() as tmp:
+        Config.SCREENSHOTS_DIR = Path(tmp)
+        try:
+            with serve_standin() as base_url:
+                driver.get(f'{base_url}/login.html')
+
+                start = time.perf_counter()
+                for i in range(count):
+                    driver.save_screenshot(str(Path(tmp) / f'sync_{i}.png'))
+                sync_seconds = time.perf_counter() - start
+
+                start = time.perf_counter()
+                for i in range(count):
+                    Screenshot.take_screenshot(driver, f'async_{i}')
+                async_seconds = time.perf_counter() - start
+                stats = Screenshot.flush()
+        finally:
+            driver.quit()
+
+    print(f"\n截图 {count} 张，测试线程耗时（秒）")
+    print(f"同步 save_screenshot : {sync_seconds:.3f}")
+    print(f"后台写盘             : {async_seconds:.3f}（后台线程写盘 {stats['write_seconds']:.3f}）")
+    print(f"测试线程节省         : {sync_seconds - async_seconds:.3f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
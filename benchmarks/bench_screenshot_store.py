@@ -0,0 +1,62 @@
+"""
+截图存储基准测试
+模拟重复失败场景（大量截图中只有少数不同画面），对比旧方式（每次保存一张完整 PNG）
+与内容寻址存储（去重、可选缩放和 WebP/JPEG 压缩）的磁盘占用
+
+无需浏览器，截图画面由 Pillow 生成
+运行方式：
+    python -m benchmarks.bench_screenshot_store [截图次数] [不同画面数]
+"""
+import io
+import random
+import sys
+import tempfile
+from pathlib import Path
+from PIL import Image, ImageDraw
+from utils.screenshot_store import ScreenshotStore
+
+
+def make_frame(seed, size=(1920, 1080)):
+    """生成一张类似大屏页面的 PNG 截图"""
+    rnd = random.Random(seed)
+    image = Image.new('RGB', size, (11, 29, 58))
+    draw = ImageDraw.Draw(image)
+    for _ in range(60):
+        x, y = rnd.randrange(size[0]), rnd.randrange(size[1])
+        w, h = rnd.randrange(40, 400), rnd.randrange(20, 200)
+        draw.rectangle((x, y, x + w, y + h), fill=tuple(rnd.randrange(256) for _ in range(3)))
+        draw.text((x + 4, y + 4), f'warning-{rnd.randrange(10000)}', fill=(255, 255, 255))
+    buffer = io.BytesIO()
+    image.save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+def main():
+    captures = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    unique = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    frames = [make_frame(i) for i in range(unique)]
+    sequence = [frames[i % unique] for i in range(captures)]
+
+    legacy_bytes = sum(len(frame) for frame in sequence)
+    rows = [('旧方式：每次一张 PNG', legacy_bytes)]
+
+    for label, options in [
+        ('内容寻址 PNG', {'image_format': 'png'}),
+        ('内容寻址 WebP q80', {'image_format': 'webp', 'quality': 80}),
+        ('内容寻址 JPEG q80 缩放至 1280', {'image_format': 'jpeg', 'quality': 80, 'max_width': 1280}),
+    ]:
+        with tempfile.TemporaryDirectory() as tmp:
+            store = ScreenshotStore(root=Path(tmp), max_bytes=0, **options)
+            for i, frame in enumerate(sequence):
+                store.put(frame, 'failed_test_login', test_id=f'test_login[{i}]')
+            rows.append((label, store.disk_usage() + store.manifest_file.stat().st_size))
+
+    print(f"\n截图 {captures} 次，不同画面 {unique} 个")
+    print(f"{'存储方式':<32}{'磁盘占用(KB)':>14}{'占旧方式':>10}")
+    for label, size in rows:
+        print(f"{label:<32}{size / 1024:>14.1f}{size / legacy_bytes:>10.1%}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""
+登录状态缓存基准测试
+在本地替身页面上对比“每个用例界面登录”和“恢复登录状态快照”两种方式下，
+从借出浏览器到首个断言（首页标题可见）通过的耗时；最后篡改快照中的 token，验证会话被拒绝时自动重新登录
+
+运行方式：
+    python -m benchmarks.bench_session_cache [用例数量]
+"""
+import sys
+import time
+from config.config import Config
+from pages.base_page import BasePage
+from pages.login_page import LoginPage
+from utils.driver_pool import DriverPool
+from utils.session_cache import SessionCache
+from benchmarks.standin_server import serve_standin, summarize
+
+USERNAME, PASSWORD = 'jkcsdw', '123456'
+PAGE_TITLE = ('css selector', '.page-title')
+
+
+def _first_assertion(driver):
+    """用例的首个断言：登录后的首页已显示"""
+    assert BasePage(driver).is_element_visible(PAGE_TITLE), f"未进入首页: {driver.current_url}"
+
+
+def _ui_login(driver):
+    """每个用例都通过登录页登录（等到跳转首页）"""
+    login_page = LoginPage(driver)
+    login_page.navigate_to_login()
+    login_page.login(USERNAME, PASSWORD)
+    assert login_page.is_login_successful()
+
+
+def _cached_login(driver):
+    SessionCache.open_logged_in(driver, USERNAME, PASSWORD)
+
+
+def bench(pool, open_page, rounds):
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        driver = pool.acquire()
+        try:
+            open_page(driver)
+            _first_assertion(driver)
+        finally:
+            pool.release(driver)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    pool = DriverPool(size=1)
+    try:
+        with serve_standin() as base_url:
+            Config.BASE_URL = f'{base_url}/login.html'
+            results = {'ui': bench(pool, _ui_login, rounds)}
+            SessionCache.invalidate()
+            results['cache'] = bench(pool, _cached_login, rounds)
+
+            # 服务端不再接受快照中的会话：首页路由守卫跳回登录页，应自动重新登录
+            stale = SessionCache.get(USERNAME)
+            stale['local'] = {**stale['local'], 'token': 'standin-revoked'}
+            rejected = bench(pool, _cached_login, 1)[0]
+    finally:
+        pool.close()
+
+    print(f"\n借出浏览器到首个断言通过的耗时（秒），用例数: {rounds}")
+    print(f"{'方式':<8}{'min':>8}{'median':>8}{'mean':>8}{'max':>8}{'total':>9}")
+    for mode, samples in results.items():
+        s = summarize(samples)
+        print(f"{mode:<8}{s['min']:>8.2f}{s['median']:>8.2f}{s['mean']:>8.2f}{s['max']:>8.2f}{s['total']:>9.2f}")
+    speedup = summarize(results['ui'])['median'] / summarize(results['cache'])['median']
+    print(f"恢复快照中位数提升: {speedup:.1f}x（缓存模式包含首个用例的一次界面登录）")
+    print(f"快照被拒绝后重新登录: {rejected:.2f}s")
+    print(f"统计: 命中 {SessionCache.stats['hits']}  界面登录 {SessionCache.stats['logins']}  "
+          f"被拒绝 {SessionCache.stats['rejected']}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
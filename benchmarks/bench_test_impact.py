@@ -0,0 +1,81 @@
+"""
+用例影响分析基准测试
+对最近改动过 pages/ 或 locators/ 的若干个提交，只回放其中 pages/ locators/ 部分的改动，
+对比按文件级依赖（不使用追踪记录）与按方法/定位器（使用追踪记录）选中的用例函数数量和预计耗时，以及分析本身的耗时
+
+只回放 pages/ locators/ 的改动：同一提交中的 config.py 等文件改动会按文件级依赖选中全部用例，掩盖符号级选择的效果
+
+预计耗时来自 reports/durations.json（没有记录时按 Config.DEFAULT_TEST_DURATION）；
+运行时追踪记录来自 reports/test_impact.json（先以 --impact-trace 运行一次用例生成，没有记录时两种方式结果相同）
+
+无需浏览器
+运行方式：
+    python -m benchmarks.bench_test_impact [提交数]
+"""
+import subprocess
+import sys
+import time
+from utils.duration_store import DurationStore
+from utils.test_impact import (
+    PROJECT_ROOT, SYMBOL_DIRS, TRACED_KEY, build_static_index, changed_files, estimate_seconds, load_trace,
+    select_impacted,
+)
+
+
+def recent_commits(count):
+    """最近 count 个改动过 pages/ 或 locators/ 且有父提交的提交 [(hash, 标题)]"""
+    output = subprocess.run(
+        ['git', 'log', f'-{count}', '--no-merges', '--format=%h %s', '--', *SYMBOL_DIRS],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, encoding='utf-8', check=True
+    ).stdout
+    commits = []
+    for line in output.splitlines():
+        commit, _, subject = line.partition(' ')
+        has_parent = subprocess.run(['git', 'rev-parse', '-q', '--verify', f'{commit}^'],
+                                    cwd=PROJECT_ROOT, capture_output=True).returncode == 0
+        if has_parent:
+            commits.append((commit, subject))
+    return commits
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+    start = time.perf_counter()
+    static_index = build_static_index()
+    index_seconds = time.perf_counter() - start
+    trace = load_trace()
+    traced_tests = len([test for test in trace if test != TRACED_KEY])
+    store = DurationStore()
+    full = estimate_seconds(static_index, store)
+
+    print(f"用例函数: {len(static_index)}  全量预计耗时: {full:.1f}s  "
+          f"静态分析耗时: {index_seconds * 1000:.0f}ms  追踪记录: {traced_tests} 个用例")
+    if not traced_tests:
+        print("提示: 没有追踪记录，先运行 python run_tests.py all（默认开启 --impact-trace）")
+    print(f"{'提交':<9}{'文件级':>8}{'符号级':>8}{'文件级耗时':>12}{'符号级耗时':>12}{'分析耗时':>10}  改动 / 标题")
+
+    totals = {'full': 0.0, 'file': 0.0, 'symbol': 0.0}
+    for commit, subject in recent_commits(count):
+        changes = [path for path in changed_files(f'{commit}^', commit) if path.split('/')[0] in SYMBOL_DIRS]
+        by_file = select_impacted(f'{commit}^', commit, static_index, trace={}, changes=changes)
+        start = time.perf_counter()
+        by_symbol = select_impacted(f'{commit}^', commit, static_index, trace, changes=changes)
+        elapsed = time.perf_counter() - start
+        file_seconds, symbol_seconds = estimate_seconds(by_file, store), estimate_seconds(by_symbol, store)
+        totals['full'] += full
+        totals['file'] += file_seconds
+        totals['symbol'] += symbol_seconds
+        total = len(static_index)
+        print(f"{commit:<9}{len(by_file):>4}/{total:<3}{len(by_symbol):>4}/{total:<3}{file_seconds:>11.1f}s"
+              f"{symbol_seconds:>11.1f}s{elapsed * 1000:>8.0f}ms  {', '.join(changes)}")
+        print(f"{'':<9}{subject[:70]}")
+
+    if totals['full']:
+        print(f"合计预计耗时: 全量 {totals['full']:.1f}s  文件级 {totals['file']:.1f}s"
+              f"（节省 {(1 - totals['file'] / totals['full']) * 100:.0f}%）  "
+              f"符号级 {totals['symbol']:.1f}s（节省 {(1 - totals['symbol'] / totals['full']) * 100:.0f}%）")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+登录提示框等待基准测试
+按 login_test_data.csv 中启用的数据行，对比旧版登录流程（固定 sleep 0.5 秒 + 等待提示框消失）
+与 MutationObserver 事件驱动等待的单行耗时
+
+运行方式：
+    python -m benchmarks.bench_toast_wait [每行重复次数]
+"""
+import sys
+import time
+from config.config import Config
+from pages.login_page import LoginPage
+from test_data.test_data_config import get_test_data
+from utils.driver_pool import DriverPool
+from benchmarks.standin_server import serve_standin, summarize
+
+
+def legacy_login(page, username, password):
+    """旧版 LoginPage.login 的等待方式"""
+    page.select_login_option()
+    page.enter_username(username)
+    page.enter_password(password)
+    page.click_login_button()
+    time.sleep(0.5)
+    if page.is_element_visible(page.PROMPT_MESSAGE, timeout=1):
+        page.wait_for_element_to_disappear(page.PROMPT_MESSAGE, timeout=10)
+
+
+def run_row(pool, row, use_legacy):
+    """执行一行数据，返回登录步骤耗时（秒）"""
+    driver = pool.acquire()
+    try:
+        page = LoginPage(driver)
+        page.navigate_to_login()
+        start = time.perf_counter()
+        if use_legacy:
+            legacy_login(page, row['username'], row['password'])
+        else:
+            page.login(row['username'], row['password'])
+        return time.perf_counter() - start
+    finally:
+        pool.release(driver)
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    rows = get_test_data('login', 'csv')
+    pool = DriverPool(size=1)
+    results = []
+    try:
+        with serve_standin() as base_url:
+            Config.BASE_URL = f'{base_url}/login.html'
+            for row in rows:
+                legacy = [run_row(pool, row, True) for _ in range(repeat)]
+                observed = [run_row(pool, row, False) for _ in range(repeat)]
+                results.append((row['description'], summarize(legacy)['median'], summarize(observed)['median']))
+    finally:
+        pool.close()
+
+    print(f"\n每行登录步骤耗时中位数（秒），每行重复 {repeat} 次")
+    print(f"{'数据行':<16}{'旧流程':>10}{'事件驱动':>10}{'节省':>10}")
+    for description, legacy, observed in results:
+        print(f"{description:<16}{legacy:>10.2f}{observed:>10.2f}{legacy - observed:>10.2f}")
+    saved = sum(legacy - observed for _, legacy, observed in results)
+    print(f"CSV 套件每轮合计节省: {saved:.2f}s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
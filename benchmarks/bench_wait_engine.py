@@ -0,0 +1,84 @@
+"""
+等待引擎基准测试
+在“元素存在 / 元素不存在”矩阵上，对比旧等待方式（隐式等待 5 秒 + 每次新建 WebDriverWait）
+与 WaitEngine 的 WebDriver 请求次数和耗时
+
+运行方式：
+    python -m benchmarks.bench_wait_engine
+"""
+import sys
+import time
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.wait import WebDriverWait
+from config.config import Config
+from pages.base_page import BasePage
+from utils.driver_factory import DriverFactory
+from benchmarks.command_counter import count_commands
+from benchmarks.standin_server import serve_standin
+
+PRESENT = (By.ID, 'tab-password')
+ABSENT = (By.XPATH, "//p[@class='el-message__content']")
+
+
+class LegacyChecks:
+    """旧版 BasePage 的检查方式（隐式等待 + 每次新建 WebDriverWait）"""
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    def is_element_visible(self, locator, timeout=None):
+        try:
+            WebDriverWait(self.driver, timeout or Config.EXPLICIT_WAIT).until(
+                EC.visibility_of_element_located(locator)
+            )
+            return True
+        except TimeoutException:
+            return False
+
+    def is_element_present(self, locator):
+        try:
+            self.driver.find_element(*locator)
+            return True
+        except NoSuchElementException:
+            return False
+
+
+def run_matrix(checks, driver):
+    """执行存在/不存在矩阵，返回 [(场景, 请求次数, 耗时)]"""
+    rows = []
+    for name, call in [
+        ('visible(present, timeout=1)', lambda: checks.is_element_visible(PRESENT, timeout=1)),
+        ('visible(absent, timeout=1)', lambda: checks.is_element_visible(ABSENT, timeout=1)),
+        ('present(present)', lambda: checks.is_element_present(PRESENT)),
+        ('present(absent)', lambda: checks.is_element_present(ABSENT)),
+    ]:
+        with count_commands(driver) as counter:
+            start = time.perf_counter()
+            call()
+            elapsed = time.perf_counter() - start
+        rows.append((name, sum(counter.values()), elapsed))
+    return rows
+
+
+def main():
+    driver = DriverFactory.get_driver()
+    try:
+        with serve_standin() as base_url:
+            driver.get(f'{base_url}/login.html')
+            driver.implicitly_wait(5)
+            legacy = run_matrix(LegacyChecks(driver), driver)
+            driver.implicitly_wait(0)
+            engine = run_matrix(BasePage(driver), driver)
+    finally:
+        driver.quit()
+
+    print(f"\n{'场景':<30}{'旧:请求':>8}{'旧:耗时(s)':>12}{'新:请求':>8}{'新:耗时(s)':>12}")
+    for (name, old_cmds, old_time), (_, new_cmds, new_time) in zip(legacy, engine):
+        print(f"{name:<30}{old_cmds:>8}{old_time:>12.3f}{new_cmds:>8}{new_time:>12.3f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
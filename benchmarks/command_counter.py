@@ -0,0 +1,33 @@
+"""
+WebDriver 命令计数工具
+包装 driver.execute，统计基准测试期间发往浏览器驱动的 HTTP 请求（round-trip）次数
+"""
+from collections import Counter
+from contextlib import contextmanager
+
+
+@contextmanager
+def count_commands(driver):
+    """
+    统计代码块内的 WebDriver 命令次数
+
+    使用示例：
+        with count_commands(driver) as counter:
+            page.is_element_present(locator)
+        print(sum(counter.values()), counter['findElements'])
+
+    Yields:
+        Counter: 命令名称 -> 次数
+    """
+    counter = Counter()
+    original = driver.execute
+
+    def execute(driver_command, params=None):
+        counter[driver_command] += 1
+        return original(driver_command, params)
+
+    driver.execute = execute
+    try:
+        yield counter
+    finally:
+        del driver.execute
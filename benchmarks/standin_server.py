@@ -0,0 +1,62 @@
+"""
+本地登录页替身服务
+用 http.server 在随机端口上提供 benchmarks/standin/ 下的静态页面，供基准脚本离线使用
+"""
+import threading
+from contextlib import contextmanager
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+STANDIN_DIR = Path(__file__).parent / 'standin'
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    """不向控制台输出访问日志的请求处理器"""
+
+    def log_message(self, format, *args):
+        pass
+
+
+@contextmanager
+def serve_standin(directory=STANDIN_DIR):
+    """
+    启动本地替身服务
+
+    Args:
+        directory: 静态文件目录
+
+    Yields:
+        服务根地址，如 http://127.0.0.1:54321
+    """
+    handler = partial(_QuietHandler, directory=str(directory))
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f'http://127.0.0.1:{server.server_address[1]}'
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def summarize(samples):
+    """
+    计算耗时样本的统计值
+
+    Args:
+        samples: 耗时列表（秒）
+
+    Returns:
+        dict: min / median / mean / max / total
+    """
+    ordered = sorted(samples)
+    n = len(ordered)
+    median = ordered[n // 2] if n % 2 else (ordered[n // 2 - 1] + ordered[n // 2]) / 2
+    return {
+        'min': ordered[0],
+        'median': median,
+        'mean': sum(ordered) / n,
+        'max': ordered[-1],
+        'total': sum(ordered),
+    }
@@ -18,11 +18,83 @@ class Config:
     HEADLESS = os.getenv('HEADLESS', 'True').lower() == 'true'  # 启用无头模式，提升测试速度
     # HEADLESS = os.getenv('HEADLESS', 'True').lower() == 'False'  # 启用有头模式，实时预览
     
+    # 浏览器配置档：default（默认）/ fast（大规模回归用：屏蔽图片字体媒体、关闭后台服务、固定小窗口、eager 加载）
+    BROWSER_PROFILE = os.getenv('BROWSER_PROFILE', 'default')
+    FAST_WINDOW_SIZE = os.getenv('FAST_WINDOW_SIZE', '1280,800')  # fast 配置档的窗口尺寸（宽,高）
+    FAST_BLOCKED_URLS = [  # fast 配置档通过 CDP 屏蔽的资源（Chrome / Edge）
+        '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico',
+        '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+        '*.mp4', '*.webm', '*.mp3', '*.ogg', '*.wav',
+    ]
+    
+    # 驱动解析配置（也可通过 CHROMEDRIVER_PATH / GECKODRIVER_PATH / EDGEDRIVER_PATH 显式指定驱动）
+    DRIVER_OFFLINE = os.getenv('DRIVER_OFFLINE', 'False').lower() == 'true'  # 离线模式，不调用 webdriver_manager 下载
+    DRIVER_MANIFEST_TTL = int(os.getenv('DRIVER_MANIFEST_TTL', str(24 * 3600)))  # 驱动清单有效期（秒）
+    
     # 超时配置（优化后）
-    IMPLICIT_WAIT = 5  # 隐式等待（秒）
+    IMPLICIT_WAIT = 0  # 隐式等待（秒）- 固定为 0，所有等待由 WaitEngine 负责，避免与显式等待叠加
     EXPLICIT_WAIT = 10  # 显式等待（秒）
+    WAIT_POLL_INTERVAL = 0.05  # 显式等待初始轮询间隔（秒）
+    WAIT_MAX_POLL_INTERVAL = 0.5  # 显式等待最大轮询间隔（秒）
+    WAIT_BACKOFF = 1.5  # 轮询间隔递增倍数
+    TOAST_WAIT_TIMEOUT = 3  # 点击登录后等待提示框出现的最长时间（秒）
     PAGE_LOAD_TIMEOUT = 30  # 页面加载超时（秒）- 恢复为30秒
     
+    # 元素缓存配置（BasePage 按定位器缓存 WebElement，导航/刷新/切换 frame 窗口时清空，元素失效时自动重新查找）
+    ELEMENT_CACHE_ENABLED = os.getenv('ELEMENT_CACHE', 'True').lower() == 'true'
+    
+    # 表单填写配置（BasePage.fill_form）
+    FILL_FORM_SCRIPT = os.getenv('FILL_FORM_SCRIPT', 'True').lower() == 'true'  # 一次脚本调用赋值并派发事件，False 时逐个字段键盘输入
+    
+    # 驱动池配置（同一 worker 内复用浏览器，用例之间重置状态）
+    DRIVER_POOL_ENABLED = os.getenv('DRIVER_POOL_ENABLED', 'True').lower() == 'true'
+    DRIVER_POOL_SIZE = int(os.getenv('DRIVER_POOL_SIZE', '1'))  # 每个 worker 保持的热浏览器数量
+    DRIVER_PREWARM_DEPTH = int(os.getenv('DRIVER_PREWARM_DEPTH', '1'))  # 后台预热浏览器的最大数量，0 表示关闭预热
+    
+    # 并行调度配置（run_tests.py parallel）
+    TEST_DURATIONS_FILE = Path(os.getenv('TEST_DURATIONS_FILE', str(BASE_DIR / 'reports' / 'durations.json')))  # 历史用例耗时，用于 LPT 分配
+    DEFAULT_TEST_DURATION = 10  # 没有历史记录的用例预估耗时（秒）
+    BROWSER_MEMORY_MB = {'chrome': 350, 'firefox': 400, 'edge': 350}  # 单个浏览器实例的内存占用估算
+    WORKER_MEMORY_MB = 120  # 单个 worker 进程（Python + pytest）的内存占用估算
+    MEMORY_RESERVE_MB = 1024  # 自动计算 worker 数量时为系统保留的内存
+    
+    # 多浏览器矩阵配置（run_tests.py matrix）
+    MATRIX_BROWSERS = os.getenv('MATRIX_BROWSERS', 'chrome,firefox,edge').split(',')  # 参与矩阵的浏览器
+    MATRIX_MAX_WORKERS = {'chrome': 4, 'firefox': 2, 'edge': 2}  # 每种浏览器的最大并行进程数
+    MATRIX_STAGGER = float(os.getenv('MATRIX_STAGGER', '2'))  # 相邻浏览器进程组的启动间隔（秒）
+    BROWSER_LAUNCH_SLOTS = int(os.getenv('BROWSER_LAUNCH_SLOTS', '0'))  # 所有进程中同时启动的浏览器数量上限，0 表示不限制
+    
+    # 命令埋点配置（run_tests.py profile 或 pytest --profile-commands）
+    PROFILE_COMMANDS = os.getenv('PROFILE_COMMANDS', 'False').lower() == 'true'  # 记录每个 WebDriver 命令的耗时
+    PROFILE_BUFFER_SIZE = 10000  # 环形缓冲区容量（条），单个用例超出时丢弃最早的记录
+    
+    # 性能预算配置（utils/perf_budget.py）：指标与最近几次通过运行的中位数比较，增幅按比例计算
+    PERF_BUDGET_ENABLED = os.getenv('PERF_BUDGET', 'True').lower() == 'true'  # 采集导航/绘制/登录耗时并与基线比较
+    PERF_BUDGET_FAIL = os.getenv('PERF_BUDGET_FAIL', 'False').lower() == 'true'  # 超出 fail 阈值时判定用例失败（CI 中开启），默认只警告
+    PERF_HISTORY_FILE = Path(os.getenv('PERF_HISTORY_FILE', str(BASE_DIR / 'reports' / 'perf_history.json')))
+    PERF_TREND_FILE = Path(os.getenv('PERF_TREND_FILE', str(BASE_DIR / 'reports' / 'html' / 'perf_trend.html')))  # 性能趋势报告
+    PERF_HISTORY_SIZE = 20  # 每个指标保留的历史值数量
+    PERF_BASELINE_WINDOW = 5  # 基线取最近几次通过运行的中位数
+    PERF_MIN_SAMPLES = 3  # 历史值少于该数量时只记录不比较
+    PERF_MIN_DELTA_MS = 50  # 绝对增量低于该值时视为抖动
+    PERF_BUDGETS = {  # 按用例标记的阈值（相对基线的增幅），用例有多个标记时取最严格的
+        'default': {'warn': 0.25, 'fail': 0.60},
+        'smoke': {'warn': 0.20, 'fail': 0.50},
+        'critical': {'warn': 0.10, 'fail': 0.30},
+    }
+    
+    # 登录状态缓存配置（logged_in_driver fixture，utils/session_cache.py）
+    SESSION_CACHE_ENABLED = os.getenv('SESSION_CACHE', 'True').lower() == 'true'  # 复用登录状态快照，跳过界面登录
+    SESSION_CACHE_TTL = int(os.getenv('SESSION_CACHE_TTL', '1800'))  # 快照有效期（秒），Cookie 更早过期时以 Cookie 为准
+    TEST_USERNAME = os.getenv('TEST_USERNAME', 'jkcsdw')  # logged_in_driver 使用的测试账号
+    TEST_PASSWORD = os.getenv('TEST_PASSWORD', '123456')
+    
+    # 录制 / 回放配置（utils/replay.py）：record 时经本地服务访问原站点并保存响应，replay 时只从回放包返回响应
+    REPLAY_MODE = os.getenv('REPLAY_MODE', 'off').lower()  # off / record / replay
+    REPLAY_BUNDLE = Path(os.getenv('REPLAY_BUNDLE', str(BASE_DIR / 'test_data' / 'replay' / 'login')))  # 回放包目录
+    REPLAY_LATENCY_MS = int(os.getenv('REPLAY_LATENCY_MS', '0'))  # 每个响应注入的延迟（毫秒）
+    REPLAY_IGNORE_PARAMS = ['t', '_', 'timestamp']  # 匹配请求时忽略的查询参数（时间戳、防缓存参数）
+    
     # 测试环境配置
     ENV = os.getenv('ENV', 'test')  # dev, test, prod
     
@@ -35,6 +107,8 @@ class Config:
     SCREENSHOTS_DIR = REPORTS_DIR / 'screenshots'
     LOGS_DIR = REPORTS_DIR / 'logs'
     TEST_DATA_DIR = BASE_DIR / 'test_data'
+    PROFILE_DIR = Path(os.getenv('PROFILE_DIR', str(REPORTS_DIR / 'profile')))  # 命令埋点的用例 JSON
+    DOM_SNAPSHOT_DIR = TEST_DATA_DIR / 'dom_snapshots'  # 定位器分析使用的页面 DOM 快照（run_tests.py locators）
     
     # 报告输出路径（三种格式）
     ALLURE_DIR = REPORTS_DIR / 'allure-results'
@@ -42,19 +116,38 @@ class Config:
     
     # 截图配置
     SCREENSHOT_ON_FAILURE = True
+    SCREENSHOT_WRITERS = 2  # 后台写盘线程数量
+    SCREENSHOT_QUEUE_SIZE = 32  # 待写盘截图队列上限，队满时测试线程等待
+    SCREENSHOT_FORMAT = os.getenv('SCREENSHOT_FORMAT', 'png')  # 保存格式：png / webp / jpeg（后两者需安装 Pillow）
+    SCREENSHOT_QUALITY = int(os.getenv('SCREENSHOT_QUALITY', '80'))  # WebP / JPEG 压缩质量
+    SCREENSHOT_MAX_WIDTH = int(os.getenv('SCREENSHOT_MAX_WIDTH', '0'))  # 最大宽度（像素），0 表示不缩放
+    SCREENSHOT_STORE_MAX_MB = int(os.getenv('SCREENSHOT_STORE_MAX_MB', '500'))  # 截图存储容量上限，0 表示不限制
     
     # 日志配置
     LOG_LEVEL = 'INFO'
     LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-
-
-# 确保必要目录存在
-for _p in [
-    Config.REPORTS_DIR,
-    Config.SCREENSHOTS_DIR,
-    Config.LOGS_DIR,
-    Config.REPORTS_DIR / 'html',
-    Config.ALLURE_DIR,
-    Config.HTMLREPORT_DIR,
-]:
-    _p.mkdir(parents=True, exist_ok=True)
\ No newline at end of file
+    LOG_NAME = os.getenv('LOG_NAME', 'automation')  # 日志文件名，并行运行时追加 worker 编号（automation_gw0.log）
+    LOG_JSON = os.getenv('LOG_JSON', 'True').lower() == 'true'  # 同时写出结构化 JSON 日志（<LOG_NAME>.jsonl）
+    
+    _dirs_ready = False
+    
+    @classmethod
+    def ensure_dirs(cls):
+        """
+        创建报告、截图、日志等输出目录（只执行一次）
+        
+        导入配置模块不再有创建目录的副作用，由 pytest 会话开始时（conftest.py）或 run_tests.py 调用；
+        各写文件的组件仍会按需创建自己的目录
+        """
+        if cls._dirs_ready:
+            return
+        for path in [
+            cls.REPORTS_DIR,
+            cls.SCREENSHOTS_DIR,
+            cls.LOGS_DIR,
+            cls.REPORTS_DIR / 'html',
+            cls.ALLURE_DIR,
+            cls.HTMLREPORT_DIR,
+        ]:
+            path.mkdir(parents=True, exist_ok=True)
+        cls._dirs_ready = True
@@ -2,20 +2,128 @@
 基础页面类模块
 所有页面对象类的基类，提供通用的页面操作方法
 """
-from selenium.webdriver.support.wait import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import (
-    TimeoutException,
-    NoSuchElementException,
-)
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
 from selenium.webdriver.common.action_chains import ActionChains
+from selenium.webdriver.remote.webelement import WebElement
 from config.config import Config
 from utils.logger import Logger
 from utils.screenshot import Screenshot
+from utils.wait_engine import WaitEngine
+
+# 浏览器端按 Selenium 定位策略查找元素（与 By.* 的取值一一对应）
+FIND_ALL_JS = """
+function findAll(by, value) {
+    switch (by) {
+        case 'id':
+            return Array.from(document.querySelectorAll('#' + CSS.escape(value)));
+        case 'name':
+            return Array.from(document.querySelectorAll('[name="' + CSS.escape(value) + '"]'));
+        case 'class name':
+            return Array.from(document.getElementsByClassName(value));
+        case 'tag name':
+            return Array.from(document.getElementsByTagName(value));
+        case 'css selector':
+            return Array.from(document.querySelectorAll(value));
+        case 'xpath':
+            var result = document.evaluate(value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            var nodes = [];
+            for (var i = 0; i < result.snapshotLength; i++) nodes.push(result.snapshotItem(i));
+            return nodes;
+        case 'link text':
+        case 'partial link text':
+            return Array.from(document.getElementsByTagName('a')).filter(function (a) {
+                var text = a.innerText.trim();
+                return by === 'link text' ? text === value : text.indexOf(value) !== -1;
+            });
+    }
+    throw new Error('不支持的定位方式: ' + by);
+}
+"""
+
+# 批量查询：一次脚本调用返回多个定位器的 count / present / visible / text / attr:<name>
+QUERY_MANY_JS = FIND_ALL_JS + """
+function isVisible(el) {
+    if (!el.getClientRects().length) return false;
+    var style = window.getComputedStyle(el);
+    return style.visibility !== 'hidden' && style.opacity !== '0';
+}
+var snapshot = {};
+arguments[0].forEach(function (query) {
+    var name = query[0], elements = findAll(query[1], query[2]), first = elements[0] || null, state = {};
+    query[3].forEach(function (prop) {
+        if (prop === 'count') state[prop] = elements.length;
+        else if (prop === 'present') state[prop] = elements.length > 0;
+        else if (prop === 'visible') state[prop] = first !== null && isVisible(first);
+        else if (prop === 'text') state[prop] = first === null ? null : first.innerText.trim();
+        else if (prop.indexOf('attr:') === 0) state[prop] = first === null ? null : first.getAttribute(prop.slice(5));
+        else throw new Error('不支持的查询属性: ' + prop);
+    });
+    snapshot[name] = state;
+});
+return snapshot;
+"""
+
+# 批量填写表单：arguments[0] 为 [[by, value, 文本], ...]
+# 任一字段未找到时不填写并返回未找到的下标；否则用原生 value setter 赋值（绕过框架对 value 属性的拦截），
+# 再派发冒泡的 input / change 事件，Element-UI / Vue 的 v-model 据此更新数据模型
+FILL_FORM_JS = FIND_ALL_JS + """
+var fields = arguments[0], elements = [], missing = [];
+fields.forEach(function (field, i) {
+    var element = findAll(field[0], field[1])[0];
+    if (element) elements.push(element); else missing.push(i);
+});
+if (missing.length) return missing;
+elements.forEach(function (element, i) {
+    var prototype = Object.getPrototypeOf(element);
+    var descriptor = Object.getOwnPropertyDescriptor(prototype, 'value');
+    if (descriptor && descriptor.set) descriptor.set.call(element, fields[i][2]); else element.value = fields[i][2];
+    element.dispatchEvent(new Event('input', {bubbles: true}));
+    element.dispatchEvent(new Event('change', {bubbles: true}));
+});
+return missing;
+"""
+
+
+class _RefindingElement(WebElement):
+    """
+    find_element 返回的元素：不预先确认缓存的元素是否有效，使用时（click / text / get_attribute 等任一命令）
+    元素已失效则按定位器重新查找并重试一次，与 _with_element 的失效重试一致
+    
+    作为 execute_script 参数传入时不经过 _execute，元素失效时仍由调用方处理
+    """
+    
+    def __init__(self, page, locator, element):
+        super().__init__(element.parent, element.id)
+        self._page = page
+        self._locator = locator
+    
+    def _execute(self, command, params=None):
+        try:
+            return super()._execute(command, params)
+        except StaleElementReferenceException:
+            self._page._count('stale')
+            self._page.invalidate_cache(self._locator)
+            element = self._page.waiter.until(
+                self._page._element_condition(self._locator), f"未找到元素: {self._locator}", locator=self._locator
+            )
+            self._id = element.id
+            return super()._execute(command, params)
 
 
 class BasePage:
-    """所有页面对象的基类"""
+    """
+    所有页面对象的基类
+    
+    元素缓存：find_element 等方法按定位器缓存 WebElement，同一页面对象重复操作同一元素时不再发送 findElement；
+    导航、刷新、前进后退、切换 frame / 窗口时清空缓存，元素失效（StaleElementReferenceException）时重新查找并重试一次
+    """
+    
+    # 定位器超时预算 {locator: 秒}，子类可按需覆盖；调用时未传 timeout 则优先使用预算
+    TIMEOUT_BUDGETS = {}
+    
+    # 所有页面对象累计的元素缓存统计
+    cache_totals = {'hits': 0, 'misses': 0, 'stale': 0}
     
     def __init__(self, driver):
         """
@@ -25,13 +133,87 @@ class BasePage:
             driver: WebDriver 实例
         """
         self.driver = driver
-        self.wait = WebDriverWait(driver, Config.EXPLICIT_WAIT)
+        self.waiter = WaitEngine(driver, budgets=self.TIMEOUT_BUDGETS)
+        self.wait = self.waiter  # 兼容旧代码中的 self.wait.until(...)
         self.logger = Logger().get_logger()
         self.actions = ActionChains(driver)
+        self._elements = {}
+        self.cache_stats = {'hits': 0, 'misses': 0, 'stale': 0}
+    
+    def _count(self, name):
+        self.cache_stats[name] += 1
+        BasePage.cache_totals[name] += 1
+    
+    def invalidate_cache(self, locator=None):
+        """
+        清空元素缓存（默认全部）
+        
+        页面对象自身的导航、刷新、切换 frame / 窗口会自动调用；
+        由页面脚本触发的整页跳转无需调用，失效的元素在使用时会被重新查找
+        """
+        if locator is None:
+            self._elements.clear()
+        else:
+            self._elements.pop(locator, None)
+    
+    def _lookup(self, locator):
+        """缓存中的元素，未命中时查找并缓存（未找到时抛出 NoSuchElementException，由等待引擎忽略）"""
+        element = self._elements.get(locator)
+        if element is not None:
+            self._count('hits')
+            return element
+        self._count('misses')
+        element = self.driver.find_element(*locator)
+        if Config.ELEMENT_CACHE_ENABLED:
+            self._elements[locator] = element
+        return element
+    
+    def _element_condition(self, locator, check=None, name='presence_of_element_located'):
+        """
+        等待条件：对（缓存的）元素执行 check，元素已失效时丢弃缓存并立即重新查找一次
+        
+        Args:
+            locator: 元素定位器
+            check: check(element) 返回真值表示条件成立，默认只要求元素存在；条件成立时返回元素
+            name: 条件名称（命令埋点中的等待名称，与对应的 expected_conditions 一致）
+        """
+        def element_ready(driver):
+            for _ in range(2):
+                element = self._lookup(locator)
+                try:
+                    return element if check is None or check(element) else False
+                except StaleElementReferenceException:
+                    self._count('stale')
+                    self.invalidate_cache(locator)
+            return False
+        
+        element_ready.__qualname__ = name
+        return element_ready
+    
+    def _with_element(self, locator, action, timeout=None, check=None, name='presence_of_element_located'):
+        """
+        等待元素就绪后执行 action(element)；缓存的元素在执行时已失效则重新查找并重试一次
+        
+        Returns:
+            action 的返回值
+        """
+        for attempt in range(2):
+            element = self.waiter.until(
+                self._element_condition(locator, check, name), f"未找到元素: {locator}", timeout=timeout, locator=locator
+            )
+            try:
+                return action(element)
+            except StaleElementReferenceException:
+                if attempt:
+                    raise
+                self._count('stale')
+                self.invalidate_cache(locator)
     
     def find_element(self, locator, timeout=None):
         """
-        查找单个元素
+        查找单个元素（优先返回缓存的元素）
+        
+        缓存命中时不发送请求；返回的元素在使用时已失效（页面重新渲染）则按定位器重新查找并重试一次
         
         Args:
             locator: 元素定位器 (By.ID, "element_id")
@@ -41,14 +223,14 @@ class BasePage:
             WebElement
         """
         try:
-            wait_time = timeout or Config.EXPLICIT_WAIT
-            wait = WebDriverWait(self.driver, wait_time)
-            element = wait.until(EC.presence_of_element_located(locator))
-            self.logger.debug(f"找到元素: {locator}")
-            return element
+            element = self.waiter.until(
+                self._element_condition(locator), f"未找到元素: {locator}", timeout=timeout, locator=locator
+            )
+            self.logger.debug("找到元素: %s", locator)
+            return _RefindingElement(self, locator, element)
         except TimeoutException:
-            self.logger.error(f"未找到元素: {locator}")
-            Screenshot.take_screenshot(self.driver, "element_not_found")
+            self.logger.error("未找到元素: %s", locator)
+            Screenshot.take_screenshot(self.driver, "element_not_found", failure=True)
             raise
     
     def find_elements(self, locator, timeout=None):
@@ -63,13 +245,13 @@ class BasePage:
             WebElement 列表
         """
         try:
-            wait_time = timeout or Config.EXPLICIT_WAIT
-            wait = WebDriverWait(self.driver, wait_time)
-            elements = wait.until(EC.presence_of_all_elements_located(locator))
-            self.logger.debug(f"找到 {len(elements)} 个元素: {locator}")
+            elements = self.waiter.until(
+                EC.presence_of_all_elements_located(locator), timeout=timeout, locator=locator
+            )
+            self.logger.debug("找到 %s 个元素: %s", len(elements), locator)
             return elements
         except TimeoutException:
-            self.logger.error(f"未找到元素: {locator}")
+            self.logger.error("未找到元素: %s", locator)
             return []
     
     def click(self, locator, timeout=None):
@@ -81,14 +263,14 @@ class BasePage:
             timeout: 超时时间
         """
         try:
-            wait_time = timeout or Config.EXPLICIT_WAIT
-            wait = WebDriverWait(self.driver, wait_time)
-            element = wait.until(EC.element_to_be_clickable(locator))
-            element.click()
-            self.logger.info(f"点击元素: {locator}")
+            self._with_element(
+                locator, lambda element: element.click(), timeout,
+                check=lambda element: element.is_displayed() and element.is_enabled(), name='element_to_be_clickable'
+            )
+            self.logger.info("点击元素: %s", locator)
         except Exception as e:
-            self.logger.error(f"点击元素失败: {locator}, 错误: {e}")
-            Screenshot.take_screenshot(self.driver, "click_failed")
+            self.logger.error("点击元素失败: %s, 错误: %s", locator, e)
+            Screenshot.take_screenshot(self.driver, "click_failed", failure=True)
             raise
     
     def input_text(self, locator, text, timeout=None):
@@ -101,15 +283,54 @@ class BasePage:
             timeout: 超时时间
         """
         try:
-            element = self.find_element(locator, timeout)
-            element.clear()
-            element.send_keys(text)
-            self.logger.info(f"输入文本到 {locator}: {text}")
+            def clear_and_type(element):
+                element.clear()
+                element.send_keys(text)
+            
+            self._with_element(locator, clear_and_type, timeout)
+            self.logger.info("输入文本到 %s: %s", locator, text)
         except Exception as e:
-            self.logger.error(f"输入文本失败: {locator}, 错误: {e}")
-            Screenshot.take_screenshot(self.driver, "input_failed")
+            self.logger.error("输入文本失败: %s, 错误: %s", locator, e)
+            Screenshot.take_screenshot(self.driver, "input_failed", failure=True)
             raise
     
+    def fill_form(self, fields, keystroke_fields=(), timeout=None):
+        """
+        批量填写表单（一次 execute_script 请求）
+        
+        直接赋值并派发 input / change 事件，不逐键输入；字段尚未出现时重试整个脚本直到超时。
+        依赖键盘事件的字段（输入掩码、按键监听、自动补全等）放入 keystroke_fields，
+        在脚本填写之后按顺序用 input_text 逐个输入；Config.FILL_FORM_SCRIPT 为 False 时全部逐个输入
+        
+        Args:
+            fields: {定位器: 文本}，按顺序填写
+            keystroke_fields: 需要真实键盘输入的定位器
+            timeout: 超时时间
+        
+        示例：
+            self.fill_form({self.USERNAME_INPUT: username, self.PASSWORD_INPUT: password})
+            self.fill_form({self.PHONE_INPUT: phone, self.CODE_INPUT: code}, keystroke_fields=[self.PHONE_INPUT])
+        """
+        keystroke = [locator for locator in fields if not Config.FILL_FORM_SCRIPT or locator in keystroke_fields]
+        scripted = [[by, value, str(text)] for (by, value), text in fields.items() if (by, value) not in keystroke]
+        
+        def form_filled(driver):
+            return not driver.execute_script(FILL_FORM_JS, scripted)
+        
+        if scripted:
+            try:
+                self.waiter.until(
+                    form_filled, f"表单字段未出现: {[tuple(field[:2]) for field in scripted]}",
+                    timeout=timeout, locator=tuple(scripted[0][:2])
+                )
+                self.logger.info("批量填写表单: %s", {(by, value): text for by, value, text in scripted})
+            except Exception as e:
+                self.logger.error("批量填写表单失败: %s, 错误: %s", list(fields), e)
+                Screenshot.take_screenshot(self.driver, "fill_form_failed", failure=True)
+                raise
+        for locator in keystroke:
+            self.input_text(locator, fields[locator], timeout)
+    
     def get_text(self, locator, timeout=None):
         """
         获取元素文本
@@ -121,9 +342,8 @@ class BasePage:
         Returns:
             元素文本内容
         """
-        element = self.find_element(locator, timeout)
-        text = element.text
-        self.logger.debug(f"获取元素文本 {locator}: {text}")
+        text = self._with_element(locator, lambda element: element.text, timeout)
+        self.logger.debug("获取元素文本 %s: %s", locator, text)
         return text
     
     def get_attribute(self, locator, attribute, timeout=None):
@@ -138,9 +358,8 @@ class BasePage:
         Returns:
             属性值
         """
-        element = self.find_element(locator, timeout)
-        value = element.get_attribute(attribute)
-        self.logger.debug(f"获取元素属性 {locator}.{attribute}: {value}")
+        value = self._with_element(locator, lambda element: element.get_attribute(attribute), timeout)
+        self.logger.debug("获取元素属性 %s.%s: %s", locator, attribute, value)
         return value
     
     def is_element_visible(self, locator, timeout=None):
@@ -149,24 +368,23 @@ class BasePage:
         
         Args:
             locator: 元素定位器
-            timeout: 超时时间
+            timeout: 超时时间，0 表示只检查一次
         
         Returns:
             bool
         """
-        try:
-            wait_time = timeout or Config.EXPLICIT_WAIT
-            wait = WebDriverWait(self.driver, wait_time)
-            wait.until(EC.visibility_of_element_located(locator))
-            self.logger.debug(f"元素可见: {locator}")
+        visible = self._element_condition(
+            locator, lambda element: element.is_displayed(), name='visibility_of_element_located'
+        )
+        if self.waiter.check(visible, timeout=timeout, locator=locator):
+            self.logger.debug("元素可见: %s", locator)
             return True
-        except TimeoutException:
-            self.logger.debug(f"元素不可见: {locator}")
-            return False
+        self.logger.debug("元素不可见: %s", locator)
+        return False
     
     def is_element_present(self, locator):
         """
-        检查元素是否存在于 DOM 中
+        检查元素是否存在于 DOM 中（立即返回，不等待）
         
         Args:
             locator: 元素定位器
@@ -174,11 +392,34 @@ class BasePage:
         Returns:
             bool
         """
-        try:
-            self.driver.find_element(*locator)
-            return True
-        except NoSuchElementException:
-            return False
+        return len(self.driver.find_elements(*locator)) > 0
+    
+    def query_many(self, spec):
+        """
+        批量查询多个元素的状态（一次 execute_script 请求）
+        
+        Args:
+            spec: {名称: (定位器, 属性列表)}，属性支持：
+                  'count'       匹配元素数量
+                  'present'     是否存在于 DOM 中
+                  'visible'     第一个匹配元素是否可见
+                  'text'        第一个匹配元素的可见文本
+                  'attr:<名称>'  第一个匹配元素的属性值
+        
+        Returns:
+            {名称: {属性: 值}}，元素不存在时 text / attr 为 None，visible 为 False
+        
+        示例：
+            state = self.query_many({
+                'prompt': (self.PROMPT_MESSAGE, ('visible', 'text')),
+                'username': (self.USERNAME_INPUT, ('attr:value',)),
+            })
+            if state['prompt']['visible']: ...
+        """
+        queries = [[name, by, value, list(props)] for name, ((by, value), props) in spec.items()]
+        snapshot = self.driver.execute_script(QUERY_MANY_JS, queries)
+        self.logger.debug("批量查询结果: %s", snapshot)
+        return snapshot
     
     def wait_for_element_to_disappear(self, locator, timeout=None):
         """
@@ -188,10 +429,10 @@ class BasePage:
             locator: 元素定位器
             timeout: 超时时间
         """
-        wait_time = timeout or Config.EXPLICIT_WAIT
-        wait = WebDriverWait(self.driver, wait_time)
-        wait.until(EC.invisibility_of_element_located(locator))
-        self.logger.debug(f"元素已消失: {locator}")
+        self.waiter.until(
+            EC.invisibility_of_element_located(locator), f"元素未消失: {locator}", timeout=timeout, locator=locator
+        )
+        self.logger.debug("元素已消失: %s", locator)
     
     def scroll_to_element(self, locator):
         """
@@ -200,9 +441,10 @@ class BasePage:
         Args:
             locator: 元素定位器
         """
-        element = self.find_element(locator)
-        self.driver.execute_script("arguments[0].scrollIntoView(true);", element)
-        self.logger.debug(f"滚动到元素: {locator}")
+        self._with_element(
+            locator, lambda element: self.driver.execute_script("arguments[0].scrollIntoView(true);", element)
+        )
+        self.logger.debug("滚动到元素: %s", locator)
     
     def hover_over_element(self, locator):
         """
@@ -211,9 +453,8 @@ class BasePage:
         Args:
             locator: 元素定位器
         """
-        element = self.find_element(locator)
-        self.actions.move_to_element(element).perform()
-        self.logger.debug(f"鼠标悬停: {locator}")
+        self._with_element(locator, lambda element: self.actions.move_to_element(element).perform())
+        self.logger.debug("鼠标悬停: %s", locator)
     
     def switch_to_frame(self, frame_locator):
         """
@@ -223,15 +464,16 @@ class BasePage:
             frame_locator: frame 定位器或索引
         """
         if isinstance(frame_locator, tuple):
-            frame = self.find_element(frame_locator)
-            self.driver.switch_to.frame(frame)
+            self._with_element(frame_locator, self.driver.switch_to.frame)
         else:
             self.driver.switch_to.frame(frame_locator)
-        self.logger.debug(f"切换到 frame: {frame_locator}")
+        self.invalidate_cache()
+        self.logger.debug("切换到 frame: %s", frame_locator)
     
     def switch_to_default_content(self):
         """切换回主文档"""
         self.driver.switch_to.default_content()
+        self.invalidate_cache()
         self.logger.debug("切换回主文档")
     
     def switch_to_window(self, window_index=-1):
@@ -243,7 +485,8 @@ class BasePage:
         """
         windows = self.driver.window_handles
         self.driver.switch_to.window(windows[window_index])
-        self.logger.debug(f"切换到窗口: {window_index}")
+        self.invalidate_cache()
+        self.logger.debug("切换到窗口: %s", window_index)
     
     def execute_script(self, script, *args):
         """
@@ -257,9 +500,19 @@ class BasePage:
             脚本执行结果
         """
         result = self.driver.execute_script(script, *args)
-        self.logger.debug(f"执行脚本: {script}")
+        self.logger.debug("执行脚本: %s", script)
         return result
     
+    def open(self, url):
+        """
+        打开页面（清空元素缓存）
+        
+        Args:
+            url: 页面地址
+        """
+        self.driver.get(url)
+        self.invalidate_cache()
+    
     def get_current_url(self):
         """获取当前页面 URL"""
         return self.driver.current_url
@@ -271,14 +524,17 @@ class BasePage:
     def refresh_page(self):
         """刷新页面"""
         self.driver.refresh()
+        self.invalidate_cache()
         self.logger.info("刷新页面")
     
     def navigate_back(self):
         """后退"""
         self.driver.back()
+        self.invalidate_cache()
         self.logger.info("浏览器后退")
     
     def navigate_forward(self):
         """前进"""
         self.driver.forward()
+        self.invalidate_cache()
         self.logger.info("浏览器前进")
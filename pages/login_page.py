@@ -3,9 +3,12 @@
  登录页面的业务封装（登录方法、元素定位、状态验证）
 
 """
+import time
 from pages.base_page import BasePage
 from config.config import Config
 from locators.login_locators import LoginPageLocators
+from utils.perf_metrics import PerfMetrics
+from utils.screenshot import Screenshot
 
 
 class LoginPage(BasePage):
@@ -18,17 +21,54 @@ class LoginPage(BasePage):
     LOGIN_BUTTON = LoginPageLocators.LOGIN_BUTTON
     PROMPT_MESSAGE = LoginPageLocators.PROMPT_MESSAGE
     
+    # 需要真实键盘输入的字段（登录表单没有按键监听，全部通过脚本填写）
+    KEYSTROKE_FIELDS = ()
+    
+    # 提示框超时预算：接口响应后提示框通常 1-2 秒内出现
+    TIMEOUT_BUDGETS = {PROMPT_MESSAGE: 5}
+    
+    # 提示框观察器：记录注入之后出现的 el-message（文本、类型、出现时刻）
+    TOAST_OBSERVER_JS = """
+    if (window.__toastObserver) window.__toastObserver.disconnect();
+    window.__toasts = [];
+    window.__toastNodes = [];
+    function record(node) {
+        if (node.nodeType !== 1) return;
+        var boxes = node.matches('.el-message') ? [node] : Array.from(node.querySelectorAll('.el-message'));
+        boxes.forEach(function (box) {
+            var type = (box.className.match(/el-message--(\\w+)/) || [])[1] || null;
+            window.__toastNodes.push(box);
+            window.__toasts.push({text: box.textContent.trim(), type: type, time: performance.now()});
+        });
+    }
+    window.__toastObserver = new MutationObserver(function (mutations) {
+        mutations.forEach(function (mutation) { mutation.addedNodes.forEach(record); });
+    });
+    window.__toastObserver.observe(document.body, {childList: true, subtree: true});
+    """
+    
+    # 读取观察器记录；观察器不存在（页面已整页跳转）时返回 null
+    READ_TOASTS_JS = """
+    if (!window.__toasts) return null;
+    window.__toasts.forEach(function (toast, i) {
+        if (!toast.text) toast.text = window.__toastNodes[i].textContent.trim();
+    });
+    return {toasts: window.__toasts, navigated: location.href !== arguments[0]};
+    """
+    
     def __init__(self, driver):
         """
         初始化登录页面
         """
         super().__init__(driver)
         self.url = Config.BASE_URL
+        self.toasts = None  # login() 期间记录到的提示框，None 表示尚未登录
     
     def navigate_to_login(self):
         """导航到登录页面"""
-        self.driver.get(self.url)
-        self.logger.info(f"导航到登录页面: {self.url}")
+        self.open(self.url)
+        PerfMetrics.capture_page_timing(self.driver, 'navigate')
+        self.logger.info("导航到登录页面: %s", self.url)
 
     def select_login_option(self, option=None):
         """
@@ -53,6 +93,35 @@ class LoginPage(BasePage):
         """点击登录按钮"""
         self.click(self.LOGIN_BUTTON)
         
+    def _watch_toasts(self):
+        """在页面中注入 MutationObserver，记录之后出现的 el-message 提示框"""
+        self.driver.execute_script(self.TOAST_OBSERVER_JS)
+        self.toasts = None
+    
+    def wait_for_toasts(self, timeout=None):
+        """
+        等待 MutationObserver 记录到提示框
+        
+        提示框出现、页面发生跳转（观察器随旧页面销毁或 URL 改变）或超时后返回，
+        不依赖提示框在轮询时刻仍然可见，短暂出现的提示框也不会漏掉
+        
+        Args:
+            timeout: 超时时间（秒），默认读取 Config.TOAST_WAIT_TIMEOUT
+        
+        Returns:
+            提示框列表 [{'text': 文本, 'type': 'error'/'success'/..., 'time': 出现时刻(ms)}]
+        """
+        def toasts_or_navigated(driver):
+            state = driver.execute_script(self.READ_TOASTS_JS, self.url)
+            if state is None:
+                return {'toasts': []}
+            return state if state['toasts'] or state['navigated'] else False
+        
+        timeout = Config.TOAST_WAIT_TIMEOUT if timeout is None else timeout
+        state = self.waiter.check(toasts_or_navigated, timeout=timeout)
+        self.toasts = state['toasts'] if state else []
+        return self.toasts
+    
     def login(self, username, password):
         """
         执行登录操作
@@ -60,31 +129,59 @@ class LoginPage(BasePage):
             username: 用户名
             password: 密码
         """
-        self.logger.info(f"尝试登录，用户名: {username}")
+        self.logger.info("尝试登录，用户名: %s", username)
         
         # 首先尝试选择登录选项
         self.select_login_option()       
-        # 输入用户名和密码
-        self.enter_username(username)
-        self.enter_password(password)       
+        # 一次脚本调用填写用户名和密码（Element-UI 输入框通过 input 事件更新 v-model）
+        self.fill_form({self.USERNAME_INPUT: username, self.PASSWORD_INPUT: password},
+                       keystroke_fields=self.KEYSTROKE_FIELDS)
+        # 点击前注入观察器，点击后等待提示框被记录（无需固定 sleep，也无需等待提示框消失）
+        self._watch_toasts()
+        PerfMetrics.mark(self.driver, 'login')
+        start = time.perf_counter()
         self.click_login_button()
+        toasts = self.wait_for_toasts()
+        # 性能指标：点击到提示框出现的耗时；登录接口耗时（整页跳转时为新页面的导航耗时）
+        if toasts:
+            PerfMetrics.record('login.feedback', (time.perf_counter() - start) * 1000)
+        PerfMetrics.capture_action_timing(self.driver, 'login')
         
-        # 点击登录按钮后立即等待一小段时间，让错误弹窗有时间出现
-        import time
-        time.sleep(0.5)  # 等待500毫秒确保弹窗出现
-        
-        # 检查是否有错误提示弹窗，如果有则立即截图
-        if self.is_element_visible(self.PROMPT_MESSAGE, timeout=1):
-            # 有错误弹窗，立即截图
-            from utils.screenshot import Screenshot
+        # 有非成功类提示框时立即截图
+        if any(toast['type'] != 'success' for toast in toasts):
             Screenshot.take_screenshot(self.driver, f"login_error_{username}")
-            self.logger.info(f"检测到错误弹窗，已截图: login_error_{username}")
-            # 等待弹窗消失
-            self.wait_for_element_to_disappear(self.PROMPT_MESSAGE, timeout=10)
-        else:
+            self.logger.info("检测到错误弹窗，已截图: login_error_%s", username)
+        elif not toasts:
             # 没有错误弹窗，可能是成功登录，不截图
             self.logger.info("未检测到错误弹窗")
     
+    def _find_toast_text(self, keywords):
+        """
+        在 login() 记录的提示框中查找包含关键字的文本
+        
+        Returns:
+            匹配的文本；未调用过 login() 时返回 False，表示需要回退到页面查询
+        """
+        if self.toasts is None:
+            return False
+        for toast in self.toasts:
+            if any(keyword in toast['text'].lower() for keyword in keywords):
+                return toast['text']
+        return None
+    
+    def _get_prompt_text(self):
+        """
+        等待提示框出现，可见性和文本在同一次脚本调用中取回
+        
+        Returns:
+            提示框文本，超时未出现返回 None
+        """
+        def visible_prompt_text(driver):
+            prompt = self.query_many({'prompt': (self.PROMPT_MESSAGE, ('visible', 'text'))})['prompt']
+            return prompt['text'] if prompt['visible'] else False
+        
+        return self.waiter.check(visible_prompt_text, locator=self.PROMPT_MESSAGE) or None
+    
     def get_error_message(self):
         """
         获取错误消息
@@ -92,10 +189,13 @@ class LoginPage(BasePage):
         Returns:
             错误消息文本
         """
-        if self.is_element_visible(self.PROMPT_MESSAGE, timeout=5):
-            message_text = self.get_text(self.PROMPT_MESSAGE)
-            if any(keyword in message_text.lower() for keyword in ['账号不存在或账号状态异常，请联系管理员', '账号或密码错误']):
-                return message_text
+        keywords = ['账号不存在或账号状态异常，请联系管理员', '账号或密码错误']
+        recorded = self._find_toast_text(keywords)
+        if recorded is not False:
+            return recorded
+        message_text = self._get_prompt_text()
+        if message_text and any(keyword in message_text.lower() for keyword in keywords):
+            return message_text
         return None
     
     def get_success_message(self):
@@ -105,10 +205,13 @@ class LoginPage(BasePage):
         Returns:
             成功消息文本
         """
-        if self.is_element_visible(self.PROMPT_MESSAGE, timeout=5):
-            message_text = self.get_text(self.PROMPT_MESSAGE)
-            if any(keyword in message_text.lower() for keyword in ['登录成功']):
-                return message_text
+        keywords = ['登录成功']
+        recorded = self._find_toast_text(keywords)
+        if recorded is not False:
+            return recorded
+        message_text = self._get_prompt_text()
+        if message_text and any(keyword in message_text.lower() for keyword in keywords):
+            return message_text
         return None
     
     def is_login_successful(self):
@@ -119,12 +222,11 @@ class LoginPage(BasePage):
         """
         # 检查是否跳转到主页或显示成功消息
         try:
-            # 检查URL是否改变（表明已登录并跳转）
-            url_changed = self.get_current_url() != self.url
-            # 检查是否有成功消息
-            has_success_message = self.get_success_message() is not None
-            # 如果URL改变了或者有成功提示，则认为登录成功
-            return url_changed or has_success_message
+            # URL 改变说明已登录并跳转，无需再等待提示框
+            if self.get_current_url() != self.url:
+                return True
+            # 否则检查是否有成功提示
+            return self.get_success_message() is not None
         except Exception:
             return False
     
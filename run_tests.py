@@ -21,16 +21,24 @@ def _is_module_available(mod_name: str) -> bool:
         return False
 
 
-def _add_report_options(args: list) -> None:
+def _allure_dir(suffix: str = '') -> Path:
+    """Allure 结果目录，suffix 非空时为 reports/allure-results-<suffix>"""
+    return Config.ALLURE_DIR.with_name(f'{Config.ALLURE_DIR.name}-{suffix}') if suffix else Config.ALLURE_DIR
+
+
+def _add_report_options(args: list, suffix: str = '') -> None:
     """
     添加报告生成选项（三种报告格式）
     
     Args:
         args: pytest 参数列表
+        suffix: 报告文件名后缀（matrix 模式下为浏览器名，同时运行的进程各自写入，互不覆盖）
     """
+    name = f'report-{suffix}.html' if suffix else 'report.html'
+    
     # 1. Pytest HTML - 详细的HTML测试报告
     if _is_module_available('pytest_html'):
-        args.append('--html=reports/html/report.html')
+        args.append(f'--html=reports/html/{name}')
         args.append('--self-contained-html')
         print("✓ 启用 Pytest HTML 报告")
     else:
@@ -38,34 +46,38 @@ def _add_report_options(args: list) -> None:
     
     # 2. HTMLReport (pytest-html-reporter) - 现代化测试报告
     if _is_module_available('pytest_html_reporter'):
-        args.append(f'--html-report={Config.HTMLREPORT_DIR / "report.html"}')
+        args.append(f'--html-report={Config.HTMLREPORT_DIR / name}')
         print("✓ 启用 HTMLReport 报告")
     else:
         print("⚠ pytest-html-reporter 未安装，跳过HTMLReport报告")
     
     # 3. Allure - 专业级交互式报告
     if _is_module_available('allure_pytest'):
-        args.append(f'--alluredir={Config.ALLURE_DIR}')
+        args.append(f'--alluredir={_allure_dir(suffix)}')
         print("✓ 启用 Allure 报告")
     else:
         print("⚠ allure-pytest 未安装，跳过Allure报告")
 
 
-def _generate_allure_html() -> None:
+def _generate_allure_html(results_dirs: Optional[list] = None) -> None:
     """
     测试完成后自动生成 Allure HTML 报告
+    
+    Args:
+        results_dirs: Allure 结果目录列表，默认 Config.ALLURE_DIR（matrix 模式下合并各浏览器的结果）
     """
     import subprocess
     
     # 定义 Allure HTML 输出目录
     allure_html_dir = Config.REPORTS_DIR / 'allure-html'
+    results_dirs = [str(path) for path in (results_dirs or [Config.ALLURE_DIR])]
     
     try:
         print("\n🔄 正在生成 Allure HTML 报告...")
         
         # 执行 allure generate 命令
         result = subprocess.run(
-            ['allure', 'generate', str(Config.ALLURE_DIR), '-o', str(allure_html_dir), '--clean'],
+            ['allure', 'generate', *results_dirs, '-o', str(allure_html_dir), '--clean'],
             capture_output=True,
             text=True,
             timeout=30,
@@ -107,6 +119,7 @@ def run_tests(test_path: str, marker: Optional[str] = None) -> int:
         '--ignore-glob=test_cases/examples*',
         '-v',
         '-s',
+        '--impact-trace',
         f'--junitxml=reports/html/junit.xml'
     ]
     
@@ -175,16 +188,25 @@ def run_specific_test(test_file: str) -> int:
     return pytest.main(args)
 
 
-def run_parallel_tests(num_workers: int = 4) -> int:
+def run_parallel_tests(num_workers: Optional[int] = None, lpt: bool = False) -> int:
     """
     并行运行测试
     
+    数据驱动用例按行区间分片，每个 worker 只解析自己运行的数据行；
+    lpt=True 时用例按历史耗时（reports/durations.json）做最长处理时间优先分配，结束时输出预测与实际 makespan
+    （默认不开启：bench_lpt_schedule 中 LPT 缩短了 makespan，但墙钟耗时主要取决于 worker 启动，没有稳定的收益）
+    
     Args:
-        num_workers: 并行进程数
+        num_workers: 并行进程数，None 时根据 CPU、可用内存和浏览器内存占用自动计算
+        lpt: 是否按历史耗时做 LPT 分配
     
     Returns:
         测试退出代码
     """
+    if num_workers is None:
+        from utils.lpt_scheduler import auto_worker_count
+        num_workers = auto_worker_count()
+    
     print("=" * 80)
     print(f"并行运行测试 (进程数: {num_workers})")
     print("=" * 80)
@@ -193,14 +215,308 @@ def run_parallel_tests(num_workers: int = 4) -> int:
         'test_cases/',
         '--ignore-glob=test_cases/examples*',
         '-n', str(num_workers),
+        '--dist', 'loadgroup',
+        '--data-shard', 'range',
+        '--impact-trace',
         '-v',
         f'--junitxml=reports/html/junit.xml'
     ]
+    if lpt:
+        args.append('--lpt')
     
     _add_report_options(args)
     return pytest.main(args)
 
 
+def run_changed_tests(since: str = 'HEAD') -> int:
+    """
+    只运行受改动影响的用例（依赖索引见 utils/test_impact.py）
+    
+    Args:
+        since: 与哪个 git 引用比较（比较对象为当前工作区，含未提交改动）
+    
+    Returns:
+        测试退出代码
+    """
+    from utils.test_impact import build_static_index, estimate_seconds, select_impacted
+    
+    print("=" * 80)
+    print(f"运行受影响的用例 (相对 {since} 的改动)")
+    print("=" * 80)
+    
+    static_index = build_static_index()
+    impacted = select_impacted(since, static_index=static_index)
+    full_seconds = estimate_seconds(static_index)
+    selected_seconds = estimate_seconds(impacted)
+    
+    for test, reason in sorted(impacted.items()):
+        print(f"  ✓ {test}  ← {reason}")
+    print(f"受影响用例: {len(impacted)}/{len(static_index)}  "
+          f"预计耗时: {selected_seconds:.0f}s（全量 {full_seconds:.0f}s，节省 {full_seconds - selected_seconds:.0f}s）")
+    if not impacted:
+        print("没有受影响的用例，跳过运行")
+        return 0
+    
+    args = [*sorted(impacted), '-v', '-s', '--impact-trace', f'--junitxml=reports/html/junit.xml']
+    _add_report_options(args)
+    return pytest.main(args)
+
+
+def _print_profile_report(top: int = 15) -> None:
+    """输出命令埋点汇总：最慢的命令、等待与操作耗时、各用例耗时"""
+    from utils.instrumentation import load_profiles, summarize
+    
+    profiles = load_profiles()
+    if not profiles:
+        print("没有命令埋点记录")
+        return
+    summary = summarize(profiles, top)
+    totals = summary['totals']
+    
+    print("\n" + "=" * 80)
+    print(f"命令埋点汇总 ({len(profiles)} 个用例, {totals['command_count']} 个命令)")
+    print("=" * 80)
+    print(f"等待耗时: {totals['wait_seconds']:.2f}s  操作耗时: {totals['action_seconds']:.2f}s  "
+          f"浏览器启动: {totals['startup_seconds']:.2f}s")
+    
+    print(f"\n最慢的 {len(summary['slowest'])} 个命令/等待:")
+    for entry in summary['slowest']:
+        retries = f" 重试 {entry['retries']}" if entry['retries'] else ''
+        status = '' if entry['ok'] else ' ✗'
+        print(f"  {entry['duration']:>8.3f}s  {entry['phase']:<9} {entry['name']:<32} "
+              f"{entry['locator'] or '-'}{retries}{status}")
+        print(f"             {entry['test']}")
+    
+    print("\n按命令汇总:")
+    for name, (count, seconds) in summary['by_command'].items():
+        print(f"  {name:<32} {count:>6} 次  {seconds:>8.3f}s")
+    
+    print("\n各用例耗时:")
+    print(f"  {'等待':>8} {'操作':>8} {'启动':>8} {'命令数':>6}  用例")
+    for test in summary['tests']:
+        dropped = f"（缓冲区溢出，丢弃 {test['dropped']} 条）" if test['dropped'] else ''
+        print(f"  {test['wait_seconds']:>7.2f}s {test['action_seconds']:>7.2f}s {test['startup_seconds']:>7.2f}s "
+              f"{test['command_count']:>6}  {test['test']}{dropped}")
+
+
+def run_profile_tests(test_path: str = 'test_cases/') -> int:
+    """
+    记录每个 WebDriver 命令的耗时并输出汇总（用例 JSON 保存在 reports/profile/）
+    
+    Args:
+        test_path: 测试路径
+    
+    Returns:
+        测试退出代码
+    """
+    from config.config import Config
+    
+    print("=" * 80)
+    print(f"命令埋点运行: {test_path}")
+    print("=" * 80)
+    
+    # 清除上次的记录，汇总只包含本次运行
+    for old_profile in Config.PROFILE_DIR.glob('*.json'):
+        old_profile.unlink()
+    
+    args = [
+        test_path,
+        '--ignore-glob=test_cases/examples*',
+        '--profile-commands',
+        '-v',
+        '-s',
+        f'--junitxml=reports/html/junit.xml'
+    ]
+    _add_report_options(args)
+    exit_code = pytest.main(args)
+    _print_profile_report()
+    return exit_code
+
+
+def run_locator_analysis(strict: bool = False, apply: bool = False) -> int:
+    """
+    在本地 DOM 快照中分析 locators/ 下的定位器（无需网络），每个定位器类输出 reports/locators/<类名>.md
+    
+    使用独立的无头 Chrome（需要本机安装 Chrome），不经过 DriverFactory 的预热、驱动池和驱动下载
+    
+    Args:
+        strict: 有定位器存在问题（匹配多个/未匹配/扫描整个文档/依赖界面文本）时返回 1，用于 CI
+        apply: 把建议的选择器写回定位器模块（只接受 capture_snapshot 保存的快照）
+    
+    Returns:
+        退出代码
+    """
+    from selenium.common.exceptions import WebDriverException
+    from utils.locator_analyzer import (
+        BY_NAMES, FLAG_NAMES, analyze, apply_suggestions, launch_driver, load_locator_classes, snapshot_for,
+        write_report,
+    )
+    
+    print("=" * 80)
+    print("定位器性能分析")
+    print("=" * 80)
+    
+    flagged = 0
+    try:
+        driver = launch_driver()
+    except WebDriverException as e:
+        print(f"✗ 无法启动无头 Chrome（定位器分析需要本机安装 Chrome）: {e.msg}")
+        return 1
+    try:
+        for module, cls, locators in load_locator_classes():
+            snapshot = snapshot_for(module)
+            if not snapshot.exists():
+                print(f"\n⚠ {cls.__name__}: 缺少 DOM 快照 {snapshot}，跳过")
+                continue
+            report = analyze(driver, snapshot, locators)
+            print(f"\n{cls.__name__}  报告: {write_report(cls, snapshot, report)}")
+            for name, entry in report.items():
+                flags = '、'.join(FLAG_NAMES[flag] for flag in entry['flags'])
+                flagged += bool(flags)
+                print(f"  {'✗' if flags else '✓'} {name:<20} {entry['micros']:>8.1f}µs  匹配 {entry['count']}  "
+                      f"{entry['value']}{f'  [{flags}]' if flags else ''}")
+                suggestion = entry['suggestion']
+                if suggestion:
+                    print(f"      → By.{BY_NAMES[suggestion['by']]} {suggestion['value']}  {suggestion['micros']:.1f}µs")
+            if apply:
+                try:
+                    applied = apply_suggestions(module, report, snapshot)
+                except ValueError as e:
+                    print(f"  ⚠ {e}，请先用 capture_snapshot 保存真实页面")
+                else:
+                    print(f"  已写回 {module.__file__}: {', '.join(applied) or '无'}")
+    finally:
+        driver.quit()
+    
+    print(f"\n存在问题的定位器: {flagged}")
+    return 1 if strict and flagged else 0
+
+
+def _merge_junit_reports(reports: dict, output: Path) -> dict:
+    """
+    合并各浏览器的 JUnit 报告：每个浏览器一个 testsuite，用例 classname 加上浏览器前缀
+    
+    Args:
+        reports: {浏览器: junit 文件路径}
+        output: 合并后的报告路径
+    
+    Returns:
+        {浏览器: {'tests', 'failures', 'errors', 'skipped', 'time'}}
+    """
+    import xml.etree.ElementTree as ET
+    
+    fields = ('tests', 'failures', 'errors', 'skipped')
+    merged = ET.Element('testsuites')
+    breakdown = {}
+    for browser, path in reports.items():
+        stats = dict.fromkeys(fields, 0)
+        stats['time'] = 0.0
+        breakdown[browser] = stats
+        if not Path(path).exists():
+            continue
+        root = ET.parse(path).getroot()
+        for suite in ([root] if root.tag == 'testsuite' else root.iter('testsuite')):
+            suite.set('name', browser)
+            for case in suite.iter('testcase'):
+                case.set('classname', f"{browser}.{case.get('classname', '')}")
+            for name in fields:
+                stats[name] += int(suite.get(name, 0))
+            stats['time'] += float(suite.get('time', 0))
+            merged.append(suite)
+    
+    for name in fields:
+        merged.set(name, str(sum(stats[name] for stats in breakdown.values())))
+    merged.set('time', f"{sum(stats['time'] for stats in breakdown.values()):.3f}")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    ET.ElementTree(merged).write(output, encoding='utf-8', xml_declaration=True)
+    return breakdown
+
+
+def run_matrix_tests(browsers: Optional[list] = None, test_path: str = 'test_cases/') -> int:
+    """
+    多浏览器矩阵：各浏览器在独立的 pytest 进程（各自的 xdist worker 池）中同时运行同一套用例
+    
+    - 每种浏览器的进程数 = min(Config.MATRIX_MAX_WORKERS, 自动计算的进程数 / 浏览器种类数)
+    - 浏览器进程组按 Config.MATRIX_STAGGER 间隔错开启动，并通过跨进程启动闸门
+      （Config.BROWSER_LAUNCH_SLOTS）限制同时启动的浏览器数量，避免 Chrome 同时启动抢占 CPU
+    - 各浏览器进程使用独立的耗时记录、性能历史、趋势报告、命令埋点目录、日志和报告文件，避免同时写入同一文件
+    - 结束后合并为 reports/html/junit.xml（Allure 已安装时合并生成 HTML 报告），并输出各浏览器的结果汇总
+    
+    Args:
+        browsers: 浏览器列表，默认 Config.MATRIX_BROWSERS
+        test_path: 测试路径
+    
+    Returns:
+        测试退出代码（任一浏览器失败即非 0）
+    """
+    import subprocess
+    import time
+    from utils.lpt_scheduler import auto_worker_count
+    
+    browsers = [b.strip().lower() for b in (browsers or Config.MATRIX_BROWSERS) if b.strip()]
+    launch_slots = Config.BROWSER_LAUNCH_SLOTS or max(1, (os.cpu_count() or 2) // 2)
+    
+    print("=" * 80)
+    print(f"多浏览器矩阵运行: {', '.join(browsers)} (同时启动浏览器上限: {launch_slots})")
+    print("=" * 80)
+    
+    processes = {}
+    reports = {}
+    allure_dirs = []
+    start = time.perf_counter()
+    for i, browser in enumerate(browsers):
+        if i:
+            time.sleep(Config.MATRIX_STAGGER)
+        workers = max(1, min(Config.MATRIX_MAX_WORKERS.get(browser, 1), auto_worker_count(browser) // len(browsers)))
+        reports[browser] = Config.REPORTS_DIR / 'html' / f'junit-{browser}.xml'
+        args = [
+            sys.executable, '-m', 'pytest', test_path,
+            '--ignore-glob=test_cases/examples*',
+            '-q',
+            f'--junitxml={reports[browser]}'
+        ]
+        if workers > 1:
+            args += ['-n', str(workers), '--dist', 'loadgroup', '--data-shard', 'range']
+        _add_report_options(args, suffix=browser)
+        allure_dirs.append(_allure_dir(browser))
+        env = dict(
+            os.environ,
+            BROWSER=browser,
+            BROWSER_LAUNCH_SLOTS=str(launch_slots),
+            TEST_DURATIONS_FILE=str(Config.REPORTS_DIR / f'durations-{browser}.json'),
+            PERF_HISTORY_FILE=str(Config.REPORTS_DIR / f'perf_history-{browser}.json'),
+            PERF_TREND_FILE=str(Config.REPORTS_DIR / 'html' / f'perf_trend-{browser}.html'),
+            PROFILE_DIR=str(Config.PROFILE_DIR / browser),
+            LOG_NAME=f'automation-{browser}',
+        )
+        log_file = open(Config.LOGS_DIR / f'matrix_{browser}.log', 'w', encoding='utf-8')
+        processes[browser] = (subprocess.Popen(args, env=env, stdout=log_file, stderr=subprocess.STDOUT), log_file)
+        print(f"▶ {browser}: 进程数 {workers}，输出: {log_file.name}")
+    
+    exit_codes = {}
+    while len(exit_codes) < len(processes):
+        for browser, (process, log_file) in processes.items():
+            if browser in exit_codes or process.poll() is None:
+                continue
+            log_file.close()
+            exit_codes[browser] = process.returncode
+            print(f"■ {browser} 完成，退出代码 {process.returncode}，耗时 {time.perf_counter() - start:.1f}s")
+        time.sleep(0.5)
+    
+    breakdown = _merge_junit_reports(reports, Config.REPORTS_DIR / 'html' / 'junit.xml')
+    print("\n" + "-" * 80)
+    print(f"{'浏览器':<10}{'用例':>8}{'失败':>8}{'错误':>8}{'跳过':>8}{'用例耗时(s)':>14}{'退出代码':>10}")
+    for browser, stats in breakdown.items():
+        print(f"{browser:<10}{stats['tests']:>8}{stats['failures']:>8}{stats['errors']:>8}"
+              f"{stats['skipped']:>8}{stats['time']:>14.1f}{exit_codes[browser]:>10}")
+    print(f"矩阵总耗时: {time.perf_counter() - start:.1f}s，合并报告: {Config.REPORTS_DIR / 'html' / 'junit.xml'}")
+    
+    if _is_module_available('allure_pytest'):
+        _generate_allure_html(allure_dirs)
+    
+    return max(exit_codes.values(), default=0)
+
+
 def main():
     """主函数"""
     if len(sys.argv) < 2:
@@ -208,11 +524,16 @@ def main():
         print("  python run_tests.py all                    # 运行所有测试")
         print("  python run_tests.py smoke                  # 运行冒烟测试")
         print("  python run_tests.py regression             # 运行回归测试")
-        print("  python run_tests.py parallel               # 并行运行测试")
+        print("  python run_tests.py parallel [N|auto] [--lpt]  # 并行运行测试（默认 auto：按 CPU/内存自动计算进程数；--lpt 按历史耗时分配）")
+        print("  python run_tests.py matrix [浏览器 ...]     # 多浏览器同时运行（默认 chrome firefox edge）")
+        print("  python run_tests.py changed --since <ref>  # 只运行受改动影响的用例（默认相对 HEAD）")
+        print("  python run_tests.py profile [路径]          # 记录每个 WebDriver 命令的耗时并输出汇总")
+        print("  python run_tests.py locators [--strict] [--apply]  # 在 DOM 快照中分析定位器耗时并给出更快的选择器（需要 Chrome）")
         print("  python run_tests.py file <test_file>       # 运行指定文件")
         return 1
     
     command = sys.argv[1].lower()
+    Config.ensure_dirs()
     
     if command == 'all':
         return run_all_tests()
@@ -221,8 +542,22 @@ def main():
     elif command == 'regression':
         return run_regression_tests()
     elif command == 'parallel':
-        num_workers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
-        return run_parallel_tests(num_workers)
+        options = [option for option in sys.argv[2:] if option != '--lpt']
+        num_workers = options[0] if options else 'auto'
+        return run_parallel_tests(None if num_workers == 'auto' else int(num_workers), '--lpt' in sys.argv[2:])
+    elif command == 'matrix':
+        return run_matrix_tests(sys.argv[2:] or None)
+    elif command == 'changed':
+        options = sys.argv[2:]
+        if '--since' in options:
+            since = options[options.index('--since') + 1] if options.index('--since') + 1 < len(options) else 'HEAD'
+        else:
+            since = options[0] if options else 'HEAD'
+        return run_changed_tests(since)
+    elif command == 'profile':
+        return run_profile_tests(sys.argv[2] if len(sys.argv) > 2 else 'test_cases/')
+    elif command == 'locators':
+        return run_locator_analysis('--strict' in sys.argv[2:], '--apply' in sys.argv[2:])
     elif command == 'file':
         if len(sys.argv) < 3:
             print("错误: 请指定测试文件")
@@ -2,29 +2,131 @@
 pytest配置文件
 定义共享的fixture和其他配置
 """
+import time
 import pytest
+from config.config import Config
 from utils.driver_factory import DriverFactory
+from utils.driver_pool import DriverPool
+from utils.instrumentation import Instrumentation
 from utils.screenshot import Screenshot
+from utils.session_cache import SessionCache
+
+# 各用例 fixture 等待浏览器就绪的耗时（秒），用于终端汇总
+_driver_wait_times = []
+
+# 录制 / 回放服务（REPLAY_MODE=record / replay 时每个执行用例的进程一个）
+_replay_server = None
+
+# 需要浏览器的 fixture：选中的用例用到其中之一时才预热浏览器
+BROWSER_FIXTURES = {'driver', 'driver_pool', 'logged_in_driver'}
+
+
+def _runs_tests_locally(config):
+    """当前进程是否会真正执行用例（排除 xdist 主控进程和 --collect-only）"""
+    if config.option.collectonly:
+        return False
+    if hasattr(config, 'workerinput'):
+        return True
+    return not getattr(config.option, 'numprocesses', None)
+
+
+def pytest_sessionstart(session):
+    """
+    会话开始时创建输出目录；
+    录制 / 回放模式下启动本地服务并把 Config.BASE_URL 改写为本地地址
+    """
+    global _replay_server
+    Config.ensure_dirs()
+    if not _runs_tests_locally(session.config):
+        return
+    if Config.REPLAY_MODE != 'off':
+        from utils.replay import ReplayServer
+        _replay_server = ReplayServer.from_config().start()
+        Config.BASE_URL = _replay_server.rewrite(Config.BASE_URL)
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_collection_modifyitems(session, config, items):
+    """
+    收集完成（-k / 标记 / 影响分析 / 分片筛选之后）时，选中的用例需要浏览器才在后台预热，
+    与会话 fixture 的准备和第一个用例的 setup 并行进行；只运行单元测试等不需要浏览器的会话不启动浏览器
+    """
+    if not _runs_tests_locally(config):
+        return
+    if not any(BROWSER_FIXTURES.intersection(getattr(item, 'fixturenames', ())) for item in items):
+        return
+    if Config.DRIVER_POOL_ENABLED:
+        DriverFactory.prewarm(Config.DRIVER_POOL_SIZE)
+    else:
+        DriverFactory.prewarm(Config.DRIVER_PREWARM_DEPTH)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """会话结束时退出未被使用的预热浏览器，等待截图写盘完成，并停止录制 / 回放服务（录制模式下写入回放包）"""
+    DriverFactory.shutdown_prewarm()
+    Screenshot.flush()
+    if _replay_server is not None:
+        _replay_server.stop()
+
+
+@pytest.fixture(scope="session")
+def driver_pool():
+    """
+    会话级驱动池fixture
+    每个 worker 进程一个驱动池，第一个需要浏览器的用例请求时才创建，会话结束时退出所有浏览器
+    """
+    pool = DriverPool()
+    yield pool
+    pool.close()
 
 
 @pytest.fixture(scope="function")
 def driver(request):
     """
     创建WebDriver实例的fixture
-    每个测试函数使用独立的浏览器实例，避免测试间相互影响
+    默认从驱动池借出热浏览器，用例结束后重置状态并归还，避免测试间相互影响；
+    关闭驱动池（DRIVER_POOL_ENABLED=False）时每个测试函数使用独立的浏览器实例，
+    并在后台预热下一个用例的浏览器
     """
-    # 创建浏览器驱动
-    driver = DriverFactory.get_driver()
+    # 创建浏览器驱动，并记录等待浏览器就绪的耗时
+    Instrumentation.set_current_test(request.node.nodeid)
+    start = time.perf_counter()
+    if Config.DRIVER_POOL_ENABLED:
+        driver_pool = request.getfixturevalue('driver_pool')
+        driver = driver_pool.acquire()
+    else:
+        driver = DriverFactory.get_driver(prewarm_next=True)
+    request.node.user_properties.append(('driver_wait_seconds', round(time.perf_counter() - start, 3)))
+    Screenshot.set_current_test(request.node.nodeid)
+    Instrumentation.attach(driver)
     
     yield driver  # 提供给测试用例使用
     
-    # 测试失败时自动截图
+    # 测试失败时自动截图（用例执行中已截过失败图时不再重复截图）
     if hasattr(request.node, 'rep_call') and request.node.rep_call.failed:
         test_name = request.node.name
-        Screenshot.take_screenshot(driver, f"failed_{test_name}")
+        Screenshot.take_screenshot(driver, f"failed_{test_name}", failure=True)
+    Screenshot.set_current_test(None)
+    Instrumentation.detach(driver)
+    if Instrumentation.enabled:
+        Instrumentation.export(request.node.nodeid)
+    Instrumentation.set_current_test(None)
     
     # 测试完成后清理资源
-    driver.quit()
+    if Config.DRIVER_POOL_ENABLED:
+        driver_pool.release(driver)
+    else:
+        driver.quit()
+
+
+@pytest.fixture(scope="function")
+def logged_in_driver(driver):
+    """
+    已登录的WebDriver实例（账号为 Config.TEST_USERNAME）
+    每个 worker 只通过登录页登录一次，之后的用例恢复登录状态快照（Cookie + Storage）并直接打开登录后的页面；
+    快照过期或被服务端拒绝时自动重新登录
+    """
+    return SessionCache.open_logged_in(driver, Config.TEST_USERNAME, Config.TEST_PASSWORD)
 
 
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
@@ -34,4 +136,24 @@ def pytest_runtest_makereport(item, call):
     """
     outcome = yield
     rep = outcome.get_result()
-    setattr(item, f"rep_{rep.when}", rep)
\ No newline at end of file
+    setattr(item, f"rep_{rep.when}", rep)
+
+
+def pytest_runtest_logreport(report):
+    """收集 fixture 等待浏览器的耗时（xdist 模式下在主控进程汇总各 worker 的结果）"""
+    if report.when == 'setup':
+        for name, value in report.user_properties:
+            if name == 'driver_wait_seconds':
+                _driver_wait_times.append(value)
+
+
+def pytest_terminal_summary(terminalreporter):
+    """在终端输出浏览器等待耗时汇总"""
+    if not _driver_wait_times:
+        return
+    total = sum(_driver_wait_times)
+    terminalreporter.write_sep('-', '浏览器等待耗时')
+    terminalreporter.write_line(
+        f"用例数: {len(_driver_wait_times)}  总计: {total:.2f}s  "
+        f"平均: {total / len(_driver_wait_times):.2f}s  最大: {max(_driver_wait_times):.2f}s"
+    )
@@ -2,6 +2,8 @@
 示例：如何为新模块添加测试数据支持
 """
 import pytest
+from config.config import Config
+from pages.base_page import BasePage
 from test_data.test_data_config import get_test_data
 
 
@@ -27,4 +29,14 @@ def test_example_how_to_use_for_new_module():
     assert 'expected_result' in sample_data
     
     print(f"成功获取到 {len(login_data)} 条测试数据")
-    print(f"第一条数据: {sample_data}")
\ No newline at end of file
+    print(f"第一条数据: {sample_data}")
+
+
+def test_example_page_after_login(logged_in_driver):
+    """
+    示例：需要登录状态的页面用例使用 logged_in_driver
+    
+    fixture 已恢复（或首次通过界面建立）登录状态并打开登录后的首页，用例无需再走登录流程
+    """
+    page = BasePage(logged_in_driver)
+    assert page.get_current_url() != Config.BASE_URL, "应该已进入登录后的页面"
@@ -4,13 +4,13 @@
 """
 import pytest
 from pages.login_page import LoginPage
-from test_data.test_data_config import get_test_data
+from test_data.test_data_config import get_sharded_test_data
 
 
 class TestLoginDataDriven:
     """使用数据驱动的登录功能测试类"""
     
-    @pytest.mark.parametrize("test_case", get_test_data('login', 'csv'))
+    @pytest.mark.parametrize("test_case", get_sharded_test_data('login', 'csv'))
     @pytest.mark.smoke
     def test_login_csv_driven(self, driver, test_case):
         """
@@ -0,0 +1,59 @@
+"""
+页面基类元素缓存单元测试（pages/base_page.py）
+使用桩驱动，不启动浏览器
+"""
+from selenium.common.exceptions import StaleElementReferenceException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webelement import WebElement
+from pages.base_page import BasePage
+
+LOCATOR = (By.ID, 'username')
+
+
+class StubDriver:
+    """按定位器返回递增 ID 的元素；stale 中的元素 ID 执行命令时抛出 StaleElementReferenceException"""
+
+    def __init__(self):
+        self.finds = 0
+        self.commands = []
+        self.stale = set()
+
+    def find_element(self, by, value):
+        self.finds += 1
+        return WebElement(self, f'element-{self.finds}')
+
+    def execute(self, command, params):
+        self.commands.append((command, params['id']))
+        if params['id'] in self.stale:
+            raise StaleElementReferenceException()
+        return {'value': params['id']}
+
+
+class TestFindElement:
+    """find_element 返回缓存的元素，使用时失效则重新查找"""
+
+    def test_cache_hit_sends_no_request(self):
+        driver = StubDriver()
+        page = BasePage(driver)
+        page.find_element(LOCATOR)
+        page.find_element(LOCATOR)
+        assert driver.finds == 1
+        assert driver.commands == []
+        assert page.cache_stats['hits'] == 1
+
+    def test_stale_element_is_refound_at_use_time(self):
+        driver = StubDriver()
+        page = BasePage(driver)
+        element = page.find_element(LOCATOR)
+        driver.stale.add('element-1')
+        assert element.text == 'element-2'
+        assert driver.finds == 2
+        assert page.cache_stats['stale'] == 1
+        # 之后的命令直接使用新元素，重新查找的元素也已写回缓存
+        element.click()
+        assert driver.commands[-1][1] == 'element-2'
+        assert page.find_element(LOCATOR).id == 'element-2'
+
+    def test_returned_element_is_a_web_element(self):
+        """execute_script 等按 isinstance(WebElement) 序列化参数"""
+        assert isinstance(BasePage(StubDriver()).find_element(LOCATOR), WebElement)
@@ -0,0 +1,106 @@
+"""
+测试数据编译缓存单元测试（test_data/compiled_cache.py）
+"""
+import os
+import pickle
+import struct
+import pytest
+from test_data import compiled_cache
+from test_data.compiled_cache import MAGIC
+
+ROWS = [{'username': f'user{i}', 'password': f'pass{i}'} for i in range(5)]
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / 'login.csv'
+    path.write_text('username,password\n' + ''.join(f'user{i},pass{i}\n' for i in range(5)), encoding='utf-8')
+    return path
+
+
+@pytest.fixture
+def cache_file(tmp_path):
+    return tmp_path / 'cache' / 'login.csv.tdc'
+
+
+def header_bytes(header):
+    data = pickle.dumps(header)
+    return MAGIC + struct.pack('<I', len(data)) + data
+
+
+class TestRoundTrip:
+
+    def test_column_layout(self, source, cache_file):
+        assert compiled_cache.write(cache_file, source, ROWS)
+        assert compiled_cache.read(cache_file, source) == ROWS
+
+    def test_row_layout_for_mixed_rows(self, source, cache_file):
+        rows = [{'a': 1}, {'b': 2}, ['not', 'a', 'dict']]
+        compiled_cache.write(cache_file, source, rows)
+        assert compiled_cache.read(cache_file, source) == rows
+
+    def test_empty_dataset(self, source, cache_file):
+        compiled_cache.write(cache_file, source, [])
+        assert compiled_cache.read(cache_file, source) == []
+
+
+class TestFreshness:
+
+    def test_missing_cache(self, source, cache_file):
+        assert compiled_cache.read(cache_file, source) is None
+
+    def test_changed_source_size(self, source, cache_file):
+        compiled_cache.write(cache_file, source, ROWS)
+        source.write_text(source.read_text(encoding='utf-8') + 'user5,pass5\n', encoding='utf-8')
+        assert compiled_cache.read(cache_file, source) is None
+
+    def test_touched_source_with_same_content(self, source, cache_file):
+        """git checkout 等只改变修改时间时按内容哈希判定，仍然命中"""
+        compiled_cache.write(cache_file, source, ROWS)
+        stat = source.stat()
+        os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        assert compiled_cache.read(cache_file, source) == ROWS
+
+    def test_same_size_different_content(self, source, cache_file):
+        compiled_cache.write(cache_file, source, ROWS)
+        stat = source.stat()
+        source.write_text(source.read_text(encoding='utf-8').replace('user0', 'userX'), encoding='utf-8')
+        os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        assert compiled_cache.read(cache_file, source) is None
+
+
+class TestCorruptionFallback:
+    """损坏的缓存文件一律返回 None（调用方重新解析源文件），不抛出异常"""
+
+    @pytest.mark.parametrize('content', [
+        pytest.param(b'', id='empty'),
+        pytest.param(b'XXXX' + b'\0' * 16, id='bad-magic'),
+        pytest.param(MAGIC + b'\1', id='truncated-prefix'),
+        pytest.param(MAGIC + struct.pack('<I', 1000) + b'\x80', id='truncated-header'),
+        pytest.param(header_bytes({'layout': 'columns'}), id='header-missing-keys'),
+        pytest.param(header_bytes(['not', 'a', 'dict']), id='header-wrong-type'),
+        pytest.param(MAGIC + struct.pack('<I', 3) + b'abc', id='garbage-header'),
+    ])
+    def test_corrupt_file(self, source, cache_file, content):
+        cache_file.parent.mkdir()
+        cache_file.write_bytes(content)
+        assert compiled_cache.read(cache_file, source) is None
+
+    def test_truncated_payload(self, source, cache_file):
+        compiled_cache.write(cache_file, source, ROWS)
+        cache_file.write_bytes(cache_file.read_bytes()[:-10])
+        assert compiled_cache.read(cache_file, source) is None
+
+    def test_payload_referencing_missing_class(self, source, cache_file):
+        """其他版本写入的缓存引用了已不存在的类（反序列化抛出 AttributeError / ImportError）"""
+        compiled_cache.write(cache_file, source, ROWS)
+        data = cache_file.read_bytes()
+        (header_len,) = struct.unpack_from('<I', data, len(MAGIC))
+        payload = b'\x80\x04cno_such_module\nNoSuchClass\n)\x81.'
+        cache_file.write_bytes(data[:len(MAGIC) + 4 + header_len] + payload)
+        assert compiled_cache.read(cache_file, source) is None
+
+    def test_write_failure_returns_false(self, source, tmp_path):
+        blocker = tmp_path / 'blocker'
+        blocker.write_text('')
+        assert compiled_cache.write(blocker / 'login.csv.tdc', source, ROWS) is False
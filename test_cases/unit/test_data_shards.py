@@ -0,0 +1,95 @@
+"""
+测试数据分片单元测试（test_data/data_shards.py）
+"""
+import pytest
+from test_data.data_shards import LazyRow, ShardedDataset
+
+ROWS = 100
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    path = tmp_path / 'login.csv'
+    lines = ['# 注释行', '', 'username,password,description']
+    for i in range(ROWS):
+        lines.append(f'user{i},pass{i},"第 {i} 行\n含换行"' if i == 7 else f'user{i},pass{i},第 {i} 行')
+        if i == 50:
+            lines.extend(['# 中间的注释', ',,'])
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    return path
+
+
+class TestMembership:
+    """分片成员：每行恰好属于一个分片，与 shard_of 一致"""
+
+    @pytest.mark.parametrize('mode', ShardedDataset.MODES)
+    @pytest.mark.parametrize('count', [0, 1, 7, 100])
+    @pytest.mark.parametrize('shards', [1, 3, 8, 150])
+    def test_members_partition_rows(self, mode, count, shards):
+        dataset = ShardedDataset('data.json', 'json', shards, mode, loader=lambda: [{}] * count)
+        members = [dataset.members(shard) for shard in range(dataset.shards)]
+        assert sorted(i for group in members for i in group) == list(range(count))
+        for shard, group in enumerate(members):
+            assert all(dataset.shard_of(i) == shard for i in group)
+            assert group == sorted(group)
+
+    def test_range_shards_are_contiguous_and_balanced(self):
+        dataset = ShardedDataset('data.json', 'json', 8, 'range', loader=lambda: [{}] * ROWS)
+        sizes = [len(dataset.members(shard)) for shard in range(8)]
+        assert max(sizes) - min(sizes) <= 1
+        for shard in range(8):
+            group = dataset.members(shard)
+            assert group == list(range(group[0], group[-1] + 1))
+
+    def test_hash_shards_are_stable(self):
+        first = ShardedDataset('data.json', 'json', 4, 'hash', loader=lambda: [{}] * ROWS)
+        second = ShardedDataset('data.json', 'json', 4, 'hash', loader=lambda: [{}] * ROWS)
+        assert [first.group_name(i) for i in range(ROWS)] == [second.group_name(i) for i in range(ROWS)]
+
+    def test_invalid_mode(self):
+        with pytest.raises(ValueError):
+            ShardedDataset('data.json', 'json', 2, 'random')
+
+
+class TestCsvRows:
+    """CSV 按字节偏移读取"""
+
+    @pytest.mark.parametrize('mode', ShardedDataset.MODES)
+    def test_rows_match_full_parse(self, csv_file, mode):
+        dataset = ShardedDataset(csv_file, 'csv', 4, mode)
+        assert dataset.count() == ROWS
+        rows = [dict(LazyRow(dataset, i)) for i in range(ROWS)]
+        assert [row['username'] for row in rows] == [f'user{i}' for i in range(ROWS)]
+        assert rows[7]['description'] == '第 7 行\n含换行'
+        assert rows[51]['username'] == 'user51'
+
+
+class TestRunPhaseCost:
+    """运行阶段读取整个分片的开销不随分片数（worker 数）增长"""
+
+    @pytest.mark.parametrize('mode', ShardedDataset.MODES)
+    def test_cost_flat_in_worker_count(self, csv_file, mode, monkeypatch):
+        costs = []
+        for shards in (2, 8, 32):
+            dataset = ShardedDataset(csv_file, 'csv', shards, mode)
+            dataset.count()
+            calls = {'shard_of': 0, 'reads': 0}
+            shard_of, read = dataset.shard_of, dataset._read_csv_rows
+
+            def counted_shard_of(index, shard_of=shard_of):
+                calls['shard_of'] += 1
+                return shard_of(index)
+
+            def counted_read(indexes, read=read):
+                calls['reads'] += 1
+                return read(indexes)
+
+            monkeypatch.setattr(dataset, 'shard_of', counted_shard_of)
+            monkeypatch.setattr(dataset, '_read_csv_rows', counted_read)
+            # 单个进程依次访问所有分片（最坏情况），每个分片只读取一次
+            for index in range(ROWS):
+                dataset.row(index)
+                dataset.row(index)
+            assert calls['reads'] == len([s for s in range(shards) if dataset.members(s)])
+            costs.append(calls['shard_of'])
+        assert costs[0] == costs[1] == costs[2]
@@ -0,0 +1,119 @@
+"""
+浏览器驱动池单元测试（utils/driver_pool.py）
+使用桩驱动，不启动浏览器
+"""
+import pytest
+from selenium.common.exceptions import WebDriverException
+from utils.driver_factory import DriverFactory
+from utils.driver_pool import DriverPool
+
+
+class StubDriver:
+    """记录命令的桩驱动；history 为 CDP 导航历史中的地址"""
+
+    def __init__(self, url='about:blank', history=()):
+        self.current_url = url
+        self.history = list(history)
+        self.alive = True
+        self.fail_reset = False
+        self.quit_count = 0
+        self.visited = []
+        self.cleared = []
+
+    @property
+    def window_handles(self):
+        if not self.alive:
+            raise WebDriverException('session deleted')
+        return ['main']
+
+    def execute_script(self, script):
+        self.cleared.append(self.current_url)
+
+    def execute_cdp_cmd(self, command, params):
+        if command == 'Page.getNavigationHistory':
+            return {'entries': [{'url': url} for url in self.history]}
+        return {}
+
+    def get(self, url):
+        if self.fail_reset:
+            raise WebDriverException('renderer crashed')
+        self.visited.append(url)
+        self.current_url = url
+
+    def delete_all_cookies(self):
+        pass
+
+    def quit(self):
+        self.quit_count += 1
+
+
+@pytest.fixture
+def created(monkeypatch):
+    """DriverFactory.get_driver 返回新的桩驱动；记录创建的驱动和预热调用"""
+    drivers = []
+
+    def get_driver(browser_name=None, prewarm_next=False):
+        drivers.append(StubDriver())
+        return drivers[-1]
+
+    monkeypatch.setattr(DriverFactory, 'get_driver', get_driver)
+    monkeypatch.setattr(DriverFactory, 'prewarm', lambda *args, **kwargs: pytest.fail('驱动池不应预热浏览器'))
+    return drivers
+
+
+class TestAcquireRelease:
+
+    def test_creates_lazily_up_to_size(self, created):
+        pool = DriverPool(size=2)
+        assert created == []
+        first, second = pool.acquire(), pool.acquire()
+        assert created == [first, second]
+        with pytest.raises(TimeoutError):
+            pool.acquire(timeout=0.05)
+
+    def test_released_driver_is_reused(self, created):
+        pool = DriverPool(size=2)
+        driver = pool.acquire()
+        pool.release(driver)
+        assert pool.acquire() is driver
+        assert len(created) == 1
+
+    def test_unhealthy_driver_is_replaced_without_prewarm(self, created):
+        pool = DriverPool(size=1)
+        driver = pool.acquire()
+        pool.release(driver)
+        driver.alive = False
+        replacement = pool.acquire()
+        assert replacement is not driver
+        assert driver.quit_count == 1
+        assert len(created) == 2
+
+    def test_reset_failure_discards_without_prewarm(self, created):
+        pool = DriverPool(size=1)
+        driver = pool.acquire()
+        driver.fail_reset = True
+        pool.release(driver)
+        assert driver.quit_count == 1
+        assert pool.acquire() is not driver
+
+    def test_close_quits_everything_without_prewarm(self, created):
+        pool = DriverPool(size=2)
+        busy, idle = pool.acquire(), pool.acquire()
+        pool.release(idle)
+        pool.close()
+        assert idle.quit_count == 1 and busy.quit_count == 1  # 借出未归还的浏览器也一并退出
+        pool.release(busy)  # 会话结束后才归还的浏览器不再放回池中
+        assert pool._idle.empty()
+        with pytest.raises(RuntimeError):
+            pool.acquire()
+
+
+class TestReset:
+
+    def test_clears_storage_of_every_visited_origin(self):
+        driver = StubDriver('https://app.example.com/home', history=[
+            'about:blank', 'https://login.example.com/auth', 'https://app.example.com/home',
+        ])
+        DriverPool.reset(driver)
+        assert driver.visited == ['https://login.example.com/favicon.ico', 'about:blank']
+        assert driver.cleared == ['https://app.example.com/home', 'https://login.example.com/favicon.ico']
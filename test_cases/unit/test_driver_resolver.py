@@ -0,0 +1,150 @@
+"""
+浏览器驱动解析单元测试（utils/driver_resolver.py）
+不下载驱动、不启动浏览器
+"""
+import json
+import time
+from types import SimpleNamespace
+import pytest
+from selenium.common.exceptions import SessionNotCreatedException
+from config.config import Config
+from utils.driver_factory import DriverFactory
+from utils.driver_resolver import DriverResolver
+
+
+@pytest.fixture
+def resolver(tmp_path, monkeypatch):
+    """清单写入临时目录；PATH 中没有驱动，下载返回 downloaded 中的路径"""
+    old_driver = tmp_path / 'old' / 'chromedriver'
+    new_driver = tmp_path / 'new' / 'chromedriver'
+    for path in (old_driver, new_driver):
+        path.parent.mkdir()
+        path.write_text('')
+        path.chmod(0o755)
+    env = SimpleNamespace(old=str(old_driver), new=str(new_driver), downloaded=str(new_driver), downloads=[])
+
+    def download(browser):
+        env.downloads.append(browser)
+        return env.downloaded
+
+    monkeypatch.setattr(DriverResolver, 'MANIFEST_FILE', tmp_path / 'driver_manifest.json')
+    monkeypatch.setattr(DriverResolver, 'MANIFEST_LOCK', tmp_path / 'driver_manifest.lock')
+    monkeypatch.setattr(DriverResolver, '_download', download)
+    monkeypatch.setattr('shutil.which', lambda name: None)
+    monkeypatch.setattr(Config, 'DRIVER_OFFLINE', False)
+    monkeypatch.setattr(Config, 'DRIVER_MANIFEST_TTL', 3600)
+    DriverResolver.clear_cache()
+    yield env
+    DriverResolver.clear_cache()
+
+
+def write_manifest(path, age):
+    DriverResolver.MANIFEST_FILE.write_text(
+        json.dumps({'chrome': {'path': path, 'resolved_at': time.time() - age}}), encoding='utf-8'
+    )
+
+
+def manifest_path():
+    return json.loads(DriverResolver.MANIFEST_FILE.read_text(encoding='utf-8'))['chrome']['path']
+
+
+class TestManifest:
+    """磁盘清单的有效期"""
+
+    def test_fresh_entry_is_used_without_download(self, resolver):
+        write_manifest(resolver.old, age=60)
+        assert DriverResolver._from_manifest_or_download('chrome') == resolver.old
+        assert resolver.downloads == []
+
+    def test_expired_entry_is_downloaded_again(self, resolver):
+        write_manifest(resolver.old, age=7200)
+        assert DriverResolver._from_manifest_or_download('chrome') == resolver.new
+        assert resolver.downloads == ['chrome']
+        assert manifest_path() == resolver.new
+
+    def test_expired_entry_kept_when_download_fails(self, resolver):
+        resolver.downloaded = None
+        write_manifest(resolver.old, age=7200)
+        assert DriverResolver._from_manifest_or_download('chrome') == resolver.old
+
+    def test_offline_mode_ignores_expiry(self, resolver, monkeypatch):
+        monkeypatch.setattr(Config, 'DRIVER_OFFLINE', True)
+        write_manifest(resolver.old, age=7200)
+        assert DriverResolver._from_manifest_or_download('chrome') == resolver.old
+        assert resolver.downloads == []
+
+    def test_missing_executable_is_downloaded_again(self, resolver):
+        write_manifest(resolver.old + '.missing', age=60)
+        assert DriverResolver._from_manifest_or_download('chrome') == resolver.new
+
+    def test_corrupt_manifest_is_treated_as_empty(self, resolver):
+        DriverResolver.MANIFEST_FILE.write_text('{"chrome": ', encoding='utf-8')
+        assert DriverResolver._from_manifest_or_download('chrome') == resolver.new
+        assert manifest_path() == resolver.new
+
+    def test_resolve_is_cached_per_process(self, resolver, monkeypatch):
+        monkeypatch.delenv('CHROMEDRIVER_PATH', raising=False)
+        monkeypatch.setattr(DriverResolver, '_from_drivers_dir', classmethod(lambda cls, browser: None))
+        assert DriverResolver.resolve('chrome') == resolver.new
+        assert DriverResolver.resolve('chrome') == resolver.new
+        assert resolver.downloads == ['chrome']
+
+    def test_clear_cache_removes_manifest(self, resolver):
+        write_manifest(resolver.old, age=60)
+        DriverResolver.clear_cache(manifest=True)
+        assert not DriverResolver.MANIFEST_FILE.exists()
+
+
+class TestResolveLocal:
+    """定位器分析只使用本地已有的驱动"""
+
+    @pytest.fixture(autouse=True)
+    def no_local_sources(self, monkeypatch):
+        monkeypatch.delenv('CHROMEDRIVER_PATH', raising=False)
+        monkeypatch.setattr(DriverResolver, '_from_drivers_dir', classmethod(lambda cls, browser: None))
+
+    def test_expired_manifest_entry_is_used_without_download(self, resolver):
+        write_manifest(resolver.old, age=7200)
+        assert DriverResolver.resolve_local('chrome') == resolver.old
+        assert resolver.downloads == []
+
+    def test_nothing_found(self, resolver):
+        assert DriverResolver.resolve_local('chrome') is None
+        assert resolver.downloads == []
+        assert not DriverResolver.MANIFEST_FILE.exists()
+
+
+class TestSessionNotCreatedRetry:
+    """浏览器升级后清单中的旧驱动无法创建会话：清除清单后重试一次"""
+
+    class StubDriver:
+        def implicitly_wait(self, seconds):
+            pass
+
+        def set_page_load_timeout(self, seconds):
+            pass
+
+    def test_retry_after_clearing_manifest(self, resolver, monkeypatch):
+        write_manifest(resolver.old, age=60)
+        monkeypatch.setattr(Config, 'BROWSER_LAUNCH_SLOTS', 0)
+        attempts = []
+
+        def launch():
+            attempts.append(DriverResolver._from_manifest_or_download('chrome'))
+            if len(attempts) == 1:
+                raise SessionNotCreatedException('This version of ChromeDriver only supports Chrome version 1')
+            return self.StubDriver()
+
+        monkeypatch.setattr(DriverFactory, 'get_chrome_driver', launch)
+        assert isinstance(DriverFactory._create_driver('chrome'), self.StubDriver)
+        assert attempts == [resolver.old, resolver.new]
+
+    def test_second_failure_is_raised(self, resolver, monkeypatch):
+        monkeypatch.setattr(Config, 'BROWSER_LAUNCH_SLOTS', 0)
+
+        def launch():
+            raise SessionNotCreatedException('still broken')
+
+        monkeypatch.setattr(DriverFactory, 'get_chrome_driver', launch)
+        with pytest.raises(SessionNotCreatedException):
+            DriverFactory._create_driver('chrome')
@@ -0,0 +1,62 @@
+"""
+跨进程文件锁单元测试（utils/file_lock.py）
+"""
+import os
+import time
+import pytest
+from utils.file_lock import FileLock, SlotLock
+
+
+class TestFileLock:
+
+    def test_exclusive_until_released(self, tmp_path):
+        path = tmp_path / 'locks' / 'manifest.lock'
+        first, second = FileLock(path), FileLock(path)
+        assert first.try_acquire()
+        assert path.read_text() == str(os.getpid())
+        assert not second.try_acquire()
+        first.release()
+        assert not path.exists()
+        assert second.try_acquire()
+        second.release()
+
+    def test_acquire_times_out(self, tmp_path):
+        path = tmp_path / 'manifest.lock'
+        with FileLock(path):
+            with pytest.raises(TimeoutError):
+                FileLock(path, timeout=0.1, poll_interval=0.01).acquire()
+
+    def test_stale_lock_is_removed(self, tmp_path):
+        """持有进程崩溃后残留的锁文件超过 stale_after 自动清理"""
+        path = tmp_path / 'manifest.lock'
+        path.write_text('12345')
+        old = time.time() - 600
+        os.utime(path, (old, old))
+        with FileLock(path, timeout=1, stale_after=300, poll_interval=0.01):
+            assert path.read_text() == str(os.getpid())
+        assert not path.exists()
+
+    def test_release_without_acquire(self, tmp_path):
+        path = tmp_path / 'manifest.lock'
+        path.write_text('12345')
+        FileLock(path).release()
+        assert path.exists()  # 未持有的锁不删除他人的锁文件
+
+
+class TestSlotLock:
+
+    def test_limits_concurrent_holders(self, tmp_path):
+        holders = [SlotLock(tmp_path, slots=2, timeout=0.1, poll_interval=0.01) for _ in range(3)]
+        holders[0].acquire()
+        holders[1].acquire()
+        with pytest.raises(TimeoutError):
+            holders[2].acquire()
+        holders[0].release()
+        holders[2].acquire()
+        assert holders[2]._held.path == holders[0].locks[0].path
+        for holder in holders[1:]:
+            holder.release()
+        assert list(tmp_path.iterdir()) == []
+
+    def test_at_least_one_slot(self, tmp_path):
+        assert len(SlotLock(tmp_path, slots=0).locks) == 1
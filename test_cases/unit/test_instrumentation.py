@@ -0,0 +1,128 @@
+"""
+WebDriver 命令埋点单元测试（utils/instrumentation.py）
+使用桩驱动，不启动浏览器
+"""
+import json
+from collections import deque
+import pytest
+from utils.instrumentation import Instrumentation, load_profiles, summarize
+
+ELEMENT_KEY = 'element-6066-11e4-a52e-4f735466cecf'
+
+
+class StubDriver:
+    """execute 按命令返回固定响应"""
+
+    def execute(self, driver_command, params=None):
+        if driver_command == 'findElement':
+            return {'value': {ELEMENT_KEY: 'e1'}}
+        if driver_command == 'clickElement' and params.get('id') == 'broken':
+            raise RuntimeError('click intercepted')
+        return {'value': None}
+
+
+@pytest.fixture
+def instrumentation(monkeypatch):
+    monkeypatch.setattr(Instrumentation, 'enabled', True)
+    monkeypatch.setattr(Instrumentation, '_buffer', deque(maxlen=100))
+    monkeypatch.setattr(Instrumentation, '_recorded', 0)
+    monkeypatch.setattr(Instrumentation, '_elements', {})
+    Instrumentation.set_current_test('test_a.py::test_login')
+    yield Instrumentation
+    Instrumentation.set_current_test(None)
+
+
+def records():
+    return [(record.name, record.locator, record.phase, record.ok) for record in Instrumentation._buffer]
+
+
+class TestAttach:
+
+    def test_element_commands_carry_locator_of_find(self, instrumentation):
+        driver = StubDriver()
+        Instrumentation.attach(driver)
+        Instrumentation.attach(driver)  # 重复包装无副作用
+        driver.execute('findElement', {'using': 'xpath', 'value': '//input'})
+        driver.execute('clickElement', {'id': 'e1'})
+        driver.execute('getTitle')
+        assert records() == [
+            ('findElement', 'xpath=//input', 'action', True),
+            ('clickElement', 'xpath=//input', 'action', True),
+            ('getTitle', None, 'action', True),
+        ]
+
+    def test_failed_command_is_recorded(self, instrumentation):
+        driver = StubDriver()
+        Instrumentation.attach(driver)
+        with pytest.raises(RuntimeError):
+            driver.execute('clickElement', {'id': 'broken'})
+        assert records() == [('clickElement', None, 'action', False)]
+
+    def test_detach_restores_execute(self, instrumentation):
+        driver = StubDriver()
+        Instrumentation.attach(driver)
+        Instrumentation.detach(driver)
+        driver.execute('getTitle')
+        assert records() == []
+
+    def test_disabled(self, instrumentation, monkeypatch):
+        monkeypatch.setattr(Instrumentation, 'enabled', False)
+        driver = StubDriver()
+        Instrumentation.attach(driver)
+        driver.execute('getTitle')
+        assert 'execute' not in vars(driver) and records() == []
+
+
+class TestWaiting:
+
+    def test_commands_inside_wait_are_wait_phase(self, instrumentation):
+        driver = StubDriver()
+        Instrumentation.attach(driver)
+        with Instrumentation.waiting('presence_of_element_located', ('id', 'prompt')) as span:
+            for _ in range(3):
+                driver.execute('findElement', {'using': 'id', 'value': 'prompt'})
+                span['polls'] += 1
+            span['ok'] = True
+        assert [phase for _, _, phase, _ in records()] == ['wait'] * 3 + ['wait_span']
+        span_record = Instrumentation._buffer[-1]
+        assert (span_record.locator, span_record.retries, span_record.ok) == ('id=prompt', 2, True)
+
+    def test_nested_wait_is_not_recorded_twice(self, instrumentation):
+        with Instrumentation.waiting('outer'):
+            with Instrumentation.waiting('inner') as inner:
+                assert inner == {}
+        assert [name for name, *_ in records()] == ['outer']
+
+
+class TestExport:
+
+    def test_export_counts_dropped_and_totals(self, instrumentation, monkeypatch, tmp_path):
+        monkeypatch.setattr(Instrumentation, '_buffer', deque(maxlen=3))
+        for start in range(5):
+            Instrumentation.record('getTitle', None, 'action', Instrumentation._origin + start, 0.5)
+        path = Instrumentation.export('test_cases/test_a.py::test_login[row-1]', directory=tmp_path)
+        assert path.name == 'test_cases_test_a.py_test_login_row-1.json'
+        data = json.loads(path.read_text(encoding='utf-8'))
+        assert data['dropped'] == 2
+        assert [command['start'] for command in data['commands']] == [2, 3, 4]
+        assert (data['action_seconds'], data['command_count']) == (1.5, 3)
+        assert Instrumentation.export('test_b', directory=tmp_path) is None
+
+    def test_summarize(self, tmp_path):
+        profile = {
+            'test': 't1', 'dropped': 0, 'wait_seconds': 2.0, 'action_seconds': 0.3, 'startup_seconds': 1.0,
+            'command_count': 3,
+            'commands': [
+                {'name': 'findElement', 'locator': 'id=a', 'phase': 'wait', 'start': 0, 'duration': 0.1},
+                {'name': 'until', 'locator': 'id=a', 'phase': 'wait_span', 'start': 0, 'duration': 2.0},
+                {'name': 'findElement', 'locator': 'id=b', 'phase': 'action', 'start': 2, 'duration': 0.2},
+                {'name': 'clickElement', 'locator': 'id=b', 'phase': 'action', 'start': 2.2, 'duration': 0.1},
+                {'name': 'newSession', 'locator': None, 'phase': 'startup', 'start': -1, 'duration': 1.0},
+            ],
+        }
+        (tmp_path / 't1.json').write_text(json.dumps(profile), encoding='utf-8')
+        (tmp_path / 'broken.json').write_text('{', encoding='utf-8')
+        summary = summarize(load_profiles(tmp_path), top=2)
+        assert [entry['name'] for entry in summary['slowest']] == ['until', 'newSession']
+        assert summary['by_command']['findElement'] == (2, pytest.approx(0.3))
+        assert summary['totals']['command_count'] == 3
@@ -0,0 +1,80 @@
+"""
+JSON 增量解析单元测试（test_data/json_stream.py）
+"""
+import io
+import json
+import pytest
+from test_data.json_stream import iter_json_array
+from test_data.test_data_config import TestDataConfig
+
+KEYS = ['login_test_data', 'login']
+NOISE = {'meta': {'note': 'a "quoted" ] } [ { string', 'nested': [[1, 2], {'x': '\\"'}]}, 'count': 3}
+
+
+def stream(text, keys=KEYS, chunk_size=64 * 1024):
+    return list(iter_json_array(io.StringIO(text), keys=keys, chunk_size=chunk_size))
+
+
+@pytest.fixture(params=[1, 3, 7, 64 * 1024], ids=lambda size: f'chunk{size}')
+def chunk_size(request):
+    """小块读取覆盖字符串、数字、转义在缓冲区边界被截断的情况"""
+    return request.param
+
+
+class TestIterJsonArray:
+
+    def test_top_level_array(self, chunk_size):
+        rows = [{'username': 'a'}, {'username': 'b', 'n': 12345}]
+        assert stream(json.dumps(rows), chunk_size=chunk_size) == rows
+
+    def test_skips_other_fields_before_target(self, chunk_size):
+        document = dict(NOISE, login_test_data=[{'username': 'a'}])
+        assert stream(json.dumps(document), chunk_size=chunk_size) == [{'username': 'a'}]
+
+    def test_first_key_wins_even_when_later_in_file(self, chunk_size):
+        """{module}_test_data 优先于与文件名相同的字段，与字段在文件中的顺序无关"""
+        text = json.dumps({'login': [{'from': 'stem'}], **NOISE, 'login_test_data': [{'from': 'key'}]})
+        assert stream(text, chunk_size=chunk_size) == [{'from': 'key'}]
+
+    def test_falls_back_to_lower_priority_key(self, chunk_size):
+        text = json.dumps({**NOISE, 'login': [{'from': 'stem'}], 'other': [1]})
+        assert stream(text, chunk_size=chunk_size) == [{'from': 'stem'}]
+
+    def test_non_array_field_is_ignored(self):
+        text = json.dumps({'login_test_data': {'not': 'an array'}, 'login': [1]})
+        assert stream(text) == [1]
+
+    def test_no_matching_field(self):
+        assert stream(json.dumps(NOISE)) == []
+        assert stream('{}') == []
+        assert stream('"scalar"') == []
+
+    def test_utf8_bom(self):
+        assert stream('\ufeff[1, 2]') == [1, 2]
+
+    def test_empty_array(self):
+        assert stream('{"login_test_data": []}') == []
+
+    @pytest.mark.parametrize('text', ['[1 2]', '{"a" 1}', '{"meta": [1, 2', '{"meta": "unterminated'])
+    def test_malformed(self, text):
+        with pytest.raises(ValueError):
+            stream(text, chunk_size=2)
+
+
+class TestJsonStreamThreshold:
+    """小文件 json.load，大文件增量解析，两种方式字段优先级一致"""
+
+    @pytest.mark.parametrize('threshold', [0, 1024 * 1024], ids=['stream', 'load'])
+    def test_same_result(self, tmp_path, monkeypatch, threshold):
+        monkeypatch.setattr(TestDataConfig, 'JSON_STREAM_THRESHOLD', threshold)
+        path = tmp_path / 'login_test_data.json'
+        path.write_text(json.dumps({'login': [{'from': 'stem'}], 'login_test_data': [{'from': 'key'}]}),
+                        encoding='utf-8')
+        assert list(TestDataConfig._iter_json_data(path)) == [{'from': 'key'}]
+
+    @pytest.mark.parametrize('threshold', [0, 1024 * 1024], ids=['stream', 'load'])
+    def test_stem_key(self, tmp_path, monkeypatch, threshold):
+        monkeypatch.setattr(TestDataConfig, 'JSON_STREAM_THRESHOLD', threshold)
+        path = tmp_path / 'login.json'
+        path.write_text(json.dumps({'other': [0], 'login': [1, 2]}), encoding='utf-8')
+        assert list(TestDataConfig._iter_json_data(path)) == [1, 2]
@@ -0,0 +1,88 @@
+"""
+定位器分析单元测试（utils/locator_analyzer.py）
+只覆盖不需要浏览器的部分
+"""
+import types
+import pytest
+from selenium.webdriver.common.by import By
+from config.config import Config
+from utils.locator_analyzer import CAPTURED_MARKER, _literal, apply_suggestions, is_captured, snapshot_for, static_flags
+
+MODULE_SOURCE = '''from selenium.webdriver.common.by import By
+
+
+class LoginLocators:
+    USERNAME = (By.XPATH, "//input[@placeholder='用户名']")
+    SUBMIT = (By.CSS_SELECTOR, "button.submit")
+'''
+
+REPORT = {
+    'USERNAME': {'suggestion': {'by': By.ID, 'value': 'username'}},
+    'SUBMIT': {'suggestion': None},
+}
+
+
+@pytest.fixture
+def module(tmp_path):
+    path = tmp_path / 'login_locators.py'
+    path.write_text(MODULE_SOURCE, encoding='utf-8')
+    return types.SimpleNamespace(__name__='locators.login_locators', __file__=str(path))
+
+
+def write_snapshot(path, captured):
+    header = f'<!-- {CAPTURED_MARKER} -->\n' if captured else ''
+    path.write_text(f'<!DOCTYPE html>\n{header}<html><body></body></html>\n', encoding='utf-8')
+    return path
+
+
+class TestStaticFlags:
+
+    @pytest.mark.parametrize('by, value, flags', [
+        (By.ID, 'username', []),
+        (By.XPATH, "//*[@id='login']//input", []),
+        (By.XPATH, "//input[@type='text']", ['full_scan']),
+        (By.XPATH, "(//button[contains(text(), '登录')])[1]", ['full_scan', 'text']),
+        (By.XPATH, "//form[@id='f']//input[@placeholder='用户名']", ['text']),
+        (By.NAME, 'username', ['full_scan']),
+        (By.CSS_SELECTOR, '#login > input.name', []),
+        (By.CSS_SELECTOR, 'form [type=submit]', ['full_scan']),
+        (By.CSS_SELECTOR, "input[placeholder='用户名']", ['text']),
+    ])
+    def test_flags(self, by, value, flags):
+        assert static_flags(by, value) == flags
+
+
+class TestSnapshots:
+
+    def test_snapshot_for_module(self, module, monkeypatch, tmp_path):
+        monkeypatch.setattr(Config, 'DOM_SNAPSHOT_DIR', tmp_path)
+        assert snapshot_for(module) == tmp_path / 'login.html'
+
+    @pytest.mark.parametrize('captured', [True, False])
+    def test_is_captured(self, tmp_path, captured):
+        assert is_captured(write_snapshot(tmp_path / 'login.html', captured)) is captured
+
+
+class TestApplySuggestions:
+
+    def test_hand_written_snapshot_is_refused(self, module, tmp_path):
+        snapshot = write_snapshot(tmp_path / 'login.html', captured=False)
+        with pytest.raises(ValueError):
+            apply_suggestions(module, REPORT, snapshot)
+        assert open(module.__file__, encoding='utf-8').read() == MODULE_SOURCE
+
+    def test_rewrites_only_suggested_lines(self, module, tmp_path):
+        snapshot = write_snapshot(tmp_path / 'login.html', captured=True)
+        assert apply_suggestions(module, REPORT, snapshot) == ['USERNAME']
+        source = open(module.__file__, encoding='utf-8').read()
+        assert '    USERNAME = (By.ID, "username")\n' in source
+        assert '    SUBMIT = (By.CSS_SELECTOR, "button.submit")\n' in source
+
+    @pytest.mark.parametrize('value, literal', [
+        ("//a[@id='x']", '"//a[@id=\'x\']"'),
+        ('//a[@id="x"]', repr('//a[@id="x"]')),
+        ('a\\b', repr('a\\b')),
+    ])
+    def test_literal(self, value, literal):
+        assert _literal(value) == literal
+        assert eval(_literal(value)) == value
@@ -0,0 +1,32 @@
+"""
+日志工具单元测试（utils/logger.py）
+"""
+import logging
+import queue
+from utils.logger import ContextQueueHandler, LazyFileHandler
+
+
+class TestContextQueueHandler:
+
+    def test_message_is_formatted_when_logged(self, monkeypatch):
+        """后台线程写出时参数可能已经变化，入队前按记录时的状态格式化"""
+        monkeypatch.setenv('PYTEST_CURRENT_TEST', 'test_a.py::test_login (call)')
+        log_queue = queue.SimpleQueue()
+        handler = ContextQueueHandler(log_queue)
+        state = {'step': 1}
+        handler.handle(logging.LogRecord('t', logging.INFO, __file__, 1, '状态: %s', (state,), None))
+        state['step'] = 2
+        record = log_queue.get_nowait()
+        assert record.getMessage() == "状态: {'step': 1}"
+        assert record.test == 'test_a.py::test_login'
+
+
+class TestLazyFileHandler:
+
+    def test_directory_created_on_first_write(self, tmp_path):
+        log_file = tmp_path / 'logs' / 'automation.log'
+        handler = LazyFileHandler(log_file)
+        assert not log_file.parent.exists()
+        handler.emit(logging.LogRecord('t', logging.INFO, __file__, 1, '消息', None, None))
+        handler.close()
+        assert log_file.read_text(encoding='utf-8').strip() == '消息'
@@ -0,0 +1,85 @@
+"""
+LPT 并行调度单元测试（utils/lpt_scheduler.py）
+"""
+import pytest
+from config.config import Config
+from utils import lpt_scheduler
+from utils.lpt_scheduler import auto_worker_count, lpt_assign
+
+
+def loads(groups, costs):
+    return [sum(costs[unit] for unit in group) for group in groups]
+
+
+class TestLptAssign:
+
+    def test_every_unit_assigned_once(self):
+        costs = {f't{i}': (i % 7) + 0.5 for i in range(50)}
+        groups = lpt_assign(costs, 4)
+        assert len(groups) == 4
+        assert sorted(unit for group in groups for unit in group) == sorted(costs)
+
+    def test_longest_first_to_least_loaded(self):
+        """[7, 6, 5, 4, 3, 3] 分给 2 个 worker：从长到短依次放入负载最小的 worker → 14 / 14"""
+        costs = {'a': 7, 'b': 6, 'c': 5, 'd': 4, 'e': 3, 'f': 3}
+        groups = lpt_assign(costs, 2)
+        assert groups == [['a', 'd', 'e'], ['b', 'c', 'f']]
+        assert loads(groups, costs) == [14, 14]
+
+    def test_slow_tail_is_spread(self):
+        """慢用例集中在末尾（bench_lpt_schedule 的场景）时，慢用例分散到不同 worker"""
+        costs = {f'row{i:03d}': (2.0 if i >= 110 else 0.2) for i in range(120)}
+        groups = lpt_assign(costs, 8)
+        slow_per_worker = [sum(costs[unit] == 2.0 for unit in group) for group in groups]
+        assert max(slow_per_worker) - min(slow_per_worker) <= 1
+        ideal = sum(costs.values()) / 8
+        assert max(loads(groups, costs)) <= ideal * 4 / 3
+
+    def test_ties_are_deterministic(self):
+        """所有 worker 独立计算，耗时相同时必须得到相同结果"""
+        costs = {name: 1.0 for name in ['d', 'b', 'a', 'c']}
+        assert lpt_assign(costs, 2) == [['a', 'c'], ['b', 'd']]
+        assert lpt_assign(dict(reversed(list(costs.items()))), 2) == [['a', 'c'], ['b', 'd']]
+
+    def test_more_bins_than_units(self):
+        assert lpt_assign({'a': 1, 'b': 2}, 4) == [['b'], ['a'], [], []]
+
+    @pytest.mark.parametrize('bins', [0, -1])
+    def test_at_least_one_bin(self, bins):
+        assert lpt_assign({'a': 1, 'b': 2}, bins) == [['b', 'a']]
+
+
+class TestAutoWorkerCount:
+
+    @pytest.fixture(autouse=True)
+    def config(self, monkeypatch):
+        monkeypatch.setattr(Config, 'DRIVER_POOL_ENABLED', True)
+        monkeypatch.setattr(Config, 'DRIVER_POOL_SIZE', 1)
+        monkeypatch.setattr(Config, 'DRIVER_PREWARM_DEPTH', 1)
+        monkeypatch.setattr(Config, 'WORKER_MEMORY_MB', 100)
+        monkeypatch.setattr(Config, 'MEMORY_RESERVE_MB', 1000)
+        monkeypatch.setattr(Config, 'BROWSER_MEMORY_MB', {'chrome': 350, 'firefox': 400})
+        monkeypatch.setattr('os.cpu_count', lambda: 16)
+
+    def test_limited_by_memory(self, monkeypatch):
+        # 每个 worker 100 + 2 × 350 = 800 MB
+        monkeypatch.setattr(lpt_scheduler, '_available_memory_mb', lambda: 1000 + 800 * 3 + 799)
+        assert auto_worker_count('chrome') == 3
+
+    def test_limited_by_cpu(self, monkeypatch):
+        monkeypatch.setattr(lpt_scheduler, '_available_memory_mb', lambda: 10 ** 6)
+        assert auto_worker_count('chrome') == 16
+
+    def test_unknown_memory_uses_cpu(self, monkeypatch):
+        monkeypatch.setattr(lpt_scheduler, '_available_memory_mb', lambda: None)
+        assert auto_worker_count('chrome') == 16
+
+    def test_at_least_one_worker(self, monkeypatch):
+        monkeypatch.setattr(lpt_scheduler, '_available_memory_mb', lambda: 10)
+        assert auto_worker_count('firefox') == 1
+
+    def test_per_browser_memory(self, monkeypatch):
+        monkeypatch.setattr(lpt_scheduler, '_available_memory_mb', lambda: 1000 + 1800)
+        assert auto_worker_count('chrome') == 2   # 800 MB / worker
+        assert auto_worker_count('firefox') == 2  # 900 MB / worker
+        assert auto_worker_count('edge') == 2     # 未配置的浏览器按 400 MB
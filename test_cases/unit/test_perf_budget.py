@@ -0,0 +1,85 @@
+"""
+性能预算单元测试（utils/perf_budget.py）
+"""
+import pytest
+from config.config import Config
+from utils.perf_budget import _describe, baseline, budget_for, evaluate, history_key, write_trend_report
+
+BUDGETS = {
+    'default': {'warn': 0.2, 'fail': 0.5},
+    'smoke': {'warn': 0.15, 'fail': 0.3},
+    'critical': {'warn': 0.1, 'fail': 0.25},
+}
+
+
+@pytest.fixture(autouse=True)
+def config(monkeypatch):
+    monkeypatch.setattr(Config, 'PERF_BUDGETS', BUDGETS)
+    monkeypatch.setattr(Config, 'PERF_BASELINE_WINDOW', 5)
+    monkeypatch.setattr(Config, 'PERF_MIN_SAMPLES', 3)
+    monkeypatch.setattr(Config, 'PERF_MIN_DELTA_MS', 50)
+
+
+class TestBaseline:
+
+    def test_not_enough_samples(self):
+        assert baseline([100, 200]) is None
+
+    def test_median_of_recent_window(self):
+        assert baseline([9000, 9000, 100, 300, 200, 400, 500]) == 300
+
+
+class TestBudget:
+
+    def test_default(self):
+        assert budget_for([]) == BUDGETS['default']
+
+    def test_strictest_marker_wins(self):
+        assert budget_for(['smoke', 'critical', 'ui']) == {'warn': 0.1, 'fail': 0.25}
+
+
+class TestEvaluate:
+
+    HISTORY = {'load': [1000, 1000, 1000]}
+
+    @pytest.mark.parametrize('value, status', [
+        (900, 'ok'),
+        (1050, 'ok'),     # +5%
+        (1199, 'ok'),     # 低于 warn（+20%）
+        (1201, 'warn'),
+        (1499, 'warn'),
+        (1501, 'fail'),   # 超过 fail（+50%）
+    ])
+    def test_thresholds(self, value, status):
+        assert evaluate({'load': value}, self.HISTORY, BUDGETS['default']) == {'load': (status, 1000, value)}
+
+    def test_small_absolute_delta_is_jitter(self):
+        """基线很小时，比例超出但绝对增量不足 PERF_MIN_DELTA_MS 视为抖动"""
+        verdicts = evaluate({'fcp': 45}, {'fcp': [10, 10, 10]}, BUDGETS['default'])
+        assert verdicts['fcp'][0] == 'ok'
+
+    def test_new_metric(self):
+        assert evaluate({'load': 1000}, {'load': [1000]}, BUDGETS['default']) == {'load': ('new', None, 1000)}
+
+    def test_zero_baseline(self):
+        verdicts = evaluate({'fcp': 0, 'lcp': 400}, {'fcp': [0, 0, 0], 'lcp': [0, 0, 0]}, BUDGETS['default'])
+        assert verdicts == {'fcp': ('ok', 0, 0), 'lcp': ('fail', 0, 400)}
+
+
+class TestReporting:
+
+    def test_describe_relative_change(self):
+        assert _describe({'load': ('warn', 1000, 1250)}, {'warn'}) == 'load 1250ms（基线 1000ms，+25%）'
+
+    def test_describe_zero_baseline_uses_absolute_delta(self):
+        assert _describe({'lcp': ('fail', 0, 400)}, {'fail'}) == 'lcp 400ms（基线 0ms，+400ms）'
+
+    def test_trend_report_with_zero_baseline(self, tmp_path):
+        results = {'chrome t.py::test_a': {'lcp': ('fail', 0, 400), 'load': ('ok', 1000, 900), 'ttfb': ('new', None, 5)}}
+        output = write_trend_report(results, {}, tmp_path / 'perf_trend.html')
+        content = output.read_text(encoding='utf-8')
+        assert '+400ms' in content and '-10%' in content
+
+    def test_history_key_per_browser(self, monkeypatch):
+        monkeypatch.setattr(Config, 'BROWSER', 'Firefox')
+        assert history_key('test_cases/test_a.py::test_login[row-1]').startswith('firefox test_cases/test_a.py::')
@@ -0,0 +1,131 @@
+"""
+录制 / 回放单元测试（utils/replay.py）
+原始站点为本机 HTTP 服务，不访问网络、不启动浏览器
+"""
+import threading
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from config.config import Config
+from utils.replay import ReplayBundle, ReplayServer, _local_cookie, request_key
+
+
+class UpstreamHandler(BaseHTTPRequestHandler):
+    """原始站点替身：页面中引用自身地址，登录接口设置 Cookie 并重定向"""
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        if self.path.startswith('/login'):
+            self.send_response(302)
+            self.send_header('Location', f'{self.server.origin}/home')
+            self.send_header('Set-Cookie', 'sid=abc; Domain=example.com; Path=/; Secure; HttpOnly')
+            body = b''
+        else:
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            body = f'<script src="{self.server.origin}/app.js"></script>'.encode()
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def upstream():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), UpstreamHandler)
+    server.requests = []
+    server.origin = f'http://127.0.0.1:{server.server_address[1]}'
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def fetch(url):
+    """不跟随重定向、不经过代理的 GET，返回 (状态码, 响应头, 响应体)"""
+    class NoRedirect(urllib.request.HTTPRedirectHandler):
+        def redirect_request(self, *args, **kwargs):
+            return None
+    try:
+        with urllib.request.build_opener(urllib.request.ProxyHandler({}), NoRedirect).open(url, timeout=5) as response:
+            return response.status, response.headers, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, e.read()
+
+
+class TestRequestKey:
+
+    def test_query_sorted_and_cache_busters_ignored(self, monkeypatch):
+        monkeypatch.setattr(Config, 'REPLAY_IGNORE_PARAMS', ['t'])
+        assert request_key('GET', '/api/list?b=2&t=123&a=1') == request_key('GET', '/api/list?a=1&b=2&t=456')
+        assert request_key('GET', '/api/list?t=1') == 'GET /api/list'
+        assert request_key('GET', '') == 'GET /'
+
+    def test_body_distinguishes_requests(self):
+        assert request_key('POST', '/login', b'u=a') != request_key('POST', '/login', b'u=b')
+        assert request_key('POST', '/login', b'u=a').startswith('POST /login #')
+
+
+def test_local_cookie():
+    assert _local_cookie('sid=abc; Domain=example.com; Path=/; Secure; SameSite=None; HttpOnly') == \
+        'sid=abc; Path=/; HttpOnly'
+
+
+class TestReplayBundle:
+
+    def test_bodies_are_deduplicated(self, tmp_path):
+        bundle = ReplayBundle(tmp_path)
+        bundle.put('GET /a', 200, [['Content-Type', 'text/css']], b'body')
+        bundle.put('GET /b', 200, [], b'body')
+        bundle.put('GET /empty', 204, [], b'')
+        assert len(list(bundle.bodies_dir.iterdir())) == 1
+        assert bundle.get('GET /a') == (200, [['Content-Type', 'text/css']], b'body')
+        assert bundle.get('GET /empty') == (204, [], b'')
+        assert bundle.get('GET /missing') is None
+
+    def test_save_merges_parallel_recordings(self, tmp_path):
+        first, second = ReplayBundle(tmp_path), ReplayBundle(tmp_path)
+        first.put('GET /a', 200, [], b'a')
+        second.put('GET /b', 200, [], b'b')
+        first.save()
+        second.save()
+        assert set(ReplayBundle(tmp_path).entries) == {'GET /a', 'GET /b'}
+
+
+class TestReplayServer:
+
+    def test_record_then_replay_offline(self, upstream, tmp_path):
+        recorder = ReplayServer('record', tmp_path, upstream.origin).start()
+        try:
+            status, _, body = fetch(f'{recorder.origin}/index?t=1')
+            assert status == 200 and body == f'<script src="{recorder.origin}/app.js"></script>'.encode()
+            status, headers, _ = fetch(f'{recorder.origin}/login')
+            assert status == 302 and headers['Location'] == f'{recorder.origin}/home'
+            assert headers['Set-Cookie'] == 'sid=abc; Path=/; HttpOnly'
+        finally:
+            recorder.stop()
+        upstream_requests = list(upstream.requests)
+
+        player = ReplayServer('replay', tmp_path, upstream.origin).start()
+        try:
+            status, _, body = fetch(f'{player.origin}/index?t=2')  # 时间戳参数不参与匹配
+            assert status == 200 and body == f'<script src="{player.origin}/app.js"></script>'.encode()
+            assert fetch(f'{player.origin}/login')[1]['Location'] == f'{player.origin}/home'
+            assert fetch(f'{player.origin}/unrecorded')[0] == 404
+        finally:
+            player.stop()
+        assert upstream.requests == upstream_requests  # 回放不访问原始站点
+        assert player.misses == ['GET /unrecorded']
+
+    def test_replay_requires_bundle(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            ReplayServer('replay', tmp_path, 'https://app.example.com').start()
+
+    def test_rewrite_only_upstream(self, tmp_path):
+        server = ReplayServer('replay', tmp_path, 'https://app.example.com/')
+        server.origin = 'http://127.0.0.1:8000'
+        assert server.rewrite('https://app.example.com/login?x=1') == 'http://127.0.0.1:8000/login?x=1'
+        assert server.rewrite('https://cdn.example.com/app.js') == 'https://cdn.example.com/app.js'
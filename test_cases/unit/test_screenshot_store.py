@@ -0,0 +1,72 @@
+"""
+截图存储单元测试（utils/screenshot_store.py）
+"""
+import base64
+import io
+import os
+import pytest
+from utils.screenshot_store import ScreenshotStore
+
+# PNG 原图不缩放时按原字节保存，不需要真实图片
+A, B, C = (bytes([value]) * 100 for value in (1, 2, 3))
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ScreenshotStore(root=tmp_path, image_format='png', max_width=0, max_bytes=0)
+
+
+def age(path, seconds):
+    """把对象文件的最近使用时间设为 seconds 秒前"""
+    mtime = path.stat().st_mtime - seconds
+    os.utime(path, (mtime, mtime))
+
+
+class TestScreenshotStore:
+
+    def test_digest_of_bytes_and_base64_match(self):
+        assert ScreenshotStore.digest(A) == ScreenshotStore.digest(base64.b64encode(A).decode())
+
+    def test_identical_screenshots_stored_once(self, store):
+        first = store.put(A, 'step', test_id='t1')
+        second = store.put(A, 'step', test_id='t2')
+        assert first == second == store.object_path(store.digest(A))
+        assert len(store._object_files()) == 1
+        entries = store.captures()
+        assert set(entries) == {'t1', 't2'}
+        assert entries['t1'][0]['name'] != entries['t2'][0]['name']
+
+    def test_captures_for_one_test(self, store):
+        store.put(A, 'a', test_id='t1')
+        store.put(B, 'b', test_id='t2')
+        assert [entry['object'] for entry in store.captures('t2')['t2']] == [store.digest(B)]
+
+    def test_unsupported_format(self, tmp_path):
+        with pytest.raises(ValueError):
+            ScreenshotStore(root=tmp_path, image_format='gif')
+
+    def test_lru_eviction_keeps_recently_used(self, tmp_path):
+        store = ScreenshotStore(root=tmp_path, image_format='png', max_width=0, max_bytes=250)
+        path_a = store.put(A, 'a', test_id='t')
+        age(path_a, 30)
+        path_b = store.put(B, 'b', test_id='t')
+        age(path_b, 20)
+        store.put(A, 'a', test_id='t')  # 命中已有画面，刷新最近使用时间
+        store.put(C, 'c', test_id='t')
+        assert not path_b.exists()
+        assert path_a.exists() and store.disk_usage() == 200
+        assert [entry['object'] for entry in store.captures('t')['t']] == [store.digest(value) for value in (A, A, C)]
+
+    def test_newest_object_is_never_evicted(self, tmp_path):
+        store = ScreenshotStore(root=tmp_path, image_format='png', max_width=0, max_bytes=50)
+        assert store.put(A, 'a').exists()
+
+    def test_resize_and_reencode(self, tmp_path):
+        Image = pytest.importorskip('PIL.Image')
+        buffer = io.BytesIO()
+        Image.new('RGBA', (400, 200), (255, 0, 0, 255)).save(buffer, 'PNG')
+        store = ScreenshotStore(root=tmp_path, image_format='jpeg', quality=70, max_width=100, max_bytes=0)
+        path = store.put(buffer.getvalue(), 'page')
+        assert path.suffix == '.jpg'
+        with Image.open(path) as image:
+            assert (image.format, image.size) == ('JPEG', (100, 50))
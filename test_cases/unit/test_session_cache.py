@@ -0,0 +1,158 @@
+"""
+登录状态缓存单元测试（utils/session_cache.py）
+使用桩驱动，不启动浏览器、不经过界面登录
+"""
+import time
+import pytest
+from config.config import Config
+from utils.session_cache import SessionCache
+
+ORIGIN = 'https://app.example.com'
+LOGIN_URL = f'{ORIGIN}/login'
+HOME_URL = f'{ORIGIN}/home'
+
+
+class PlainDriver:
+    """不支持 CDP 的浏览器（如 Firefox）"""
+
+    def __init__(self, cookies=(), reject=False):
+        self.cookies = list(cookies)
+        self.reject = reject
+        self.current_url = 'about:blank'
+        self.visited = []
+        self.added_cookies = []
+        self.scripts = []
+
+    def execute_script(self, script, *args):
+        self.scripts.append(args)
+        return {'origin': ORIGIN, 'url': HOME_URL, 'local': {'token': 'abc'}, 'session': {'tab': '1'}}
+
+    def get_cookies(self):
+        return self.cookies
+
+    def add_cookie(self, cookie):
+        self.added_cookies.append(cookie)
+
+    def delete_all_cookies(self):
+        self.added_cookies.clear()
+
+    def get(self, url):
+        self.visited.append(url)
+        self.current_url = LOGIN_URL if self.reject and url != f'{ORIGIN}/favicon.ico' else url
+
+
+class ChromeDriver(PlainDriver):
+    """支持 CDP 的浏览器"""
+
+    def __init__(self, fail_get=False, **kwargs):
+        super().__init__(**kwargs)
+        self.fail_get = fail_get
+        self.cdp = []
+
+    def execute_cdp_cmd(self, command, params):
+        self.cdp.append((command, params))
+        return {'identifier': '1'} if command == 'Page.addScriptToEvaluateOnNewDocument' else {}
+
+    def get(self, url):
+        if self.fail_get:
+            raise TimeoutError('page load timeout')
+        super().get(url)
+
+
+@pytest.fixture(autouse=True)
+def cache(monkeypatch):
+    monkeypatch.setattr(SessionCache, '_snapshots', {})
+    monkeypatch.setattr(SessionCache, 'stats', {'hits': 0, 'logins': 0, 'rejected': 0})
+    monkeypatch.setattr(Config, 'SESSION_CACHE_ENABLED', True)
+    monkeypatch.setattr(Config, 'SESSION_CACHE_TTL', 600)
+    monkeypatch.setattr(Config, 'BASE_URL', LOGIN_URL)
+
+
+@pytest.fixture
+def logins(monkeypatch):
+    """界面登录替身：记录调用并保存快照"""
+    calls = []
+
+    def login(cls, driver, username, password):
+        calls.append(username)
+        cls.stats['logins'] += 1
+        driver.current_url = HOME_URL
+        return cls.capture(driver, username)
+
+    monkeypatch.setattr(SessionCache, 'login', classmethod(login))
+    return calls
+
+
+def snapshot(**overrides):
+    return {'user': 'u1', 'origin': ORIGIN, 'url': HOME_URL, 'local': {'token': 'abc'}, 'session': {},
+            'cookies': [{'name': 'sid', 'value': 'x', 'expiry': 2000000000}], 'expires': time.time() + 60,
+            **overrides}
+
+
+class TestCapture:
+
+    def test_expires_at_ttl(self):
+        before = time.time()
+        assert SessionCache.capture(PlainDriver(), 'u1')['expires'] >= before + 600
+
+    def test_expires_with_earliest_cookie(self):
+        expiry = int(time.time()) + 30
+        driver = PlainDriver(cookies=[{'name': 'a', 'expiry': expiry + 100}, {'name': 'b', 'expiry': expiry},
+                                      {'name': 'c'}])
+        assert SessionCache.capture(driver, 'u1')['expires'] == expiry
+
+    def test_expired_snapshot_is_dropped(self):
+        SessionCache._snapshots['u1'] = snapshot(expires=time.time() - 1)
+        assert SessionCache.get('u1') is None
+        assert 'u1' not in SessionCache._snapshots
+
+
+class TestRestore:
+
+    def test_cdp_single_page_load(self):
+        driver = ChromeDriver()
+        SessionCache.restore(driver, snapshot())
+        assert driver.visited == [HOME_URL]
+        commands = [command for command, _ in driver.cdp]
+        assert commands == ['Network.setCookies', 'Page.addScriptToEvaluateOnNewDocument',
+                            'Page.removeScriptToEvaluateOnNewDocument']
+        cookie = driver.cdp[0][1]['cookies'][0]
+        assert cookie['expires'] == 2000000000 and 'expiry' not in cookie and cookie['url'] == ORIGIN
+
+    def test_cdp_script_removed_when_load_fails(self):
+        driver = ChromeDriver(fail_get=True)
+        with pytest.raises(TimeoutError):
+            SessionCache.restore(driver, snapshot())
+        assert driver.cdp[-1][0] == 'Page.removeScriptToEvaluateOnNewDocument'
+
+    def test_without_cdp_writes_on_same_origin_first(self):
+        driver = PlainDriver()
+        SessionCache.restore(driver, snapshot(), url=f'{ORIGIN}/orders')
+        assert driver.visited == [f'{ORIGIN}/favicon.ico', f'{ORIGIN}/orders']
+        assert driver.added_cookies == [{'name': 'sid', 'value': 'x', 'expiry': 2000000000}]
+        assert driver.scripts == [({'token': 'abc'}, {})]
+
+
+class TestOpenLoggedIn:
+
+    def test_logs_in_once_then_restores(self, logins):
+        SessionCache.open_logged_in(ChromeDriver(), 'u1', 'pw')
+        driver = ChromeDriver()
+        SessionCache.open_logged_in(driver, 'u1', 'pw')
+        assert logins == ['u1']
+        assert driver.visited == [HOME_URL]
+        assert SessionCache.stats == {'hits': 1, 'logins': 1, 'rejected': 0}
+
+    def test_rejected_session_logs_in_again(self, logins):
+        SessionCache._snapshots['u1'] = snapshot()
+        driver = PlainDriver(reject=True)
+        SessionCache.open_logged_in(driver, 'u1', 'pw', url=f'{ORIGIN}/orders')
+        assert logins == ['u1']
+        assert SessionCache.stats['rejected'] == 1
+        assert driver.visited[-1] == f'{ORIGIN}/orders'
+
+    def test_disabled_always_logs_in(self, logins, monkeypatch):
+        monkeypatch.setattr(Config, 'SESSION_CACHE_ENABLED', False)
+        SessionCache._snapshots['u1'] = snapshot()
+        SessionCache.open_logged_in(ChromeDriver(), 'u1', 'pw')
+        assert logins == ['u1'] and SessionCache.stats['hits'] == 0
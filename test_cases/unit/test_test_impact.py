@@ -0,0 +1,124 @@
+"""
+用例影响分析单元测试（utils/test_impact.py）
+不启动浏览器
+"""
+import json
+from types import SimpleNamespace
+import pytest
+import utils.test_impact as test_impact
+from utils.test_impact import TRACED_KEY, _symbols, match_impacted
+
+PAGE = 'pages/login_page.py'
+LOCATOR = 'locators/login_locators.py'
+LOGIN = f'{PAGE}::LoginPage.login'
+LOGOUT = f'{PAGE}::LoginPage.logout'
+USERNAME = f'{LOCATOR}::LoginLocators.USERNAME'
+
+STATIC_INDEX = {
+    'test_a.py::test_login': {'files': [PAGE, LOCATOR], 'data': []},
+    'test_b.py::test_logout': {'files': [PAGE], 'data': []},
+    'test_c.py::test_other': {'files': ['utils/helpers.py'], 'data': ['test_data/login.csv']},
+}
+TRACE = {
+    'test_a.py::test_login': [LOGIN, USERNAME],
+    'test_b.py::test_logout': [LOGOUT],
+    TRACED_KEY: [LOGIN, LOGOUT, USERNAME],
+}
+
+
+class TestMatchImpacted:
+    """按改动的文件和符号匹配用例"""
+
+    def test_symbol_change_selects_only_callers(self):
+        impacted = match_impacted([PAGE], {PAGE: {LOGIN}}, STATIC_INDEX, TRACE)
+        assert set(impacted) == {'test_a.py::test_login'}
+
+    def test_locator_change_selects_only_users(self):
+        impacted = match_impacted([LOCATOR], {LOCATOR: {USERNAME}}, STATIC_INDEX, TRACE)
+        assert set(impacted) == {'test_a.py::test_login'}
+
+    def test_untouched_file_selects_nothing(self):
+        assert match_impacted(['utils/other.py'], {}, STATIC_INDEX, TRACE) == {}
+
+    def test_data_file_change(self):
+        impacted = match_impacted(['test_data/login.csv'], {}, STATIC_INDEX, TRACE)
+        assert set(impacted) == {'test_c.py::test_other'}
+
+    def test_file_level_change_selects_all_importers(self):
+        """模块级代码改动（不在 symbol_changes 中）→ 按文件级依赖判定"""
+        impacted = match_impacted([PAGE], {}, STATIC_INDEX, TRACE)
+        assert set(impacted) == {'test_a.py::test_login', 'test_b.py::test_logout'}
+
+    def test_untraceable_symbol_falls_back_to_file_level(self):
+        """改动的符号不在可追踪全集中（如魔术方法、新增方法），追踪记录不可信"""
+        new_method = f'{PAGE}::LoginPage.__init__'
+        impacted = match_impacted([PAGE], {PAGE: {LOGIN, new_method}}, STATIC_INDEX, TRACE)
+        assert set(impacted) == {'test_a.py::test_login', 'test_b.py::test_logout'}
+
+    def test_trace_without_traced_key_falls_back_to_file_level(self):
+        trace = {test: symbols for test, symbols in TRACE.items() if test != TRACED_KEY}
+        impacted = match_impacted([PAGE], {PAGE: {LOGIN}}, STATIC_INDEX, trace)
+        assert set(impacted) == {'test_a.py::test_login', 'test_b.py::test_logout'}
+
+    def test_test_without_trace_falls_back_to_file_level(self):
+        trace = {'test_a.py::test_login': [LOGIN], TRACED_KEY: [LOGIN, LOGOUT]}
+        impacted = match_impacted([PAGE], {PAGE: {LOGOUT}}, STATIC_INDEX, trace)
+        assert set(impacted) == {'test_b.py::test_logout'}
+
+    def test_empty_symbol_change_selects_nothing(self):
+        """只改了注释 / 格式，符号集合为空"""
+        assert match_impacted([PAGE], {PAGE: set()}, STATIC_INDEX, TRACE) == {}
+
+
+class TestSymbols:
+    """模块拆分为符号"""
+
+    SOURCE = '''
+class Page:
+    TITLE = ("id", "title")
+
+    @property
+    def value(self):
+        return 1
+
+    @value.setter
+    def value(self, v):
+        pass
+
+    @staticmethod
+    def helper():
+        return 2
+'''
+
+    def test_property_getter_and_setter_merge(self):
+        symbols, _ = _symbols(self.SOURCE)
+        assert set(symbols) == {'Page.value', 'Page.helper'}
+        assert symbols['Page.value'].count('FunctionDef') == 2
+
+    def test_locator_attrs_only_in_locator_modules(self):
+        symbols, _ = _symbols(self.SOURCE, locator_attrs=True)
+        assert 'Page.TITLE' in symbols
+        symbols, other = _symbols(self.SOURCE)
+        assert 'Page.TITLE' not in symbols
+        assert any("id='TITLE'" in dump for dump in other)
+
+
+class TestTraceMerge:
+    """写入追踪记录：通过的用例替换旧记录，失败的用例与旧记录合并"""
+
+    @pytest.fixture
+    def index_file(self, tmp_path, monkeypatch):
+        path = tmp_path / 'test_impact.json'
+        path.write_text(json.dumps({'t::passed': ['old'], 't::failed': ['old']}), encoding='utf-8')
+        monkeypatch.setattr(test_impact, 'INDEX_FILE', path)
+        monkeypatch.setattr(test_impact, '_trace_results', {'t::passed': {'new'}, 't::failed': {'new'}})
+        monkeypatch.setattr(test_impact, '_trace_failed', {'t::failed'})
+        monkeypatch.setattr(test_impact, 'traceable_symbols', lambda: {'new', 'old'})
+        return path
+
+    def test_sessionfinish(self, index_file):
+        test_impact.pytest_sessionfinish(SimpleNamespace(config=SimpleNamespace()), 0)
+        trace = json.loads(index_file.read_text(encoding='utf-8'))
+        assert trace['t::passed'] == ['new']
+        assert trace['t::failed'] == ['new', 'old']
+        assert trace[TRACED_KEY] == ['new', 'old']
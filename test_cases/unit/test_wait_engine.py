@@ -0,0 +1,98 @@
+"""
+等待引擎单元测试（utils/wait_engine.py）
+使用假时钟，不真正等待
+"""
+import pytest
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from utils import wait_engine
+from utils.wait_engine import WaitEngine
+
+LOCATOR = ('id', 'prompt')
+
+
+class FakeClock:
+    """time.monotonic / time.sleep 的替身，记录每次休眠时长"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(round(seconds, 6))
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(wait_engine.time, 'monotonic', fake.monotonic)
+    monkeypatch.setattr(wait_engine.time, 'sleep', fake.sleep)
+    return fake
+
+
+def engine(**kwargs):
+    options = dict(timeout=10, poll_interval=0.1, max_poll_interval=0.4, backoff=2)
+    options.update(kwargs)
+    return WaitEngine(driver=object(), **options)
+
+
+def succeeds_after(polls, value='element'):
+    """第 polls 次调用时返回 value，之前抛出 NoSuchElementException"""
+    calls = []
+
+    def condition(driver):
+        calls.append(driver)
+        if len(calls) < polls:
+            raise NoSuchElementException()
+        return value
+    condition.calls = calls
+    return condition
+
+
+class TestBudget:
+
+    def test_explicit_timeout_wins(self):
+        assert engine(budgets={LOCATOR: 3}).budget_for(LOCATOR, timeout=1) == 1
+
+    def test_locator_budget(self):
+        assert engine(budgets={LOCATOR: 3}).budget_for(LOCATOR) == 3
+
+    def test_default_timeout(self):
+        assert engine(budgets={LOCATOR: 3}).budget_for(('id', 'other')) == 10
+
+
+class TestPolling:
+
+    def test_backoff_is_capped(self, clock):
+        condition = succeeds_after(6)
+        assert engine().until(condition) == 'element'
+        assert len(condition.calls) == 6
+        assert clock.sleeps == [0.1, 0.2, 0.4, 0.4, 0.4]
+
+    def test_timeout_raises(self, clock):
+        with pytest.raises(TimeoutException, match='提示框未出现'):
+            engine().until(lambda driver: False, message='提示框未出现', timeout=1)
+        assert clock.now == pytest.approx(1)  # 最后一次休眠截断到截止时间
+
+    def test_locator_budget_limits_wait(self, clock):
+        assert engine(budgets={LOCATOR: 0.5}).check(lambda driver: False, locator=LOCATOR) is False
+        assert clock.now == pytest.approx(0.5)
+
+    def test_zero_timeout_checks_once(self, clock):
+        condition = succeeds_after(2)
+        assert engine().check(condition, timeout=0) is False
+        assert len(condition.calls) == 1 and clock.sleeps == []
+
+    def test_until_not(self, clock):
+        values = iter(['visible', 'visible', None])
+        assert engine().until_not(lambda driver: next(values)) is None
+        assert clock.sleeps == [0.1, 0.2]
+
+    def test_unexpected_exception_propagates(self, clock):
+        def condition(driver):
+            raise ValueError('bad condition')
+        with pytest.raises(ValueError):
+            engine().until(condition)
@@ -0,0 +1,148 @@
+"""
+测试数据编译缓存
+把解析后的 CSV/JSON/XLSX 数据集编译为紧凑的二进制文件（列式存储），通过内存映射读取
+
+文件布局：
+    MAGIC(4 字节) | 头部长度(uint32) | 头部(pickle) | 数据区(pickle)
+
+头部记录源文件的 修改时间/大小/内容哈希 和数据布局，校验时只读取头部，不反序列化数据区；
+修改时间或大小变化（如 git checkout 后）时再比较内容哈希，内容未变则缓存仍然有效
+"""
+import hashlib
+import mmap
+import os
+import pickle
+import struct
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+MAGIC = b'TDC1'
+_HEADER_LEN = struct.Struct('<I')
+_PREFIX_SIZE = len(MAGIC) + _HEADER_LEN.size
+
+
+def source_hash(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    """计算源文件内容哈希（sha1）"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _source_info(path: Path, digest: Optional[str] = None) -> Dict[str, Any]:
+    stat = path.stat()
+    return {
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'sha1': digest or source_hash(path),
+    }
+
+
+def _encode(rows: List[Any]):
+    """
+    选择数据布局：所有行都是字段顺序相同的字典时按列存储（字段名只存一次），否则按行存储
+
+    Returns:
+        (布局名称, 字段列表, 数据)
+    """
+    if rows and all(isinstance(row, dict) for row in rows):
+        columns = list(rows[0])
+        if all(list(row) == columns for row in rows):
+            return 'columns', columns, [[row[name] for row in rows] for name in columns]
+    return 'rows', None, rows
+
+
+def _decode(layout: str, columns: Optional[List[str]], payload) -> List[Any]:
+    if layout == 'columns':
+        return [dict(zip(columns, values)) for values in zip(*payload)] if columns else []
+    return payload
+
+
+def write(cache_file: Path, source: Path, rows: List[Any], digest: Optional[str] = None) -> bool:
+    """
+    把数据集编译为缓存文件（先写临时文件再原子替换，并行进程同时写入也不会读到半个文件）
+
+    写入只是尽力而为：磁盘错误、或 Windows 上目标文件正被其他 worker 内存映射导致替换失败时，
+    记录警告并返回 False，调用方继续使用刚解析的数据，不中断用例收集
+
+    Args:
+        cache_file: 缓存文件路径
+        source: 源数据文件
+        rows: 解析结果
+        digest: 已计算好的源文件哈希（可选）
+
+    Returns:
+        是否写入成功
+    """
+    tmp_file = cache_file.with_name(f'{cache_file.name}.{os.getpid()}.tmp')
+    try:
+        layout, columns, payload = _encode(rows)
+        header = pickle.dumps({
+            'source': _source_info(source, digest),
+            'layout': layout,
+            'columns': columns,
+            'rows': len(rows),
+        }, protocol=pickle.HIGHEST_PROTOCOL)
+
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_file, 'wb') as f:
+            f.write(MAGIC)
+            f.write(_HEADER_LEN.pack(len(header)))
+            f.write(header)
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, cache_file)
+        return True
+    except OSError as e:
+        from utils.logger import Logger
+        Logger().get_logger().warning("写入测试数据编译缓存失败，使用解析结果: %s, 错误: %s", cache_file, e)
+        try:
+            tmp_file.unlink()
+        except OSError:
+            pass
+        return False
+
+
+def read(cache_file: Path, source: Path) -> Optional[List[Any]]:
+    """
+    读取缓存文件；缓存不存在、格式不符或已过期时返回 None（调用方回退到解析源文件）
+
+    读取只是尽力而为：缓存文件损坏、被截断或由不兼容的版本写入等任何异常都记录警告并返回 None，不中断用例收集
+
+    Args:
+        cache_file: 缓存文件路径
+        source: 源数据文件
+
+    Returns:
+        数据集，或 None
+    """
+    try:
+        with open(cache_file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if mm[:len(MAGIC)] != MAGIC:
+                return None
+            (header_len,) = _HEADER_LEN.unpack_from(mm, len(MAGIC))
+            header = pickle.loads(mm[_PREFIX_SIZE:_PREFIX_SIZE + header_len])
+            if not _is_fresh(header['source'], source):
+                return None
+            view = memoryview(mm)
+            try:
+                payload = pickle.loads(view[_PREFIX_SIZE + header_len:])
+            finally:
+                view.release()
+        return _decode(header['layout'], header['columns'], payload)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        from utils.logger import Logger
+        Logger().get_logger().warning("读取测试数据编译缓存失败，重新解析源文件: %s, 错误: %s", cache_file, e)
+        return None
+
+
+def _is_fresh(cached: Dict[str, Any], source: Path) -> bool:
+    """修改时间和大小一致直接命中；大小一致但修改时间不同时比较内容哈希"""
+    stat = source.stat()
+    if cached['size'] != stat.st_size:
+        return False
+    if cached['mtime_ns'] == stat.st_mtime_ns:
+        return True
+    return cached['sha1'] == source_hash(source)
@@ -0,0 +1,165 @@
+"""
+测试数据注册表
+一次目录扫描建立 {module}_test_data.* 文件索引，解析结果按 路径+修改时间+大小 缓存在内存中，
+并编译为二进制缓存（test_data/compiled_cache.py）供其他 xdist worker 复用，避免每个 worker 在收集阶段重复扫描和解析
+"""
+import hashlib
+import os
+import re
+import shutil
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from test_data import compiled_cache
+
+
+class DataRegistry:
+    """
+    测试数据注册表
+
+    使用示例：
+        registry = DataRegistry(base_path, cache_dir)
+        data_format, data_file = registry.find('login', 'auto')
+        data = registry.load(data_file, lambda: parse(data_file))
+    """
+
+    # 自动查找优先级：csv > json > xlsx
+    FORMATS = ('csv', 'json', 'xlsx')
+    FILE_PATTERN = re.compile(r'^(?P<module>.+)_test_data\.(?P<format>csv|json|xlsx)$')
+
+    def __init__(self, base_path: Path, cache_dir: Optional[Path] = None):
+        """
+        初始化注册表
+
+        Args:
+            base_path: 数据文件根目录（test_data/test_type）
+            cache_dir: 磁盘缓存目录，None 表示只使用内存缓存
+        """
+        self.base_path = Path(base_path)
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._index = None
+        self._memory = {}
+        self._lock = threading.RLock()
+
+    def index(self) -> Dict[Tuple[str, str], Path]:
+        """
+        获取数据文件索引 {(模块名, 格式): 文件路径}
+
+        同名文件出现在多个子目录时，优先使用层级最浅的（根目录优先，兼容示例子目录）
+        """
+        with self._lock:
+            if self._index is None:
+                self._index = self._scan()
+            return self._index
+
+    def _scan(self) -> Dict[Tuple[str, str], Path]:
+        """单次遍历目录建立索引"""
+        index = {}
+        for root, dirs, files in os.walk(self.base_path):
+            dirs.sort()
+            for name in files:
+                match = self.FILE_PATTERN.match(name)
+                if not match:
+                    continue
+                key = (match.group('module'), match.group('format'))
+                path = Path(root) / name
+                if key not in index or len(path.parts) < len(index[key].parts):
+                    index[key] = path
+        return index
+
+    def find(self, module_name: str, data_format: str = 'auto') -> Tuple[str, Path]:
+        """
+        查找模块的数据文件
+
+        Args:
+            module_name: 模块名称
+            data_format: 数据格式 ('csv', 'json', 'xlsx', 'auto')
+
+        Returns:
+            (数据格式, 文件路径)
+        """
+        found = self._lookup(module_name, data_format)
+        if found is None:
+            # 索引建立后新增的文件：重新扫描一次
+            with self._lock:
+                self._index = None
+            found = self._lookup(module_name, data_format)
+        if found is not None:
+            return found
+
+        if data_format == 'auto':
+            raise FileNotFoundError(
+                f"未找到模块 '{module_name}' 的测试数据文件\n"
+                f"请在以下位置创建数据文件：\n"
+                f"  - {self.base_path / f'{module_name}_test_data.csv'}\n"
+                f"  - {self.base_path / f'{module_name}_test_data.json'}\n"
+                f"  - {self.base_path / f'{module_name}_test_data.xlsx'}"
+            )
+        raise FileNotFoundError(
+            f"找不到测试数据文件: {self.base_path / f'{module_name}_test_data.{data_format}'}\n"
+            f"请创建文件或使用 data_format='auto' 自动查找"
+        )
+
+    def _lookup(self, module_name: str, data_format: str) -> Optional[Tuple[str, Path]]:
+        index = self.index()
+        formats = self.FORMATS if data_format == 'auto' else (data_format,)
+        for fmt in formats:
+            path = index.get((module_name, fmt))
+            if path is not None:
+                return fmt, path
+        return None
+
+    @staticmethod
+    def _cache_key(path: Path) -> Tuple[str, int, int]:
+        """缓存键：路径 + 修改时间 + 文件大小，文件变化后自动失效"""
+        stat = path.stat()
+        return str(path.resolve()), stat.st_mtime_ns, stat.st_size
+
+    def _disk_cache_file(self, path: Path) -> Path:
+        name = hashlib.sha1(str(path.resolve()).encode('utf-8')).hexdigest()
+        return self.cache_dir / f'{path.name}.{name[:16]}.tdc'
+
+    def load(self, path: Path, parser: Callable[[], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        加载数据文件：内存缓存 > 编译缓存（按源文件哈希校验，过期时忽略） > 调用 parser 解析
+
+        Args:
+            path: 数据文件路径
+            parser: 解析函数，缓存未命中时调用
+
+        Returns:
+            测试数据列表（每行为独立的字典副本，用例修改数据不会影响缓存）
+        """
+        key = self._cache_key(path)
+        with self._lock:
+            data = self._memory.get(key)
+            if data is None:
+                data = self._read_disk_cache(path)
+                if data is None:
+                    data = parser()
+                    self._write_disk_cache(path, data)
+                self._memory[key] = data
+        return [dict(row) if isinstance(row, dict) else row for row in data]
+
+    def _read_disk_cache(self, path: Path) -> Optional[List[Dict[str, Any]]]:
+        if self.cache_dir is None:
+            return None
+        return compiled_cache.read(self._disk_cache_file(path), path)
+
+    def _write_disk_cache(self, path: Path, data: List[Dict[str, Any]]):
+        if self.cache_dir is None:
+            return
+        compiled_cache.write(self._disk_cache_file(path), path, data)
+
+    def invalidate(self, disk: bool = True):
+        """
+        显式失效：清空索引和内存缓存
+
+        Args:
+            disk: 是否同时删除磁盘缓存
+        """
+        with self._lock:
+            self._index = None
+            self._memory.clear()
+        if disk and self.cache_dir is not None and self.cache_dir.exists():
+            shutil.rmtree(self.cache_dir, ignore_errors=True)
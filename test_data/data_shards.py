@@ -0,0 +1,271 @@
+"""
+测试数据分片
+并行运行时把数据驱动用例的数据行按 行区间 或 稳定哈希 分配到各 xdist worker
+
+收集阶段每个 worker 只建立轻量的行索引（CSV 记录字节偏移、Excel 读取工作表维度或最后一行行号），
+参数化的值是 LazyRow 占位对象，用例实际运行时才按分片读取：
+    - CSV：按字节偏移 seek 后只解析分片内的行
+    - Excel：只读模式 iter_rows(min_row, max_row) 读取分片所在的行窗口
+    - JSON：无法按行定位，回退为完整加载（走 DataRegistry 缓存）
+
+所有 worker 收集到的用例和节点 ID 完全相同（xdist 要求），
+同一分片的行通过 xdist_group 标记分配给同一个 worker（需 --dist loadgroup）
+"""
+import csv
+import io
+import re
+import threading
+import zipfile
+import zlib
+from array import array
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+
+class ShardedDataset:
+    """
+    按分片读取的数据集
+
+    使用示例：
+        dataset = ShardedDataset(path, 'csv', shards=8, mode='range')
+        rows = [LazyRow(dataset, i) for i in range(dataset.count())]
+    """
+
+    MODES = ('range', 'hash')
+
+    def __init__(self, path: Path, data_format: str, shards: int, mode: str = 'range',
+                 loader: Optional[Callable[[], List[Dict[str, Any]]]] = None):
+        """
+        初始化数据集（只建立行索引，不解析数据）
+
+        Args:
+            path: 数据文件路径
+            data_format: 数据格式 ('csv', 'json', 'xlsx')
+            shards: 分片数量（通常等于 worker 数量）
+            mode: 分片方式，'range' 连续行区间 / 'hash' 按行号稳定哈希
+            loader: 完整加载函数，JSON 等无法按行定位的格式使用
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"不支持的分片方式: {mode}，支持：{', '.join(self.MODES)}")
+        self.path = Path(path)
+        self.data_format = data_format
+        self.shards = max(1, shards)
+        self.mode = mode
+        self._loader = loader
+        self._header = None
+        self._offsets = None
+        self._count = None
+        self._loaded = {}   # 分片号 -> {行号: 数据}
+        self._members = None  # hash 模式：分片号 -> 行号列表（一次扫描得到）
+        self._all_rows = None
+        self._lock = threading.Lock()
+
+    def count(self) -> int:
+        """数据行数（收集阶段调用，只建立索引）"""
+        if self._count is None:
+            if self.data_format == 'csv':
+                self._index_csv()
+            elif self.data_format == 'xlsx':
+                self._count = self._xlsx_row_count()
+            else:
+                self._count = len(self._load_all())
+        return self._count
+
+    def shard_of(self, index: int) -> int:
+        """行所属的分片号：range 按连续区间，hash 按 crc32(文件名:行号)，跨进程稳定"""
+        if self.mode == 'hash':
+            return zlib.crc32(f'{self.path.name}:{index}'.encode('utf-8')) % self.shards
+        return index * self.shards // max(self.count(), 1)
+
+    def members(self, shard: int) -> List[int]:
+        """
+        分片中的行号（升序）
+
+        range 模式按区间直接计算；hash 模式首次调用时一次扫描为所有分片分组，之后直接返回
+        """
+        count = self.count()
+        if self.mode == 'range':
+            # shard_of(i) == shard  <=>  ceil(shard * count / shards) <= i < ceil((shard + 1) * count / shards)
+            return list(range(-(-shard * count // self.shards), -(-(shard + 1) * count // self.shards)))
+        if self._members is None:
+            groups = {}
+            for index in range(count):
+                groups.setdefault(self.shard_of(index), []).append(index)
+            self._members = groups
+        return self._members.get(shard, [])
+
+    def group_name(self, index: int) -> str:
+        """xdist_group 分组名"""
+        return f'{self.path.stem}-shard{self.shard_of(index)}'
+
+    def row(self, index: int) -> Optional[Dict[str, Any]]:
+        """
+        读取指定行；首次访问时加载该行所在的整个分片，之后同一分片的行直接从已加载的分片返回
+
+        Returns:
+            行数据；Excel 中的空行返回 None
+        """
+        shard = self.shard_of(index)
+        with self._lock:
+            rows = self._loaded.get(shard)
+            if rows is None:
+                rows = self._loaded[shard] = self._read_rows(self.members(shard))
+        return rows.get(index)
+
+    def _read_rows(self, indexes: List[int]) -> Dict[int, Optional[Dict[str, Any]]]:
+        if not indexes:
+            return {}
+        if self.data_format == 'csv':
+            return self._read_csv_rows(indexes)
+        if self.data_format == 'xlsx':
+            return self._read_xlsx_rows(indexes)
+        rows = self._load_all()
+        return {i: rows[i] for i in indexes}
+
+    def _load_all(self) -> List[Dict[str, Any]]:
+        if self._all_rows is None:
+            if self._loader is None:
+                raise ValueError(f"{self.data_format} 格式不支持按行读取，需要提供 loader")
+            self._all_rows = self._loader()
+        return self._all_rows
+
+    # ---------- CSV：字节偏移索引 ----------
+
+    def _index_csv(self):
+        """
+        单次扫描记录每条数据记录的起止字节偏移（标题行取第一个非注释、非空行；跳过注释行、空行和全空字段行），不构造字典
+        引号内换行的字段按引号计数合并为同一条记录
+        """
+        starts, ends = array('q'), array('q')
+        with open(self.path, 'rb') as f:
+            # 与 TestDataConfig 一致：标题行之前的注释行和空行不作为标题
+            header, offset = '', 0
+            for line in iter(f.readline, b''):
+                offset += len(line)
+                text = line.decode('utf-8-sig').strip()
+                if text and not text.startswith('#'):
+                    header = text
+                    break
+            self._header = next(csv.reader([header]), [])
+            record_start, quotes = None, 0
+            for line in iter(f.readline, b''):
+                if record_start is None:
+                    stripped = line.strip()
+                    if not stripped or stripped.startswith(b'#') or not stripped.translate(None, b',"\t '):
+                        offset += len(line)
+                        continue
+                    record_start = offset
+                quotes += line.count(b'"')
+                offset += len(line)
+                if quotes % 2 == 0:
+                    starts.append(record_start)
+                    ends.append(offset)
+                    record_start, quotes = None, 0
+        self._offsets = (starts, ends)
+        self._count = len(starts)
+
+    def _read_csv_rows(self, indexes: List[int]) -> Dict[int, Dict[str, Any]]:
+        """按偏移读取行；连续的行合并为一次读取，再按记录起止位置截取（跳过其间的注释行）"""
+        starts, ends = self._offsets
+        rows = {}
+        with open(self.path, 'rb') as f:
+            start = 0
+            while start < len(indexes):
+                end = start
+                while end + 1 < len(indexes) and indexes[end + 1] == indexes[end] + 1:
+                    end += 1
+                first, last = indexes[start], indexes[end]
+                base = starts[first]
+                f.seek(base)
+                block = f.read(ends[last] - base)
+                records = b''.join(block[starts[i] - base:ends[i] - base] for i in range(first, last + 1))
+                reader = csv.DictReader(io.StringIO(records.decode('utf-8'), newline=''), fieldnames=self._header)
+                for index, row in zip(range(first, last + 1), reader):
+                    rows[index] = row
+                start = end + 1
+        return rows
+
+    # ---------- Excel：行窗口 ----------
+
+    def _open_sheet(self):
+        import openpyxl
+        workbook = openpyxl.load_workbook(self.path, read_only=True)
+        return workbook, workbook[workbook.sheetnames[0]]
+
+    def _xlsx_row_count(self) -> int:
+        """读取工作表维度得到行数；文件未记录维度时逐行计数（不构造字典）"""
+        workbook, sheet = self._open_sheet()
+        try:
+            self._header = list(next(sheet.iter_rows(max_row=1, values_only=True), ()))
+            max_row = sheet.max_row
+            if max_row is None:
+                max_row = self._scan_last_row(getattr(sheet, '_worksheet_path', None))
+            if max_row is None:
+                max_row = sum(1 for _ in sheet.iter_rows(values_only=True))
+            return max(max_row - 1, 0)
+        finally:
+            workbook.close()
+
+    def _scan_last_row(self, worksheet_path: Optional[str]) -> Optional[int]:
+        """工作表未记录维度（如 openpyxl write_only 生成的文件）时，直接扫描 XML 中最后一个 <row r="N">"""
+        if not worksheet_path:
+            return None
+        pattern = re.compile(rb'<row\b[^>]*?\sr="(\d+)"')
+        last, tail = None, b''
+        with zipfile.ZipFile(self.path) as archive, archive.open(worksheet_path) as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                data = tail + chunk
+                for match in pattern.finditer(data):
+                    last = int(match.group(1))
+                tail = data[-256:]
+        return last
+
+    def _read_xlsx_rows(self, indexes: List[int]) -> Dict[int, Optional[Dict[str, Any]]]:
+        """读取覆盖分片的行窗口（第 1 行为标题，数据行号 = 索引 + 2）"""
+        wanted = set(indexes)
+        first, last = min(indexes), max(indexes)
+        rows = {}
+        workbook, sheet = self._open_sheet()
+        try:
+            values = sheet.iter_rows(min_row=first + 2, max_row=last + 2, values_only=True)
+            for index, row in zip(range(first, last + 1), values):
+                if index not in wanted:
+                    continue
+                if any(value is not None and str(value).strip() for value in row):
+                    rows[index] = dict(zip(self._header, row))
+                else:
+                    rows[index] = None
+        finally:
+            workbook.close()
+        return rows
+
+
+class LazyRow(Mapping):
+    """
+    数据行占位对象：作为参数化的值使用，访问字段时才读取所在分片
+
+    与普通字典一样支持 row['username']、row.get('username')、dict(row)
+    """
+
+    __slots__ = ('dataset', 'index')
+
+    def __init__(self, dataset: ShardedDataset, index: int):
+        self.dataset = dataset
+        self.index = index
+
+    def resolve(self) -> Optional[Dict[str, Any]]:
+        """读取行数据，空行返回 None"""
+        return self.dataset.row(self.index)
+
+    def __getitem__(self, key):
+        return (self.resolve() or {})[key]
+
+    def __iter__(self):
+        return iter(self.resolve() or {})
+
+    def __len__(self):
+        return len(self.resolve() or {})
+
+    def __repr__(self):
+        return f'LazyRow({self.dataset.path.name}#{self.index})'
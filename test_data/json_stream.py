@@ -0,0 +1,182 @@
+"""
+JSON 增量解析模块
+按块读取文件，逐个产出数组元素，内存中只保留当前元素和一个读缓冲区，无需第三方依赖
+
+支持两种文件结构：
+    1. 顶层数组：[{...}, {...}]
+    2. 顶层对象中的数组字段：{"login_test_data": [{...}, {...}], ...}
+"""
+import json
+import re
+from typing import Any, Iterable, Iterator, List, Optional, Set, Tuple
+
+_WHITESPACE = ' \t\n\r'
+# 跳过字段时只关心字符串边界和括号
+_STRUCTURE = re.compile(r'["\[\]{}]')
+_STRING = re.compile(r'"(?:[^"\\]|\\.)*"', re.S)
+
+
+class _Buffer:
+    """带自动补充的读缓冲区"""
+
+    def __init__(self, fp, chunk_size):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.text = ''
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """读入下一块数据，已到文件末尾时返回 False"""
+        if self.eof:
+            return False
+        chunk = self.fp.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        # 丢弃已消费的部分，避免缓冲区无限增长
+        self.text = self.text[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """跳过空白并返回下一个字符，到达末尾返回空字符串"""
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.fill():
+                return ''
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise ValueError(f"JSON 格式错误：位置 {self.pos} 处应为 '{char}'")
+        self.pos += 1
+
+    def decode(self, decoder: json.JSONDecoder) -> Any:
+        """解码一个完整的 JSON 值，数据不完整时自动读入更多内容"""
+        self.peek()
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.text, self.pos)
+                # 数字等值可能恰好在缓冲区末尾被截断，需读入更多内容确认
+                if end < len(self.text) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self.fill()
+
+    def skip(self, decoder: json.JSONDecoder):
+        """跳过一个 JSON 值；数组和对象按括号深度扫描，不构造其中的元素"""
+        if self.peek() not in '[{':
+            self.decode(decoder)
+            return
+        depth = 0
+        while True:
+            match = _STRUCTURE.search(self.text, self.pos)
+            string = match and match.group() == '"' and _STRING.match(self.text, match.start())
+            if match is None or string is None:
+                # 缓冲区中没有括号，或字符串被截断：读入更多内容后从截断处继续
+                self.pos = len(self.text) if match is None else match.start()
+                if not self.fill():
+                    raise ValueError("JSON 格式错误：文件意外结束")
+                continue
+            if string:
+                self.pos = string.end()
+                continue
+            self.pos = match.end()
+            depth += 1 if match.group() in '[{' else -1
+            if depth == 0:
+                return
+
+
+def _start(buffer: _Buffer) -> str:
+    """跳过 UTF-8 BOM 和空白，返回第一个字符"""
+    first = buffer.peek()
+    if first == '\ufeff':
+        buffer.pos += 1
+        first = buffer.peek()
+    return first
+
+
+def _seek_field(buffer: _Buffer, decoder: json.JSONDecoder, targets: List[str]) -> Tuple[Optional[str], Set[str]]:
+    """
+    扫描顶层对象（调用前缓冲区位置位于 '{' 处），停在 targets 中第一个出现的数组字段的值处
+
+    Returns:
+        (找到的字段名或 None, 扫描过的数组字段名集合)
+    """
+    arrays = set()
+    buffer.expect('{')
+    if buffer.peek() == '}':
+        return None, arrays
+    while True:
+        key = buffer.decode(decoder)
+        buffer.expect(':')
+        if buffer.peek() == '[':
+            if key in targets:
+                return key, arrays
+            arrays.add(key)
+        buffer.skip(decoder)
+        char = buffer.peek()
+        buffer.pos += 1
+        if char == '}':
+            return None, arrays
+        if char != ',':
+            raise ValueError(f"JSON 格式错误：对象字段之间应为 ','，实际为 '{char}'")
+
+
+def _iter_array(buffer: _Buffer, decoder: json.JSONDecoder) -> Iterator[Any]:
+    """逐个产出数组元素（调用前缓冲区位置位于 '[' 处）"""
+    buffer.expect('[')
+    if buffer.peek() == ']':
+        buffer.pos += 1
+        return
+    while True:
+        yield buffer.decode(decoder)
+        char = buffer.peek()
+        buffer.pos += 1
+        if char == ']':
+            return
+        if char != ',':
+            raise ValueError(f"JSON 格式错误：数组元素之间应为 ','，实际为 '{char}'")
+
+
+def iter_json_array(fp, keys: Optional[Iterable[str]] = None, chunk_size: int = 64 * 1024) -> Iterator[Any]:
+    """
+    增量读取 JSON 文件中的数据数组
+
+    Args:
+        fp: 以文本模式打开的文件对象
+        keys: 顶层为对象时查找的数组字段名，按优先级排列
+        chunk_size: 每次读取的字符数
+
+    顶层对象中，优先级最高的字段在扫描时直接流式产出；只有较低优先级的字段时，
+    扫描完整个对象后回到文件开头（fp 需支持 seek）再读取其中优先级最高的一个。跳过的字段不构造对象
+
+    Yields:
+        数组中的每个元素；顶层对象中没有匹配的数组字段时不产出任何内容
+    """
+    decoder = json.JSONDecoder()
+    buffer = _Buffer(fp, chunk_size)
+    first = _start(buffer)
+    if first == '[':
+        yield from _iter_array(buffer, decoder)
+        return
+    if first != '{':
+        return
+
+    wanted = list(keys or [])
+    key, arrays = _seek_field(buffer, decoder, wanted[:1])
+    if key is None:
+        fallback = [name for name in wanted[1:] if name in arrays][:1]
+        if not fallback:
+            return
+        fp.seek(0)
+        buffer = _Buffer(fp, chunk_size)
+        _start(buffer)
+        key, _ = _seek_field(buffer, decoder, fallback)
+    yield from _iter_array(buffer, decoder)
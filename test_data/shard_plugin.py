@@ -0,0 +1,53 @@
+"""
+测试数据分片 pytest 插件（pytest.ini 中通过 -p test_data.shard_plugin 加载）
+
+    pytest test_cases/ -n 8 --data-shard range   # 按连续行区间分片
+    pytest test_cases/ -n 8 --data-shard hash    # 按行号稳定哈希分片
+
+启用分片时自动把 xdist 的 load 调度切换为 loadgroup，使同一分片的行在同一个 worker 上运行
+"""
+import pytest
+from test_data.data_shards import LazyRow
+from test_data.test_data_config import TestDataConfig
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        '--data-shard',
+        action='store',
+        default=None,
+        choices=('off', 'range', 'hash'),
+        help='并行运行时按 行区间(range) / 稳定哈希(hash) 把数据驱动用例的数据行分片到各 worker，'
+             '默认读取环境变量 TEST_DATA_SHARD'
+    )
+
+
+def pytest_configure(config):
+    mode = config.getoption('--data-shard')
+    if mode:
+        TestDataConfig.SHARD_MODE = mode
+    if TestDataConfig.SHARD_MODE != 'off':
+        use_loadgroup(config)
+
+
+def use_loadgroup(config):
+    """
+    切换为 xdist loadgroup 调度
+    
+    主控进程把 load 改为 loadgroup；worker 进程会重新解析命令行（dist 已被 xdist 置为 no），
+    需要直接打开 loadgroup 开关，xdist 才会按 xdist_group 给节点 ID 追加分组后缀
+    """
+    if hasattr(config, 'workerinput'):
+        config.option.loadgroup = True
+    elif getattr(config.option, 'dist', 'no') == 'load':
+        config.option.dist = 'loadgroup'
+
+
+def pytest_runtest_setup(item):
+    """分片读取时无法预先过滤 Excel 空行，运行到空行时跳过"""
+    callspec = getattr(item, 'callspec', None)
+    if callspec is None:
+        return
+    for value in callspec.params.values():
+        if isinstance(value, LazyRow) and value.resolve() is None:
+            pytest.skip(f"空数据行: {value!r}")
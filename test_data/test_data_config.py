@@ -31,10 +31,13 @@
     就这么简单！无需任何配置！
 """
 import os
-import json
 import csv
+import json
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, Iterator, List, Any, Optional, Tuple
+from test_data.data_registry import DataRegistry
+from test_data.data_shards import LazyRow, ShardedDataset
+from test_data.json_stream import iter_json_array
 
 
 class TestDataConfig:
@@ -61,6 +64,41 @@ class TestDataConfig:
     # 项目根目录
     PROJECT_ROOT = Path(__file__).parent.parent
     
+    # 数据文件目录：test_data/test_type/
+    DATA_DIR = PROJECT_ROOT / 'test_data' / 'test_type'
+    
+    # 解析结果磁盘缓存目录（多个 xdist worker 共享），TEST_DATA_DISK_CACHE=False 时只使用内存缓存
+    CACHE_DIR = PROJECT_ROOT / 'reports' / '.datacache'
+    DISK_CACHE = os.getenv('TEST_DATA_DISK_CACHE', 'True').lower() == 'true'
+    
+    # 并行分片：off 关闭 / range 按连续行区间 / hash 按行号稳定哈希（pytest --data-shard 选项会覆盖）
+    SHARD_MODE = os.getenv('TEST_DATA_SHARD', 'off')
+    # 分片数量，0 表示等于 xdist worker 数量
+    SHARD_COUNT = int(os.getenv('TEST_DATA_SHARDS', '0'))
+    
+    # 超过该大小（字节）的 JSON 文件增量解析，较小的文件直接 json.load（更快）
+    JSON_STREAM_THRESHOLD = int(os.getenv('TEST_DATA_JSON_STREAM_MB', '8')) * 1024 * 1024
+    
+    _registry = None
+    _sharded = {}
+    
+    @classmethod
+    def get_registry(cls) -> DataRegistry:
+        """获取数据注册表（DATA_DIR 变化时重建）"""
+        if cls._registry is None or cls._registry.base_path != cls.DATA_DIR:
+            cls._registry = DataRegistry(cls.DATA_DIR, cls.CACHE_DIR if cls.DISK_CACHE else None)
+        return cls._registry
+    
+    @classmethod
+    def invalidate_cache(cls, disk: bool = True):
+        """
+        显式失效测试数据缓存（数据文件被外部工具修改、或需要强制重新解析时调用）
+        
+        Args:
+            disk: 是否同时删除磁盘缓存
+        """
+        cls.get_registry().invalidate(disk)
+    
     @classmethod
     def load_test_data(cls, module_name: str, data_format: str = 'auto') -> List[Dict[str, Any]]:
         """
@@ -90,117 +128,155 @@ class TestDataConfig:
             # test_data/test_type/home_test_data.csv
             get_test_data('home')
         """
-        # 基础路径：test_data/test_type/
-        base_path = cls.PROJECT_ROOT / 'test_data' / 'test_type'
-        
-        # 确定要使用的数据格式
-        if data_format == 'auto':
-            # 按优先级自动查找文件：csv > json > xlsx
-            for fmt in ['csv', 'json', 'xlsx']:
-                file_path = base_path / f'{module_name}_test_data.{fmt}'
-                if file_path.exists():
-                    data_format = fmt
-                    data_file = file_path
-                    break
-                else:
-                    # 递归查找（兼容示例子目录等）
-                    matches = list(base_path.rglob(f'{module_name}_test_data.{fmt}'))
-                    if matches:
-                        data_format = fmt
-                        data_file = matches[0]
-                        break
-            else:
-                # 未找到任何格式的文件
-                raise FileNotFoundError(
-                    f"未找到模块 '{module_name}' 的测试数据文件\n"
-                    f"请在以下位置创建数据文件：\n"
-                    f"  - {base_path / f'{module_name}_test_data.csv'}\n"
-                    f"  - {base_path / f'{module_name}_test_data.json'}\n"
-                    f"  - {base_path / f'{module_name}_test_data.xlsx'}"
-                )
-        else:
-            # 使用指定格式
-            data_file = base_path / f'{module_name}_test_data.{data_format}'
-            if not data_file.exists():
-                # 递归查找（兼容示例子目录等）
-                matches = list(base_path.rglob(f'{module_name}_test_data.{data_format}'))
-                if matches:
-                    data_file = matches[0]
-                else:
-                    raise FileNotFoundError(
-                        f"找不到测试数据文件: {data_file}\n"
-                        f"请创建文件或使用 data_format='auto' 自动查找"
-                    )
-        
-        # 根据文件格式加载数据
+        # 通过注册表查找数据文件（单次目录扫描建立索引）
+        registry = cls.get_registry()
+        data_format, data_file = registry.find(module_name, data_format)
+        
+        # 根据文件格式加载数据（命中缓存时不再解析）
+        return registry.load(data_file, lambda: cls._parse_file(data_file, data_format))
+    
+    @classmethod
+    def shard_count(cls) -> int:
+        """实际分片数量：关闭分片或非并行运行时为 1"""
+        if cls.SHARD_MODE == 'off':
+            return 1
+        return cls.SHARD_COUNT or int(os.getenv('PYTEST_XDIST_WORKER_COUNT', '1'))
+    
+    @classmethod
+    def load_sharded_test_data(cls, module_name: str, data_format: str = 'auto') -> List[Tuple[Optional[str], Any]]:
+        """
+        按分片加载测试数据：只建立行索引，返回 (分组名, LazyRow) 列表，用例运行时才读取所在分片
+        
+        未启用分片时返回 (None, 行数据)，与 load_test_data 结果一致
+        
+        Args:
+            module_name: 模块名称
+            data_format: 数据格式 ('csv', 'json', 'xlsx', 'auto')
+            
+        Returns:
+            [(xdist 分组名, 行数据), ...]
+        """
+        shards = cls.shard_count()
+        if shards <= 1:
+            return [(None, row) for row in cls.load_test_data(module_name, data_format)]
+        
+        data_format, data_file = cls.get_registry().find(module_name, data_format)
+        key = (data_file, data_format, shards, cls.SHARD_MODE)
+        dataset = cls._sharded.get(key)
+        if dataset is None:
+            dataset = cls._sharded[key] = ShardedDataset(
+                data_file, data_format, shards, cls.SHARD_MODE,
+                loader=lambda: cls.load_test_data(module_name, data_format)
+            )
+        return [(dataset.group_name(i), LazyRow(dataset, i)) for i in range(dataset.count())]
+    
+    @classmethod
+    def iter_test_data(cls, module_name: str, data_format: str = 'auto') -> Iterator[Dict[str, Any]]:
+        """
+        流式读取指定模块的测试数据（逐行产出，不缓存、不在内存中保留整个文件）
+        
+        适用于数十万行的账号、边界值数据集；查找规则与 load_test_data 相同
+        
+        Args:
+            module_name: 模块名称
+            data_format: 数据格式 ('csv', 'json', 'xlsx', 'auto')
+            
+        Yields:
+            每行测试数据
+        
+        示例：
+            for row in TestDataConfig.iter_test_data('login', 'csv'):
+                check(row['username'])
+        """
+        data_format, data_file = cls.get_registry().find(module_name, data_format)
+        return cls._iter_file(data_file, data_format)
+    
+    @classmethod
+    def _iter_file(cls, data_file: Path, data_format: str) -> Iterator[Dict[str, Any]]:
+        """按格式流式解析数据文件"""
         if data_format == 'csv':
-            return cls._load_csv_data(data_file)
+            return cls._iter_csv_data(data_file)
         elif data_format == 'json':
-            return cls._load_json_data(data_file)
+            return cls._iter_json_data(data_file)
         elif data_format == 'xlsx':
-            return cls._load_excel_data(data_file)
+            return cls._iter_excel_data(data_file)
         else:
             raise ValueError(f"不支持的数据格式: {data_format}，支持：csv, json, xlsx")
     
     @classmethod
-    def _load_csv_data(cls, file_path: Path) -> List[Dict[str, Any]]:
-        """加载CSV格式的测试数据（支持 # 开头的注释行）"""
-        data = []
-        with open(file_path, 'r', encoding='utf-8') as file:
+    def _parse_file(cls, data_file: Path, data_format: str) -> List[Dict[str, Any]]:
+        """按格式解析数据文件"""
+        return list(cls._iter_file(data_file, data_format))
+    
+    @classmethod
+    def _iter_csv_data(cls, file_path: Path) -> Iterator[Dict[str, Any]]:
+        """逐行读取CSV格式的测试数据（支持 # 开头的注释行）"""
+        with open(file_path, 'r', encoding='utf-8', newline='') as file:
             # 过滤掉以 # 开头的注释行和空行
-            lines = [line for line in file if line.strip() and not line.strip().startswith('#')]
-            reader = csv.DictReader(lines)
-            for row in reader:
-                # 处理空值：将空字符串转换为None（可选）或保持原样
+            lines = (line for line in file if line.strip() and not line.strip().startswith('#'))
+            for row in csv.DictReader(lines):
                 # 过滤掉所有字段都为空的行
-                row_dict = dict(row)
-                if any(value.strip() if isinstance(value, str) else value for value in row_dict.values()):
-                    data.append(row_dict)
-        return data
+                if any(value.strip() if isinstance(value, str) else value for value in row.values()):
+                    yield row
     
     @classmethod
-    def _load_json_data(cls, file_path: Path) -> List[Dict[str, Any]]:
-        """加载JSON格式的测试数据"""
+    def _iter_json_data(cls, file_path: Path) -> Iterator[Dict[str, Any]]:
+        """
+        读取JSON格式的测试数据（超过 JSON_STREAM_THRESHOLD 的文件增量解析）
+        
+        依次尝试：{module}_test_data 字段、与文件名相同的字段、顶层数组；都不匹配时不产出数据
+        """
+        key_name = f"{file_path.stem.replace('_test_data', '')}_test_data"
         with open(file_path, 'r', encoding='utf-8') as file:
+            if file_path.stat().st_size > cls.JSON_STREAM_THRESHOLD:
+                yield from iter_json_array(file, keys=[key_name, file_path.stem])
+                return
             content = json.load(file)
-            # 尝试多种可能的键名
-            # 1. {module}_test_data (如: login_test_data)
-            key_name = f"{file_path.stem.replace('_test_data', '')}_test_data"
-            if key_name in content:
-                return content[key_name]
-            # 2. 直接使用文件名作为键（如果文件名就是 login_test_data.json）
-            if file_path.stem in content:
-                return content[file_path.stem]
-            # 3. 如果内容直接是数组，直接返回
-            if isinstance(content, list):
-                return content
-            # 4. 如果以上都不匹配，返回空列表
-            return []
+        if isinstance(content, list):
+            yield from content
+        elif isinstance(content, dict):
+            for key in (key_name, file_path.stem):
+                if key in content:
+                    yield from content[key]
+                    return
     
     @classmethod
-    def _load_excel_data(cls, file_path: Path) -> List[Dict[str, Any]]:
-        """加载Excel格式的测试数据"""
+    def _iter_excel_data(cls, file_path: Path) -> Iterator[Dict[str, Any]]:
+        """逐行读取Excel格式的测试数据（openpyxl 只读模式 iter_rows）"""
         try:
             from utils.excel_reader import ExcelReader
-            reader = ExcelReader(str(file_path))
-            # 假设Excel的第一个工作表包含测试数据
-            sheet_name = reader.sheet_names[0] if reader.sheet_names else None
-            if not sheet_name:
-                reader.close()
-                return []
-            data = reader.get_sheet_data(sheet_name)
-            reader.close()
-            # 过滤掉所有字段都为空的行
-            filtered_data = []
-            for row in data:
-                if any(value for value in row.values() if value is not None and str(value).strip()):
-                    filtered_data.append(row)
-            return filtered_data
         except ImportError:
             # 如果无法导入ExcelReader，抛出异常
             raise ImportError("Could not import ExcelReader, please check if openpyxl is installed")
+        
+        reader = ExcelReader(str(file_path))
+        try:
+            # 假设Excel的第一个工作表包含测试数据
+            if not reader.sheet_names:
+                return
+            for row in reader.iter_sheet_rows(reader.sheet_names[0]):
+                # 过滤掉所有字段都为空的行
+                if any(value for value in row.values() if value is not None and str(value).strip()):
+                    yield row
         except Exception as e:
             raise Exception(f"加载Excel文件失败: {e}")
+        finally:
+            reader.close()
+    
+    @classmethod
+    def _load_csv_data(cls, file_path: Path) -> List[Dict[str, Any]]:
+        """加载CSV格式的测试数据（支持 # 开头的注释行）"""
+        return list(cls._iter_csv_data(file_path))
+    
+    @classmethod
+    def _load_json_data(cls, file_path: Path) -> List[Dict[str, Any]]:
+        """加载JSON格式的测试数据"""
+        return list(cls._iter_json_data(file_path))
+    
+    @classmethod
+    def _load_excel_data(cls, file_path: Path) -> List[Dict[str, Any]]:
+        """加载Excel格式的测试数据"""
+        return list(cls._iter_excel_data(file_path))
     
     @classmethod
     def _get_default_data(cls, module_name: str) -> List[Dict[str, Any]]:
@@ -224,6 +300,44 @@ def get_test_data(module_name: str, data_format: str = 'auto') -> List[Dict[str,
     return TestDataConfig.load_test_data(module_name, data_format)
 
 
+def iter_test_data(module_name: str, data_format: str = 'auto') -> Iterator[Dict[str, Any]]:
+    """
+    便捷函数：流式读取指定模块的测试数据（大数据集使用，逐行产出）
+    
+    Args:
+        module_name: 模块名称
+        data_format: 数据格式 ('csv', 'json', 'xlsx', 'auto')
+        
+    Yields:
+        每行测试数据
+    """
+    return TestDataConfig.iter_test_data(module_name, data_format)
+
+
+def get_sharded_test_data(module_name: str, data_format: str = 'auto') -> list:
+    """
+    便捷函数：获取用于 parametrize 的分片测试数据
+    
+    启用分片（--data-shard range/hash）并行运行时，每行带 xdist_group 标记，同一分片的行在同一个 worker 上运行，
+    worker 只解析自己运行的分片；未启用时与 get_test_data 相同
+    
+    Args:
+        module_name: 模块名称
+        data_format: 数据格式 ('csv', 'json', 'xlsx', 'auto')
+        
+    Returns:
+        pytest.param 列表
+    
+    示例：
+        @pytest.mark.parametrize("test_case", get_sharded_test_data('login', 'csv'))
+    """
+    import pytest
+    return [
+        pytest.param(row, marks=[pytest.mark.xdist_group(group)] if group else [])
+        for group, row in TestDataConfig.load_sharded_test_data(module_name, data_format)
+    ]
+
+
 # 预加载常用测试数据（可选）
 # 注意：如果数据文件不存在，这行代码会导致模块加载失败
 # 建议在测试中按需加载，而不是在模块级别预加载
@@ -1,12 +1,39 @@
-from .logger import Logger
-from .driver_factory import DriverFactory
-from .screenshot import Screenshot
-from .excel_reader import ExcelReader, read_excel_data
+"""
+工具包
+
+按需加载：访问 utils.DriverFactory 等属性时才导入对应模块，
+只用到数据读取、耗时记录等轻量模块时不会连带导入 selenium / openpyxl
+"""
+import importlib
+
+# 导出名称 -> 所在模块
+_EXPORTS = {
+    'Logger': '.logger',
+    'DriverFactory': '.driver_factory',
+    'DriverPool': '.driver_pool',
+    'Screenshot': '.screenshot',
+    'ExcelReader': '.excel_reader',
+    'read_excel_data': '.excel_reader',
+}
 
 __all__ = [
     'Logger',
     'DriverFactory',
+    'DriverPool',
     'Screenshot',
     'ExcelReader',
     'read_excel_data'
 ]
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value  # 缓存，之后的访问不再经过 __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
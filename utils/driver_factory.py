@@ -2,18 +2,22 @@
 浏览器驱动工厂模块
 负责创建和配置不同浏览器的 WebDriver 实例
 """
-import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from selenium import webdriver
+from selenium.common.exceptions import SessionNotCreatedException
 from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.firefox.service import Service as FirefoxService
 from selenium.webdriver.edge.service import Service as EdgeService
 from selenium.webdriver.chrome.options import Options as ChromeOptions
 from selenium.webdriver.firefox.options import Options as FirefoxOptions
 from selenium.webdriver.edge.options import Options as EdgeOptions
-from webdriver_manager.chrome import ChromeDriverManager
-from webdriver_manager.firefox import GeckoDriverManager
-from webdriver_manager.microsoft import EdgeChromiumDriverManager
 from config.config import Config
+from utils.driver_resolver import DriverResolver
+from utils.file_lock import SlotLock
+from utils.instrumentation import Instrumentation
 from utils.logger import Logger
 
 
@@ -22,6 +26,66 @@ class DriverFactory:
     
     logger = Logger().get_logger()
     
+    SUPPORTED_BROWSERS = ('chrome', 'firefox', 'edge')
+    
+    # 后台预热状态：浏览器名称 -> 预热任务队列（按提交顺序取用）
+    _prewarm_executor = None
+    _prewarm_futures = {}
+    _prewarm_lock = threading.Lock()
+    
+    @classmethod
+    def _is_fast_profile(cls) -> bool:
+        """是否启用精简的性能配置档（Config.BROWSER_PROFILE=fast）"""
+        return Config.BROWSER_PROFILE.lower() == 'fast'
+    
+    @classmethod
+    def _window_size(cls):
+        """性能配置档使用的固定窗口尺寸 (宽, 高)"""
+        width, height = Config.FAST_WINDOW_SIZE.split(',')
+        return int(width), int(height)
+    
+    @classmethod
+    def _apply_chromium_fast_profile(cls, options, extra_disabled_features=()):
+        """
+        Chrome / Edge 共用的性能配置档：
+        屏蔽图片、关闭后台联网/组件更新/翻译/同步/平滑滚动、固定小窗口、eager 加载
+        
+        Args:
+            options: ChromeOptions / EdgeOptions
+            extra_disabled_features: 额外禁用的浏览器特性（--disable-features 只能出现一次）
+        """
+        width, height = cls._window_size()
+        disabled_features = ['Translate', 'OptimizationHints', 'MediaRouter', *extra_disabled_features]
+        for arg in [
+            '--disable-background-networking',
+            '--disable-component-update',
+            '--disable-sync',
+            '--disable-default-apps',
+            f"--disable-features={','.join(disabled_features)}",
+            '--disable-smooth-scrolling',
+            '--blink-settings=imagesEnabled=false',
+            '--mute-audio',
+            f'--window-size={width},{height}'
+        ]:
+            options.add_argument(arg)
+        
+        options.add_experimental_option('prefs', {
+            'profile.managed_default_content_settings.images': 2,
+            'translate': {'enabled': False},
+        })
+        options.page_load_strategy = 'eager'
+    
+    @classmethod
+    def _block_heavy_resources(cls, driver):
+        """通过 CDP 屏蔽字体、媒体等资源请求（仅 Chromium 内核、性能配置档生效）"""
+        if not cls._is_fast_profile() or not hasattr(driver, 'execute_cdp_cmd'):
+            return
+        try:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': Config.FAST_BLOCKED_URLS})
+        except Exception as e:
+            cls.logger.warning("设置资源屏蔽失败: %s", e)
+    
     @classmethod
     def _get_chrome_options(cls) -> ChromeOptions:
         """获取 Chrome 浏览器配置"""
@@ -36,11 +100,15 @@ class DriverFactory:
             '--disable-dev-shm-usage',
             '--disable-gpu',
             '--disable-notifications',
-            '--start-maximized',
             '--disable-extensions'
         ]:
             options.add_argument(arg)
         
+        if cls._is_fast_profile():
+            cls._apply_chromium_fast_profile(options)
+        else:
+            options.add_argument('--start-maximized')
+        
         # 禁用自动化提示和日志
         options.add_experimental_option('excludeSwitches', ['enable-automation', 'enable-logging'])
         options.add_experimental_option('useAutomationExtension', False)
@@ -53,6 +121,25 @@ class DriverFactory:
         options = FirefoxOptions()
         if Config.HEADLESS:
             options.add_argument('--headless')
+        
+        if cls._is_fast_profile():
+            width, height = cls._window_size()
+            options.add_argument(f'--width={width}')
+            options.add_argument(f'--height={height}')
+            for name, value in {
+                'permissions.default.image': 2,             # 屏蔽图片
+                'gfx.downloadable_fonts.enabled': False,    # 屏蔽网络字体
+                'media.autoplay.default': 5,                # 禁止媒体自动播放
+                'media.hardware-video-decoding.enabled': False,
+                'general.smoothScroll': False,
+                'app.update.auto': False,
+                'browser.translations.enable': False,
+                'identity.fxaccounts.enabled': False,       # 关闭同步
+                'network.prefetch-next': False,
+                'datareporting.policy.dataSubmissionEnabled': False,
+            }.items():
+                options.set_preference(name, value)
+            options.page_load_strategy = 'eager'
         return options
     
     @classmethod
@@ -62,36 +149,36 @@ class DriverFactory:
         if Config.HEADLESS:
             options.add_argument('--headless')
         
-        for arg in ['--no-sandbox', '--disable-dev-shm-usage', '--start-maximized']:
+        for arg in ['--no-sandbox', '--disable-dev-shm-usage']:
             options.add_argument(arg)
         
+        if cls._is_fast_profile():
+            # 额外关闭 Edge 特有的后台服务
+            cls._apply_chromium_fast_profile(
+                options, extra_disabled_features=('msEdgeShopping', 'msEdgeCollections', 'EdgeTranslate')
+            )
+        else:
+            options.add_argument('--start-maximized')
+        
         return options
     
     @classmethod
     def get_chrome_driver(cls):
         """创建 Chrome 浏览器驱动"""
         try:
-            driver_path = ChromeDriverManager().install()
-            # 确保路径指向 chromedriver.exe
-            if not driver_path.endswith('chromedriver.exe'):
-                driver_dir = os.path.dirname(driver_path)
-                for file in os.listdir(driver_dir):
-                    if file == 'chromedriver.exe':
-                        driver_path = os.path.join(driver_dir, file)
-                        break
-            
-            service = ChromeService(driver_path)
+            service = ChromeService(DriverResolver.resolve('chrome'))
             driver = webdriver.Chrome(service=service, options=cls._get_chrome_options())
+            cls._block_heavy_resources(driver)
             cls.logger.info("Chrome 浏览器启动成功")
             return driver
         except Exception as e:
-            cls.logger.error(f"Chrome 驱动初始化失败: {e}")
+            cls.logger.error("Chrome 驱动初始化失败: %s", e)
             raise
     
     @classmethod
     def get_firefox_driver(cls):
         """创建 Firefox 浏览器驱动"""
-        service = FirefoxService(GeckoDriverManager().install())
+        service = FirefoxService(DriverResolver.resolve('firefox'))
         driver = webdriver.Firefox(service=service, options=cls._get_firefox_options())
         cls.logger.info("Firefox 浏览器启动成功")
         return driver
@@ -99,37 +186,145 @@ class DriverFactory:
     @classmethod
     def get_edge_driver(cls):
         """创建 Edge 浏览器驱动"""
-        service = EdgeService(EdgeChromiumDriverManager().install())
+        service = EdgeService(DriverResolver.resolve('edge'))
         driver = webdriver.Edge(service=service, options=cls._get_edge_options())
+        cls._block_heavy_resources(driver)
         cls.logger.info("Edge 浏览器启动成功")
         return driver
     
     @classmethod
-    def get_driver(cls, browser_name=None):
+    def _create_driver(cls, browser):
         """
-        根据浏览器名称获取对应的驱动
-        
+        同步创建浏览器驱动并设置超时
+
         Args:
-            browser_name: 浏览器名称 (chrome/firefox/edge)
-        
+            browser: 浏览器名称 (chrome/firefox/edge)
+
         Returns:
             WebDriver 实例
         """
-        browser = (browser_name or Config.BROWSER).lower()
-        
         drivers = {
             'chrome': cls.get_chrome_driver,
             'firefox': cls.get_firefox_driver,
             'edge': cls.get_edge_driver
         }
         
-        if browser not in drivers:
-            raise ValueError(f"不支持的浏览器类型: {browser}")
+        def launch():
+            try:
+                return drivers[browser]()
+            except SessionNotCreatedException as e:
+                # 驱动清单有效期内浏览器升级，旧驱动与浏览器版本不匹配：清除清单重新解析驱动，重试一次
+                cls.logger.warning("%s 会话创建失败，清除驱动缓存后重试: %s", browser, e)
+                DriverResolver.clear_cache(manifest=True)
+                return drivers[browser]()
         
-        driver = drivers[browser]()
+        start = time.perf_counter()
+        if Config.BROWSER_LAUNCH_SLOTS > 0:
+            # 跨进程启动闸门：矩阵运行时避免多个进程同时启动 CPU 密集的浏览器
+            with SlotLock(Config.REPORTS_DIR / '.launch', slots=Config.BROWSER_LAUNCH_SLOTS):
+                driver = launch()
+        else:
+            driver = launch()
         
         # 设置超时
         driver.implicitly_wait(Config.IMPLICIT_WAIT)
         driver.set_page_load_timeout(Config.PAGE_LOAD_TIMEOUT)
         
+        if Instrumentation.enabled:
+            Instrumentation.record(f'startup:{browser}', None, 'startup', start, time.perf_counter() - start)
         return driver
+    
+    @classmethod
+    def prewarm(cls, count=1, browser_name=None):
+        """
+        在后台线程中预先启动浏览器，供后续 get_driver 直接取用
+        
+        预热中的会话总数不超过 Config.DRIVER_PREWARM_DEPTH，为 0 时不预热
+        
+        Args:
+            count: 期望新增的预热会话数量
+            browser_name: 浏览器名称 (chrome/firefox/edge)
+        
+        Returns:
+            实际新增的预热会话数量
+        """
+        depth = Config.DRIVER_PREWARM_DEPTH
+        if depth <= 0:
+            return 0
+        browser = (browser_name or Config.BROWSER).lower()
+        if browser not in cls.SUPPORTED_BROWSERS:
+            raise ValueError(f"不支持的浏览器类型: {browser}")
+        
+        with cls._prewarm_lock:
+            if cls._prewarm_executor is None:
+                cls._prewarm_executor = ThreadPoolExecutor(
+                    max_workers=depth, thread_name_prefix='driver-prewarm'
+                )
+            queued = cls._prewarm_futures.setdefault(browser, deque())
+            started = 0
+            while started < count and sum(len(q) for q in cls._prewarm_futures.values()) < depth:
+                queued.append(cls._prewarm_executor.submit(cls._create_driver, browser))
+                started += 1
+        if started:
+            cls.logger.info("后台预热 %s 个 %s 浏览器", started, browser)
+        return started
+    
+    @classmethod
+    def _take_prewarmed(cls, browser):
+        """取出最早提交的预热任务，没有时返回 None"""
+        with cls._prewarm_lock:
+            queued = cls._prewarm_futures.get(browser)
+            return queued.popleft() if queued else None
+    
+    @classmethod
+    def shutdown_prewarm(cls):
+        """会话结束时清理：取消未启动的预热任务，退出已启动但未被使用的浏览器"""
+        with cls._prewarm_lock:
+            futures = [f for q in cls._prewarm_futures.values() for f in q]
+            cls._prewarm_futures.clear()
+            executor, cls._prewarm_executor = cls._prewarm_executor, None
+        
+        unused = 0
+        for future in futures:
+            if future.cancel():
+                continue
+            try:
+                future.result().quit()
+                unused += 1
+            except Exception:
+                pass
+        if executor is not None:
+            executor.shutdown(wait=True)
+        if futures:
+            cls.logger.info("已清理预热浏览器，退出未使用的会话 %s 个", unused)
+    
+    @classmethod
+    def get_driver(cls, browser_name=None, prewarm_next=False):
+        """
+        根据浏览器名称获取对应的驱动
+        
+        有预热好的会话时直接取用，否则同步启动浏览器
+        
+        Args:
+            browser_name: 浏览器名称 (chrome/firefox/edge)
+            prewarm_next: 取走会话后是否立即在后台预热下一个
+        
+        Returns:
+            WebDriver 实例
+        """
+        browser = (browser_name or Config.BROWSER).lower()
+        
+        if browser not in cls.SUPPORTED_BROWSERS:
+            raise ValueError(f"不支持的浏览器类型: {browser}")
+        
+        future = cls._take_prewarmed(browser)
+        if prewarm_next:
+            cls.prewarm(1, browser)
+        
+        if future is not None:
+            try:
+                return future.result()
+            except Exception as e:
+                cls.logger.warning("预热浏览器启动失败，改为同步启动: %s", e)
+        
+        return cls._create_driver(browser)
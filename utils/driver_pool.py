@@ -0,0 +1,232 @@
+"""
+浏览器驱动池模块
+在同一个 worker 进程内复用已启动的 WebDriver 实例，避免每个用例都冷启动浏览器
+"""
+import queue
+import threading
+from urllib.parse import urlsplit
+from selenium.common.exceptions import WebDriverException
+from config.config import Config
+from utils.driver_factory import DriverFactory
+from utils.logger import Logger
+
+# 清空当前源的 localStorage / sessionStorage（about:blank 等页面无权限访问，忽略）
+CLEAR_STORAGE_JS = (
+    "try { window.localStorage.clear(); } catch (e) {}"
+    "try { window.sessionStorage.clear(); } catch (e) {}"
+)
+
+
+def _origin(url):
+    """http(s) 地址的源，其他地址（about:blank、data: 等）返回 None"""
+    parts = urlsplit(url or '')
+    return f'{parts.scheme}://{parts.netloc}' if parts.scheme in ('http', 'https') and parts.netloc else None
+
+
+class DriverPool:
+    """
+    浏览器驱动池
+
+    - 每个进程（xdist worker）最多保持 size 个热浏览器
+    - acquire() 借出前做健康检查，失效会话自动替换
+    - release() 归还时重置浏览器状态（Cookie、用例访问过的各个源的 Storage、多余窗口、about:blank）
+    """
+
+    logger = Logger().get_logger()
+
+    def __init__(self, size=None, browser_name=None):
+        """
+        初始化驱动池
+
+        Args:
+            size: 池大小，默认读取 Config.DRIVER_POOL_SIZE
+            browser_name: 浏览器名称，默认读取 Config.BROWSER
+        """
+        self.size = max(1, size or Config.DRIVER_POOL_SIZE)
+        self.browser_name = browser_name
+        self._idle = queue.LifoQueue()
+        self._drivers = []
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _create_driver(self):
+        """在池容量范围内创建新的浏览器实例"""
+        driver = DriverFactory.get_driver(self.browser_name)
+        with self._lock:
+            self._drivers.append(driver)
+        self.logger.info("驱动池新建浏览器 (%s/%s)", len(self._drivers), self.size)
+        return driver
+
+    def _reserve_slot(self):
+        """占用一个创建名额，池已满时返回 False"""
+        with self._lock:
+            if len(self._drivers) + self._pending < self.size:
+                self._pending += 1
+                return True
+            return False
+
+    def acquire(self, timeout=None):
+        """
+        借出一个可用的浏览器
+
+        Args:
+            timeout: 池已满时等待归还的超时时间（秒），默认 Config.PAGE_LOAD_TIMEOUT
+
+        Raises:
+            TimeoutError: 池已满且超时时间内没有浏览器归还
+
+        Returns:
+            WebDriver 实例
+        """
+        if self._closed:
+            raise RuntimeError("驱动池已关闭")
+
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                if self._reserve_slot():
+                    try:
+                        return self._create_driver()
+                    finally:
+                        with self._lock:
+                            self._pending -= 1
+                wait = timeout or Config.PAGE_LOAD_TIMEOUT
+                try:
+                    driver = self._idle.get(timeout=wait)
+                except queue.Empty:
+                    raise TimeoutError(
+                        f"驱动池已满（{self.size} 个浏览器均已借出），{wait}s 内没有浏览器归还；"
+                        f"请检查是否有用例未归还浏览器，或调大 Config.DRIVER_POOL_SIZE"
+                    ) from None
+
+            if self.is_healthy(driver):
+                return driver
+            self.logger.warning("检测到失效的浏览器会话，自动替换")
+            self._discard(driver)
+
+    def release(self, driver):
+        """
+        归还浏览器，重置失败或池已关闭时直接销毁
+
+        Args:
+            driver: WebDriver 实例
+        """
+        if self._closed:
+            self._discard(driver)
+            return
+        try:
+            self.reset(driver)
+        except WebDriverException as e:
+            self.logger.warning("浏览器重置失败，销毁该会话: %s", e)
+            self._discard(driver)
+            return
+        self._idle.put(driver)
+
+    @staticmethod
+    def is_healthy(driver):
+        """
+        健康检查：会话仍能响应命令即视为可用
+
+        Returns:
+            bool
+        """
+        try:
+            driver.window_handles
+            return True
+        except WebDriverException:
+            return False
+
+    @staticmethod
+    def reset(driver):
+        """
+        重置浏览器状态，使下一个用例拿到“干净”的会话
+
+        Args:
+            driver: WebDriver 实例
+        """
+        # 记录各窗口访问过的源，关闭多余窗口，回到第一个窗口
+        handles = driver.window_handles
+        origins = []
+        for handle in reversed(handles):
+            if len(handles) > 1:
+                driver.switch_to.window(handle)
+            for origin in DriverPool._visited_origins(driver):
+                if origin not in origins:
+                    origins.append(origin)
+            if handle != handles[0]:
+                driver.close()
+        if len(handles) > 1:
+            driver.switch_to.window(handles[0])
+
+        # 清空当前源的 Storage，再依次打开其他访问过的源（同源的 favicon.ico，不加载完整页面）清空
+        DriverPool._clear_storage(driver)
+        current = _origin(driver.current_url)
+        for origin in origins:
+            if origin != current:
+                try:
+                    driver.get(f'{origin}/favicon.ico')
+                except WebDriverException:
+                    continue
+                DriverPool._clear_storage(driver)
+
+        # Chromium 内核可通过 CDP 清除所有域名的 Cookie，其他浏览器只能清除当前域名
+        if hasattr(driver, 'execute_cdp_cmd'):
+            try:
+                driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+            except WebDriverException:
+                driver.delete_all_cookies()
+        else:
+            driver.delete_all_cookies()
+
+        driver.get('about:blank')
+
+    @staticmethod
+    def _visited_origins(driver):
+        """
+        当前窗口访问过的源
+
+        Chromium 内核通过 CDP 读取窗口的导航历史，其他浏览器无法读取历史，只取当前地址的源
+        """
+        urls = [driver.current_url]
+        if hasattr(driver, 'execute_cdp_cmd'):
+            try:
+                history = driver.execute_cdp_cmd('Page.getNavigationHistory', {})
+                urls += [entry['url'] for entry in history.get('entries', [])]
+            except WebDriverException:
+                pass
+        return [origin for origin in map(_origin, urls) if origin]
+
+    @staticmethod
+    def _clear_storage(driver):
+        try:
+            driver.execute_script(CLEAR_STORAGE_JS)
+        except WebDriverException:
+            pass
+
+    def _discard(self, driver):
+        """
+        销毁浏览器并释放池名额
+
+        不预热替补浏览器：归还（用例 teardown）和关闭（会话结束）时预热的浏览器多半用不上；
+        acquire() 发现失效会话时会在释放的名额中直接新建
+        """
+        with self._lock:
+            if driver in self._drivers:
+                self._drivers.remove(driver)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def close(self):
+        """关闭驱动池，退出所有浏览器"""
+        self._closed = True
+        with self._lock:
+            drivers = list(self._drivers)
+        while not self._idle.empty():
+            self._idle.get_nowait()
+        for driver in drivers:
+            self._discard(driver)
+        self.logger.info("驱动池已关闭，共退出 %s 个浏览器", len(drivers))
@@ -0,0 +1,216 @@
+"""
+浏览器驱动解析模块
+负责定位 chromedriver / geckodriver / msedgedriver 可执行文件，结果按进程缓存并写入磁盘清单，
+避免每次启动浏览器都调用 webdriver_manager 查询版本（且断网时可离线运行）
+"""
+import json
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+from config.config import Config
+from utils.file_lock import FileLock
+from utils.logger import Logger
+
+
+class DriverResolver:
+    """
+    浏览器驱动解析器
+
+    查找顺序：
+        1. 环境变量显式指定（CHROMEDRIVER_PATH / GECKODRIVER_PATH / EDGEDRIVER_PATH）
+        2. drivers/ 目录下的驱动文件
+        3. 磁盘清单 drivers/driver_manifest.json（上一次下载的结果）
+        4. 系统 PATH
+        5. webdriver_manager 下载（DRIVER_OFFLINE=True 时跳过），并写入磁盘清单
+        6. 都找不到时返回 None，由 Selenium Manager 兜底
+    """
+
+    logger = Logger().get_logger()
+
+    # 浏览器 -> (驱动文件名, 环境变量名)
+    BINARIES = {
+        'chrome': ('chromedriver', 'CHROMEDRIVER_PATH'),
+        'firefox': ('geckodriver', 'GECKODRIVER_PATH'),
+        'edge': ('msedgedriver', 'EDGEDRIVER_PATH'),
+    }
+
+    MANIFEST_FILE = Config.DRIVERS_DIR / 'driver_manifest.json'
+    MANIFEST_LOCK = Config.DRIVERS_DIR / 'driver_manifest.lock'
+
+    _cache = {}
+    _cache_lock = threading.Lock()
+
+    @classmethod
+    def resolve(cls, browser: str) -> Optional[str]:
+        """
+        解析指定浏览器的驱动路径（同一进程内只解析一次）
+
+        Args:
+            browser: 浏览器名称 (chrome/firefox/edge)
+
+        Returns:
+            驱动可执行文件路径，找不到时返回 None
+        """
+        browser = browser.lower()
+        if browser not in cls.BINARIES:
+            raise ValueError(f"不支持的浏览器类型: {browser}")
+
+        with cls._cache_lock:
+            if browser in cls._cache:
+                return cls._cache[browser]
+
+            path = (
+                cls._from_env(browser)
+                or cls._from_drivers_dir(browser)
+                or cls._from_manifest_or_download(browser)
+            )
+            if path:
+                cls.logger.info("%s 驱动路径: %s", browser, path)
+            else:
+                cls.logger.warning("未找到 %s 驱动，交由 Selenium Manager 处理", browser)
+            cls._cache[browser] = path
+            return path
+
+    @classmethod
+    def resolve_local(cls, browser: str) -> Optional[str]:
+        """
+        只查找本地已有的驱动：环境变量、drivers/ 目录、磁盘清单（不检查有效期）、系统 PATH；
+        不查询版本、不下载，也不写入进程内缓存
+
+        Args:
+            browser: 浏览器名称 (chrome/firefox/edge)
+
+        Returns:
+            驱动可执行文件路径，找不到时返回 None（由 Selenium Manager 兜底）
+        """
+        browser = browser.lower()
+        if browser not in cls.BINARIES:
+            raise ValueError(f"不支持的浏览器类型: {browser}")
+        entry = cls._read_manifest().get(browser) or {}
+        return (
+            cls._from_env(browser)
+            or cls._from_drivers_dir(browser)
+            or (entry['path'] if cls._is_executable(entry.get('path')) else None)
+            or shutil.which(cls.BINARIES[browser][0])
+        )
+
+    @classmethod
+    def clear_cache(cls, manifest: bool = False):
+        """
+        清空进程内缓存
+
+        浏览器升级后清单中未过期的旧驱动无法创建会话，DriverFactory 会调用 clear_cache(manifest=True) 后重新解析
+
+        Args:
+            manifest: 是否同时删除磁盘清单
+        """
+        with cls._cache_lock:
+            cls._cache.clear()
+        if manifest:
+            with FileLock(cls.MANIFEST_LOCK):
+                if cls.MANIFEST_FILE.exists():
+                    cls.MANIFEST_FILE.unlink()
+
+    @classmethod
+    def _binary_name(cls, browser: str) -> str:
+        """当前平台下的驱动文件名"""
+        name = cls.BINARIES[browser][0]
+        return f'{name}.exe' if os.name == 'nt' else name
+
+    @staticmethod
+    def _is_executable(path) -> bool:
+        return bool(path) and os.path.isfile(path) and os.access(path, os.X_OK)
+
+    @classmethod
+    def _from_env(cls, browser: str) -> Optional[str]:
+        """从环境变量读取显式指定的驱动路径"""
+        env_name = cls.BINARIES[browser][1]
+        path = os.getenv(env_name)
+        if not path:
+            return None
+        if not cls._is_executable(path):
+            raise FileNotFoundError(f"环境变量 {env_name} 指定的驱动不存在或不可执行: {path}")
+        return path
+
+    @classmethod
+    def _from_drivers_dir(cls, browser: str) -> Optional[str]:
+        """从 drivers/ 目录查找驱动"""
+        path = Config.DRIVERS_DIR / cls._binary_name(browser)
+        return str(path) if cls._is_executable(path) else None
+
+    @classmethod
+    def _from_manifest_or_download(cls, browser: str) -> Optional[str]:
+        """
+        读取磁盘清单，未命中时查找 PATH 或下载驱动
+
+        多个 xdist worker 同时启动时，只有拿到锁的进程会下载，其他进程等待后直接读清单
+        """
+        with FileLock(cls.MANIFEST_LOCK):
+            manifest = cls._read_manifest()
+            entry = manifest.get(browser)
+            if entry and cls._is_executable(entry.get('path')):
+                expired = time.time() - entry.get('resolved_at', 0) > Config.DRIVER_MANIFEST_TTL
+                if not expired or Config.DRIVER_OFFLINE:
+                    return entry['path']
+
+            path = shutil.which(cls.BINARIES[browser][0])
+            if path:
+                return path
+
+            path = cls._download(browser)
+            if path:
+                manifest[browser] = {'path': path, 'resolved_at': time.time()}
+                cls._write_manifest(manifest)
+            elif entry and cls._is_executable(entry.get('path')):
+                # 清单已过期但下载失败（如断网），继续使用旧驱动
+                path = entry['path']
+            return path
+
+    @classmethod
+    def _download(cls, browser: str) -> Optional[str]:
+        """通过 webdriver_manager 下载驱动，离线模式或下载失败时返回 None"""
+        if Config.DRIVER_OFFLINE:
+            return None
+        try:
+            if browser == 'chrome':
+                from webdriver_manager.chrome import ChromeDriverManager
+                path = ChromeDriverManager().install()
+            elif browser == 'firefox':
+                from webdriver_manager.firefox import GeckoDriverManager
+                path = GeckoDriverManager().install()
+            else:
+                from webdriver_manager.microsoft import EdgeChromiumDriverManager
+                path = EdgeChromiumDriverManager().install()
+        except Exception as e:
+            cls.logger.warning("webdriver_manager 下载 %s 驱动失败: %s", browser, e)
+            return None
+        return cls._normalize(browser, path)
+
+    @classmethod
+    def _normalize(cls, browser: str, path: str) -> Optional[str]:
+        """
+        确保路径指向驱动可执行文件本身
+        （部分 webdriver_manager 版本会返回同目录下的 THIRD_PARTY_NOTICES 等文件）
+        """
+        if Path(path).name == cls._binary_name(browser) and cls._is_executable(path):
+            return path
+        candidate = Path(path).parent / cls._binary_name(browser)
+        return str(candidate) if cls._is_executable(candidate) else None
+
+    @classmethod
+    def _read_manifest(cls) -> dict:
+        try:
+            with open(cls.MANIFEST_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    @classmethod
+    def _write_manifest(cls, manifest: dict):
+        tmp_file = cls.MANIFEST_FILE.with_suffix('.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_file, cls.MANIFEST_FILE)
@@ -0,0 +1,88 @@
+"""
+用例耗时记录模块
+保存历史运行中每个用例的耗时（setup + call + teardown），供并行调度预估负载
+"""
+import json
+import os
+import re
+from pathlib import Path
+from statistics import median
+from config.config import Config
+
+
+class DurationStore:
+    """
+    用例耗时存储（reports/durations.json：{nodeid: 秒}）
+
+    新的测量值与历史值按指数平滑合并，避免单次网络抖动导致分配大幅波动
+
+    使用示例：
+        store = DurationStore()
+        store.estimate('test_cases/test_login_csv_driven.py::TestLoginDataDriven::test_login_csv_driven[test_case0]')
+        store.update({nodeid: 12.3})
+    """
+
+    SMOOTHING = 0.5  # 新测量值的权重
+
+    # xdist loadgroup 模式会在 nodeid 后追加 "@分组名"；参数中的 @（如邮箱）位于 [] 内，不会被误删
+    _GROUP_SUFFIX = re.compile(r'@[^\[\]@:]+$')
+
+    def __init__(self, path=None):
+        """
+        Args:
+            path: 耗时文件路径，默认 Config.TEST_DURATIONS_FILE
+        """
+        self.path = Path(path or Config.TEST_DURATIONS_FILE)
+        self._durations = None
+
+    @classmethod
+    def normalize(cls, nodeid: str) -> str:
+        """去掉 xdist 追加的分组后缀，使分组变化后仍能匹配历史记录"""
+        return cls._GROUP_SUFFIX.sub('', nodeid)
+
+    @property
+    def durations(self) -> dict:
+        """历史耗时 {nodeid: 秒}，文件不存在或损坏时为空"""
+        if self._durations is None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._durations = json.load(f)
+            except (FileNotFoundError, ValueError):
+                self._durations = {}
+        return self._durations
+
+    def default_duration(self) -> float:
+        """没有历史记录的用例的预估耗时：已知用例耗时的中位数，没有任何记录时使用 Config.DEFAULT_TEST_DURATION"""
+        if self.durations:
+            return median(self.durations.values())
+        return Config.DEFAULT_TEST_DURATION
+
+    def estimate(self, nodeid: str, default=None) -> float:
+        """预估用例耗时（秒）"""
+        value = self.durations.get(self.normalize(nodeid))
+        if value is not None:
+            return value
+        return self.default_duration() if default is None else default
+
+    def update(self, measured: dict):
+        """
+        合并本次运行的测量值并写回文件（先写临时文件再替换）
+
+        Args:
+            measured: {nodeid: 秒}
+        """
+        durations = dict(self.durations)
+        for nodeid, seconds in measured.items():
+            nodeid = self.normalize(nodeid)
+            previous = durations.get(nodeid)
+            if previous is None:
+                durations[nodeid] = round(seconds, 3)
+            else:
+                durations[nodeid] = round(previous + self.SMOOTHING * (seconds - previous), 3)
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.path.with_name(f'{self.path.name}.{os.getpid()}.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(durations, f, ensure_ascii=False, indent=2, sort_keys=True)
+        os.replace(tmp_file, self.path)
+        self._durations = durations
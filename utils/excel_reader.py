@@ -1,8 +1,9 @@
 """
 Excel 数据读取模块
 用于读取 Excel 格式的测试数据
+
+openpyxl 在创建 ExcelReader 时才导入（导入耗时约 100ms，只用 CSV / JSON 数据时不需要）
 """
-import openpyxl
 from pathlib import Path
 from utils.logger import Logger
 
@@ -12,6 +13,8 @@ class ExcelReader:
         self.workbook = None
         self.sheet_names = []
         
+        import openpyxl
+        
         try:
             # 使用openpyxl加载工作簿
             self.workbook = openpyxl.load_workbook(file_path, read_only=True)
@@ -19,8 +22,13 @@ class ExcelReader:
         except Exception as e:
             raise Exception(f"加载Excel文件失败: {e}")
     
-    def get_sheet_data(self, sheet_name):
-        """获取指定工作表的数据"""
+    def iter_sheet_rows(self, sheet_name):
+        """
+        逐行读取指定工作表的数据（只读模式下按行流式读取，不在内存中保留整表）
+        
+        Yields:
+            {标题: 单元格值} 字典，跳过全空行
+        """
         if self.workbook is None:
             raise Exception("工作簿未加载成功")
             
@@ -28,29 +36,26 @@ class ExcelReader:
             raise ValueError(f"工作表 '{sheet_name}' 不存在")
             
         sheet = self.workbook[sheet_name]
-        data = []
+        rows = sheet.iter_rows(values_only=True)
         
         # 获取标题行
-        headers = []
-        for cell in sheet[1]:
-            headers.append(cell.value)
+        headers = list(next(rows, ()))
         
         # 过滤掉空的标题
         if not any(headers):
-            return data
+            return
         
         # 获取数据行
-        for row in sheet.iter_rows(min_row=2, values_only=True):
+        for row in rows:
             # 跳过全空行
             if not any(row):
                 continue
-            row_data = {}
-            for i, value in enumerate(row):
-                if i < len(headers):  # 防止索引超出范围
-                    row_data[headers[i]] = value
-            data.append(row_data)
-            
-        return data
+            # zip 自动截断超出标题列数的单元格
+            yield dict(zip(headers, row))
+    
+    def get_sheet_data(self, sheet_name):
+        """获取指定工作表的数据"""
+        return list(self.iter_sheet_rows(sheet_name))
     
     def get_cell_value(self, sheet_name, row, col):
         """获取指定单元格的值"""
@@ -0,0 +1,127 @@
+"""
+文件锁模块
+基于 O_EXCL 锁文件实现的跨进程互斥锁，Windows / Linux / Mac 通用
+"""
+import os
+import time
+from pathlib import Path
+
+
+class FileLock:
+    """
+    跨进程文件锁
+
+    使用示例：
+        with FileLock(Config.DRIVERS_DIR / 'driver_manifest.lock'):
+            ...  # 同一时刻只有一个进程执行
+    """
+
+    def __init__(self, path, timeout=60, stale_after=300, poll_interval=0.05):
+        """
+        初始化文件锁
+
+        Args:
+            path: 锁文件路径
+            timeout: 获取锁的超时时间（秒）
+            stale_after: 锁文件超过该时间未释放视为残留（持有进程已崩溃），自动清理
+            poll_interval: 轮询间隔（秒）
+        """
+        self.path = Path(path)
+        self.timeout = timeout
+        self.stale_after = stale_after
+        self.poll_interval = poll_interval
+        self._fd = None
+
+    def acquire(self):
+        """获取锁，超时抛出 TimeoutError"""
+        deadline = time.monotonic() + self.timeout
+        while not self.try_acquire():
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"获取文件锁超时: {self.path}")
+            time.sleep(self.poll_interval)
+        return self
+
+    def try_acquire(self) -> bool:
+        """尝试获取锁一次，不等待"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            self._fd = os.open(str(self.path), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            self._remove_if_stale()
+            return False
+        os.write(self._fd, str(os.getpid()).encode())
+        return True
+
+    def _remove_if_stale(self):
+        """清理残留的锁文件"""
+        try:
+            if time.time() - self.path.stat().st_mtime > self.stale_after:
+                self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+    def release(self):
+        """释放锁"""
+        if self._fd is None:
+            return
+        os.close(self._fd)
+        self._fd = None
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self):
+        return self.acquire()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+
+
+class SlotLock:
+    """
+    跨进程计数锁：同一时刻最多 slots 个持有者（每个槽位是一个文件锁）
+
+    使用示例：
+        with SlotLock(Config.REPORTS_DIR / '.launch', slots=2):
+            ...  # 所有进程中同时最多 2 个在执行
+    """
+
+    def __init__(self, directory, slots=1, timeout=120, stale_after=300, poll_interval=0.05):
+        """
+        Args:
+            directory: 槽位锁文件所在目录
+            slots: 槽位数量
+            timeout: 等待槽位的超时时间（秒）
+            stale_after: 锁文件残留判定时间（秒）
+            poll_interval: 轮询间隔（秒）
+        """
+        directory = Path(directory)
+        self.locks = [FileLock(directory / f'slot{i}.lock', stale_after=stale_after) for i in range(max(slots, 1))]
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self._held = None
+
+    def acquire(self):
+        """获取任一空闲槽位，超时抛出 TimeoutError"""
+        deadline = time.monotonic() + self.timeout
+        while True:
+            for lock in self.locks:
+                if lock.try_acquire():
+                    self._held = lock
+                    return self
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"等待槽位超时: {self.locks[0].path.parent}")
+            time.sleep(self.poll_interval)
+
+    def release(self):
+        """释放持有的槽位"""
+        if self._held is not None:
+            self._held.release()
+            self._held = None
+
+    def __enter__(self):
+        return self.acquire()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
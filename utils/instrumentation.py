@@ -0,0 +1,244 @@
+"""
+WebDriver 命令埋点模块（pytest.ini 中通过 -p utils.instrumentation 加载）
+
+    pytest test_cases/ --profile-commands
+    python run_tests.py profile
+
+启用后包装 driver.execute，记录每个 WebDriver 命令的名称、定位器、耗时和所属用例；
+WaitEngine 的每次等待记录为一个等待区间（含轮询次数），区间内的命令归为等待耗时，其余命令归为操作耗时；
+浏览器启动耗时由 DriverFactory 记录。
+记录写入有界环形缓冲区（超出容量时丢弃最早的记录），每个用例结束时导出为 reports/profile/<用例>.json
+"""
+import json
+import re
+import threading
+import time
+from collections import deque, namedtuple
+from contextlib import contextmanager
+from pathlib import Path
+from config.config import Config
+
+# phase: action（等待之外的命令）/ wait（等待轮询中的命令）/ wait_span（一次等待的总耗时）/ startup（浏览器启动）
+CommandRecord = namedtuple('CommandRecord', 'name locator phase start duration retries ok')
+
+# 查找元素命令：响应中的元素 ID -> 定位器，供后续元素命令（点击、输入等）标注定位器
+_FIND_COMMANDS = {'findElement', 'findElements', 'findChildElement', 'findChildElements'}
+_ELEMENT_KEYS = ('element-6066-11e4-a52e-4f735466cecf', 'ELEMENT')
+
+
+class Instrumentation:
+    """
+    WebDriver 命令埋点
+
+    使用示例：
+        Instrumentation.enabled = True
+        Instrumentation.set_current_test(nodeid)
+        Instrumentation.attach(driver)
+        ...
+        Instrumentation.detach(driver)
+        Instrumentation.export(nodeid)
+    """
+
+    enabled = Config.PROFILE_COMMANDS
+
+    _buffer = deque(maxlen=Config.PROFILE_BUFFER_SIZE)
+    _recorded = 0           # 当前用例写入缓冲区的记录总数（含已被覆盖的）
+    _current_test = None
+    _origin = time.perf_counter()
+    _elements = {}          # 元素 ID -> 定位器
+    _local = threading.local()
+
+    @classmethod
+    def set_current_test(cls, test_id):
+        """
+        设置当前用例，记录的 start 以用例开始时刻为 0
+
+        缓冲区不在此处清空：用例开始前（如后台预热）记录的浏览器启动耗时随下一个导出的用例一起导出
+        """
+        if test_id is not None:
+            cls._elements.clear()
+            cls._origin = time.perf_counter()
+        cls._current_test = test_id
+
+    @classmethod
+    def record(cls, name, locator, phase, start, duration, retries=0, ok=True):
+        """写入一条记录（start 为 time.perf_counter() 取值）"""
+        cls._buffer.append(CommandRecord(name, locator, phase, start - cls._origin, duration, retries, ok))
+        cls._recorded += 1
+
+    @classmethod
+    def attach(cls, driver):
+        """包装 driver.execute（重复调用无副作用）"""
+        if not cls.enabled or 'execute' in vars(driver):
+            return
+        original = driver.execute
+        perf_counter = time.perf_counter
+        local = cls._local
+
+        def execute(driver_command, params=None):
+            locator = cls._locator_of(driver_command, params)
+            start = perf_counter()
+            ok = False
+            try:
+                response = original(driver_command, params)
+                ok = True
+            finally:
+                phase = 'wait' if getattr(local, 'waiting', False) else 'action'
+                cls.record(driver_command, locator, phase, start, perf_counter() - start, ok=ok)
+            if driver_command in _FIND_COMMANDS:
+                cls._remember_elements(response, locator)
+            return response
+
+        driver.execute = execute
+
+    @classmethod
+    def detach(cls, driver):
+        """恢复 driver.execute"""
+        if 'execute' in vars(driver):
+            del driver.execute
+
+    @classmethod
+    def _locator_of(cls, driver_command, params):
+        """从命令参数中取出定位器：查找命令取 using/value，元素命令取该元素被查找时的定位器"""
+        if not params:
+            return None
+        if driver_command in _FIND_COMMANDS:
+            return f"{params.get('using')}={params.get('value')}"
+        element_id = params.get('id')
+        return cls._elements.get(element_id) if element_id else None
+
+    @classmethod
+    def _remember_elements(cls, response, locator):
+        value = (response or {}).get('value')
+        for element in value if isinstance(value, list) else [value]:
+            if isinstance(element, dict):
+                for key in _ELEMENT_KEYS:
+                    if key in element:
+                        cls._elements[element[key]] = locator
+                        break
+
+    @classmethod
+    @contextmanager
+    def waiting(cls, name, locator=None):
+        """
+        等待区间：区间内的命令记为等待耗时，结束时记录区间总耗时和轮询次数
+
+        Yields:
+            dict: 由调用方更新 polls（轮询次数）和 ok（条件是否满足）
+        """
+        if not cls.enabled or getattr(cls._local, 'waiting', False):
+            yield {}
+            return
+        state = {'polls': 0, 'ok': False}
+        cls._local.waiting = True
+        start = time.perf_counter()
+        try:
+            yield state
+        finally:
+            cls._local.waiting = False
+            label = f"{locator[0]}={locator[1]}" if isinstance(locator, tuple) else locator
+            cls.record(name, label, 'wait_span', start, time.perf_counter() - start,
+                       retries=max(state['polls'] - 1, 0), ok=state['ok'])
+
+    @classmethod
+    def export(cls, test_id, directory=None):
+        """
+        把当前缓冲区中的记录导出为用例 JSON 并清空缓冲区
+
+        Returns:
+            导出的文件路径，没有记录时返回 None
+        """
+        if not cls._buffer:
+            return None
+        records = list(cls._buffer)
+        dropped = cls._recorded - len(records)
+        cls._buffer.clear()
+        cls._recorded = 0
+
+        directory = Path(directory or Config.PROFILE_DIR)
+        directory.mkdir(parents=True, exist_ok=True)
+        filepath = directory / f"{re.sub(r'[^0-9A-Za-z_.-]+', '_', test_id).strip('_')[-150:]}.json"
+        data = {
+            'test': test_id,
+            'dropped': dropped,
+            **_totals(records),
+            'commands': [
+                {**record._asdict(), 'start': round(record.start, 4), 'duration': round(record.duration, 4)}
+                for record in records
+            ],
+        }
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=1)
+        return filepath
+
+
+def _totals(records):
+    """按阶段汇总耗时（秒）"""
+    totals = {'wait_seconds': 0.0, 'action_seconds': 0.0, 'startup_seconds': 0.0, 'command_count': 0}
+    for record in records:
+        if record.phase == 'wait_span':
+            totals['wait_seconds'] += record.duration
+        elif record.phase == 'action':
+            totals['action_seconds'] += record.duration
+        elif record.phase == 'startup':
+            totals['startup_seconds'] += record.duration
+        if record.phase in ('action', 'wait'):
+            totals['command_count'] += 1
+    return {key: round(value, 4) for key, value in totals.items()}
+
+
+def load_profiles(directory=None) -> list:
+    """读取目录下所有用例 JSON"""
+    profiles = []
+    for path in sorted(Path(directory or Config.PROFILE_DIR).glob('*.json')):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                profiles.append(json.load(f))
+        except ValueError:
+            continue
+    return profiles
+
+
+def summarize(profiles, top=15) -> dict:
+    """
+    汇总用例 JSON
+
+    Returns:
+        {'slowest': 最慢的命令/等待, 'by_command': {命令: (次数, 总耗时)}, 'tests': 各用例耗时, 'totals': 总计}
+    """
+    entries = []
+    by_command = {}
+    for profile in profiles:
+        for entry in profile['commands']:
+            if entry['phase'] in ('action', 'wait_span', 'startup'):
+                entries.append({**entry, 'test': profile['test']})
+            if entry['phase'] in ('action', 'wait'):
+                count, seconds = by_command.get(entry['name'], (0, 0.0))
+                by_command[entry['name']] = (count + 1, seconds + entry['duration'])
+    tests = [
+        {key: profile[key] for key in ('test', 'wait_seconds', 'action_seconds', 'startup_seconds',
+                                       'command_count', 'dropped')}
+        for profile in profiles
+    ]
+    totals = {key: sum(test[key] for test in tests)
+              for key in ('wait_seconds', 'action_seconds', 'startup_seconds', 'command_count')}
+    return {
+        'slowest': sorted(entries, key=lambda entry: -entry['duration'])[:top],
+        'by_command': dict(sorted(by_command.items(), key=lambda item: -item[1][1])),
+        'tests': sorted(tests, key=lambda test: -(test['wait_seconds'] + test['action_seconds'])),
+        'totals': totals,
+    }
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        '--profile-commands',
+        action='store_true',
+        default=False,
+        help='记录每个 WebDriver 命令的耗时，按用例导出到 Config.PROFILE_DIR（也可设置环境变量 PROFILE_COMMANDS=True）'
+    )
+
+
+def pytest_configure(config):
+    if config.getoption('--profile-commands'):
+        Instrumentation.enabled = True
@@ -0,0 +1,334 @@
+"""
+定位器性能分析模块（run_tests.py locators）
+
+- 加载 locators/ 下每个 *Locators 类，在对应的 DOM 快照（Config.DOM_SNAPSHOT_DIR，本地文件，无需网络）中
+  逐个测量定位器的求值耗时，快照按模块名对应：login_locators.py -> login.html
+- 为每个定位器生成匹配同一节点的 ID / CSS 选择器并测量耗时，给出最快的候选
+- 标记匹配多个元素、未匹配、需要扫描整个文档、依赖界面文本的定位器
+- 每个定位器类输出一份报告 reports/locators/<类名>.md；--apply 时把更快的候选写回定位器模块
+  （只接受 capture_snapshot 从真实页面保存的快照，手写快照的建议仅供参考）
+- 使用独立的无头 Chrome（launch_driver），需要本机安装 Chrome；与 Config.BROWSER 无关，
+  保证不同机器、不同次运行的耗时可以比较
+"""
+import importlib
+import pkgutil
+import re
+import time
+from pathlib import Path
+from selenium.webdriver.common.by import By
+from config.config import Config
+from pages.base_page import FIND_ALL_JS
+
+# 在快照页面中测量定位器并生成候选选择器：arguments[0] 为 [[by, value], ...]
+ANALYZE_JS = FIND_ALL_JS + """
+var ATTRIBUTES = ['name', 'type', 'role', 'aria-label', 'data-testid', 'data-test', 'placeholder', 'title'];
+
+// 每次求值的平均耗时（微秒）：循环到累计 10ms 以上，避免 performance.now() 精度不足
+function timeIt(fn) {
+    var count = 0, start = performance.now(), elapsed = 0;
+    do {
+        for (var i = 0; i < 20; i++) fn();
+        count += 20;
+        elapsed = performance.now() - start;
+    } while (elapsed < 10 && count < 200000);
+    return elapsed * 1000 / count;
+}
+
+function quote(value) {
+    return "'" + value.replace(/\\\\/g, '\\\\\\\\').replace(/'/g, "\\\\'") + "'";
+}
+
+// 元素自身的简单选择器（ID、类名、属性、标签），按求值代价从低到高排列
+function compounds(element) {
+    var tag = element.tagName.toLowerCase(), list = [];
+    if (element.id) list.push('#' + CSS.escape(element.id));
+    var classes = Array.from(element.classList).filter(function (name) { return !/^is-/.test(name); })
+        .map(function (name) { return '.' + CSS.escape(name); });
+    classes.forEach(function (name) { list.push(tag + name); });
+    if (classes.length > 1) list.push(tag + classes.join(''));
+    ATTRIBUTES.forEach(function (name) {
+        var value = element.getAttribute(name);
+        if (value !== null && value !== '') list.push(tag + '[' + name + '=' + quote(value) + ']');
+    });
+    list.push(tag);
+    return list;
+}
+
+function matchesOnly(selector, element) {
+    try {
+        var matched = document.querySelectorAll(selector);
+        return matched.length === 1 && matched[0] === element;
+    } catch (e) {
+        return false;
+    }
+}
+
+function nthOfType(element) {
+    var tag = element.tagName.toLowerCase();
+    var same = Array.from(element.parentNode.children).filter(function (node) { return node.tagName === element.tagName; });
+    return same.length > 1 ? tag + ':nth-of-type(' + (same.indexOf(element) + 1) + ')' : tag;
+}
+
+// 只匹配该元素的候选选择器：自身唯一的简单选择器，或以最近的唯一祖先为锚点的组合选择器
+function candidates(element) {
+    var own = compounds(element), found = own.filter(function (selector) { return matchesOnly(selector, element); });
+    if (found.length) return found;
+    var parent = element.parentElement, ancestor = parent;
+    for (var depth = 0; ancestor && ancestor !== document.documentElement && depth < 8; depth++) {
+        var anchors = compounds(ancestor).filter(function (selector) { return matchesOnly(selector, ancestor); });
+        if (anchors.length) {
+            var anchor = anchors[0], combos = [];
+            own.forEach(function (selector) { combos.push(anchor + ' ' + selector); });
+            if (parent !== ancestor) {
+                compounds(parent).forEach(function (parentSelector) {
+                    if (parentSelector[0] === '#') return;
+                    own.forEach(function (selector) { combos.push(anchor + ' ' + parentSelector + ' > ' + selector); });
+                });
+            }
+            combos.push(anchor + ' ' + nthOfType(element));
+            found = combos.filter(function (selector) { return matchesOnly(selector, element); });
+            if (found.length) return found.slice(0, 5);
+        }
+        ancestor = ancestor.parentElement;
+    }
+    return found;
+}
+
+return arguments[0].map(function (locator) {
+    var elements = findAll(locator[0], locator[1]);
+    var result = {
+        count: elements.length,
+        micros: timeIt(function () { findAll(locator[0], locator[1]); }),
+        candidates: []
+    };
+    if (elements.length) {
+        candidates(elements[0]).forEach(function (selector) {
+            var byId = /^#[\\w-]+$/.test(selector);
+            var by = byId ? 'id' : 'css selector', value = byId ? elements[0].id : selector;
+            result.candidates.push({by: by, value: value, micros: timeIt(function () { findAll(by, value); })});
+        });
+    }
+    return result;
+});
+"""
+
+# 快照页面的 outerHTML（去掉脚本，离线打开时不再执行）
+CAPTURE_DOM_JS = """
+var root = document.documentElement.cloneNode(true);
+root.querySelectorAll('script, noscript').forEach(function (node) { node.remove(); });
+return root.outerHTML;
+"""
+
+# capture_snapshot 写在快照第二行的标记，--apply 只接受带此标记的快照
+CAPTURED_MARKER = 'captured-by: utils.locator_analyzer.capture_snapshot'
+
+BY_NAMES = {value: name for name, value in vars(By).items() if name.isupper()}
+
+FLAG_NAMES = {
+    'missing': '快照中未匹配',
+    'multiple': '匹配多个元素',
+    'full_scan': '扫描整个文档',
+    'text': '依赖界面文本',
+}
+
+
+def load_locator_classes(package='locators'):
+    """
+    加载定位器包中的所有 *Locators 类
+
+    Returns:
+        [(模块, 类, {属性名: (by, value)})]
+    """
+    result = []
+    for module_info in pkgutil.iter_modules([str(Config.BASE_DIR / package)]):
+        module = importlib.import_module(f'{package}.{module_info.name}')
+        for name, cls in vars(module).items():
+            if not (isinstance(cls, type) and name.endswith('Locators') and cls.__module__ == module.__name__):
+                continue
+            locators = {
+                attr: value for attr, value in vars(cls).items()
+                if isinstance(value, tuple) and len(value) == 2 and value[0] in BY_NAMES
+            }
+            result.append((module, cls, locators))
+    return result
+
+
+def snapshot_for(module):
+    """定位器模块对应的 DOM 快照：login_locators -> DOM_SNAPSHOT_DIR/login.html"""
+    stem = module.__name__.rsplit('.', 1)[-1]
+    return Config.DOM_SNAPSHOT_DIR / f"{re.sub(r'_locators$', '', stem)}.html"
+
+
+def static_flags(by, value):
+    """
+    不依赖页面即可判断的问题
+
+    - full_scan：以 // 开头且第一步没有 @id 锚点的 XPath、按 name 查找、最右侧不含标签/ID/类名的 CSS，
+      浏览器需要遍历整个文档逐个比较
+    - text：按可见文本、placeholder、title 匹配，界面文案或语言变化时失效
+    """
+    flags = []
+    if by == By.XPATH:
+        if re.match(r'\(?//', value) and not re.match(r"\(?//(\w+|\*)?\[@id=", value):
+            flags.append('full_scan')
+        if re.search(r"text\(\)|contains\(|normalize-space|@placeholder|@title|@aria-label", value):
+            flags.append('text')
+    elif by == By.NAME:
+        flags.append('full_scan')
+    elif by == By.CSS_SELECTOR:
+        rightmost = re.split(r'\s*[\s>+~]\s*', value.strip())[-1]
+        if not re.match(r'[#.]|[a-zA-Z]', rightmost):
+            flags.append('full_scan')
+        if re.search(r'\[(placeholder|title|aria-label)[~|^$*]?=', value):
+            flags.append('text')
+    return flags
+
+
+def launch_driver():
+    """
+    启动定位器分析用的无头 Chrome
+
+    不经过 DriverFactory：不预热、不使用驱动池、不加快速启动配置（屏蔽资源会影响快照渲染），
+    只使用本地已有的驱动（DriverResolver.resolve_local），不查询版本、不下载
+
+    Returns:
+        WebDriver 实例
+    """
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    from utils.driver_resolver import DriverResolver
+    options = webdriver.ChromeOptions()
+    for arg in ('--headless=new', '--no-sandbox', '--disable-dev-shm-usage', '--disable-gpu', '--window-size=1920,1080'):
+        options.add_argument(arg)
+    return webdriver.Chrome(service=Service(DriverResolver.resolve_local('chrome')), options=options)
+
+
+def analyze(driver, snapshot, locators):
+    """
+    在 DOM 快照中测量定位器并给出候选
+
+    Args:
+        driver: WebDriver 实例
+        snapshot: 快照文件路径
+        locators: {属性名: (by, value)}
+
+    Returns:
+        {属性名: {'by', 'value', 'count', 'micros', 'flags', 'candidates', 'suggestion'}}，
+        suggestion 为只匹配同一节点的最快候选（原定位器没有问题且不慢于候选、或未恰好匹配一个元素时为 None）
+    """
+    driver.get(Path(snapshot).resolve().as_uri())
+    measured = driver.execute_script(ANALYZE_JS, [list(locator) for locator in locators.values()])
+    report = {}
+    for (name, (by, value)), result in zip(locators.items(), measured):
+        flags = static_flags(by, value)
+        if result['count'] == 0:
+            flags.insert(0, 'missing')
+        elif result['count'] > 1:
+            flags.insert(0, 'multiple')
+        # 候选优先不依赖界面文本、不扫描整个文档，其次按耗时
+        candidates = sorted(
+            (c for c in result['candidates'] if (c['by'], c['value']) != (by, value)),
+            key=lambda c: (len(static_flags(c['by'], c['value'])), c['micros'])
+        )
+        # 没有问题时只在明显更快（低于原耗时的 80%）时建议替换，ID 定位器不替换；
+        # 候选只匹配第一个节点，匹配多个元素的定位器（如所有提示框）替换后会改变 find_elements 的结果，不给建议
+        suggestion = None
+        if (candidates and result['count'] == 1
+                and (flags or (by != By.ID and candidates[0]['micros'] < result['micros'] * 0.8))):
+            suggestion = candidates[0]
+        report[name] = {
+            'by': by, 'value': value, 'count': result['count'], 'micros': result['micros'],
+            'flags': flags, 'candidates': candidates, 'suggestion': suggestion,
+        }
+    return report
+
+
+def write_report(cls, snapshot, report, output_dir=None):
+    """
+    输出定位器类的报告（Markdown）
+
+    Returns:
+        报告路径 reports/locators/<类名>.md
+    """
+    output_dir = output_dir or Config.REPORTS_DIR / 'locators'
+    output_dir.mkdir(parents=True, exist_ok=True)
+    source = '' if is_captured(snapshot) else '（手写快照，建议仅供参考，不会 --apply）'
+    lines = [
+        f"# {cls.__name__}", '',
+        f"模块: `{cls.__module__}`  快照: `{Path(snapshot).relative_to(Config.BASE_DIR).as_posix()}`{source}", '',
+        '| 定位器 | 当前 | 匹配数 | 耗时(µs) | 问题 | 建议 | 建议耗时(µs) |',
+        '|--------|------|--------|----------|------|------|--------------|',
+    ]
+    for name, entry in report.items():
+        suggestion = entry['suggestion']
+        flags = '、'.join(FLAG_NAMES[flag] for flag in entry['flags']) or '-'
+        suggested, suggested_micros = '-', '-'
+        if suggestion:
+            suggested = f"`{BY_NAMES[suggestion['by']]}` `{suggestion['value']}`"
+            suggested_micros = f"{suggestion['micros']:.1f}"
+        lines.append(
+            f"| `{name}` | `{BY_NAMES[entry['by']]}` `{entry['value']}` | {entry['count']} | {entry['micros']:.1f} "
+            f"| {flags} | {suggested} | {suggested_micros} |"
+        )
+    path = output_dir / f'{cls.__name__}.md'
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    return path
+
+
+def is_captured(snapshot):
+    """快照是否由 capture_snapshot 从真实页面保存（检查前两行中的标记）"""
+    with open(snapshot, 'r', encoding='utf-8') as f:
+        return any(CAPTURED_MARKER in f.readline() for _ in range(2))
+
+
+def apply_suggestions(module, report, snapshot):
+    """
+    把建议写回定位器模块（只替换形如 NAME = (By.XPATH, "...") 的单行定义）
+
+    Raises:
+        ValueError: 快照不是 capture_snapshot 保存的（手写快照不能代表真实页面）
+
+    Returns:
+        已替换的属性名列表
+    """
+    if not is_captured(snapshot):
+        raise ValueError(f"快照不是由 capture_snapshot 保存的，不写回定位器: {snapshot}")
+    path = Path(module.__file__)
+    source = path.read_text(encoding='utf-8')
+    applied = []
+    for name, entry in report.items():
+        suggestion = entry['suggestion']
+        if not suggestion:
+            continue
+        pattern = re.compile(rf"^(\s*{name}\s*=\s*)\(By\.\w+,\s*(['\"]).*?\2\)", re.MULTILINE)
+        replacement = f"(By.{BY_NAMES[suggestion['by']]}, {_literal(suggestion['value'])})"
+        source, count = pattern.subn(lambda match: match.group(1) + replacement, source, count=1)
+        if count:
+            applied.append(name)
+    path.write_text(source, encoding='utf-8')
+    return applied
+
+
+def _literal(value):
+    """与定位器模块一致优先使用双引号的字符串字面量"""
+    return f'"{value}"' if '"' not in value and '\\' not in value else repr(value)
+
+
+def capture_snapshot(driver, name):
+    """
+    保存当前页面的 DOM 快照（去掉脚本），供离线分析使用
+
+    Args:
+        driver: 已打开目标页面并处于待分析状态（如已展开表单、显示提示框）的 WebDriver 实例
+        name: 快照名称，与定位器模块对应（login_locators.py -> login）
+
+    Returns:
+        快照路径
+    """
+    path = Config.DOM_SNAPSHOT_DIR / f'{name}.html'
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # 地址中的 -- 会提前结束 HTML 注释
+    url = driver.current_url.replace('--', '%2D%2D')
+    marker = f"<!-- {CAPTURED_MARKER} {url} {time.strftime('%Y-%m-%d %H:%M:%S')} -->"
+    path.write_text(f"<!DOCTYPE html>\n{marker}\n{driver.execute_script(CAPTURE_DOM_JS)}\n", encoding='utf-8')
+    return path
@@ -1,17 +1,77 @@
 """
 日志工具模块
 提供统一的日志记录功能
+
+调用线程只把日志记录放入队列（QueueHandler），由后台线程（QueueListener）写控制台、文本日志和 JSON 日志；
+xdist 并行运行时每个 worker 写自己的日志文件（automation_gw0.log ...），不再争用同一个文件
 """
+import atexit
+import json
 import logging
+import os
+import queue
 import sys
-from pathlib import Path
+from logging.handlers import QueueHandler, QueueListener
 from config.config import Config
 
 
+class JsonFormatter(logging.Formatter):
+    """结构化日志：每条记录一行 JSON"""
+
+    def format(self, record):
+        entry = {
+            'time': self.formatTime(record, '%Y-%m-%d %H:%M:%S') + f'.{int(record.msecs):03d}',
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'worker': _worker_id() or 'main',
+            'test': getattr(record, 'test', None),
+            'module': record.module,
+            'line': record.lineno,
+            'thread': record.threadName,
+        }
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class ContextQueueHandler(QueueHandler):
+    """
+    放入队列前记录当前用例（后台线程写出时用例可能已经切换），并合并 %-style 消息
+
+    参数可能是之后会变化的对象（字典、WebElement 等），必须在调用线程中按记录时的状态格式化；
+    队列在进程内，不需要像默认实现那样复制记录，异常堆栈仍在后台线程中格式化
+    """
+
+    def prepare(self, record):
+        current = os.environ.get('PYTEST_CURRENT_TEST')
+        record.test = current.rsplit(' ', 1)[0] if current else None
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+class LazyFileHandler(logging.FileHandler):
+    """首次写入时才打开日志文件并创建所在目录，导入日志模块不会在磁盘上创建目录和空文件"""
+
+    def __init__(self, filename, encoding='utf-8'):
+        super().__init__(filename, encoding=encoding, delay=True)
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+
+
+def _worker_id():
+    """xdist worker 编号（gw0、gw1 ...），非并行运行时为 None"""
+    return os.environ.get('PYTEST_XDIST_WORKER')
+
+
 class Logger:
     """日志记录器类"""
     
     _instance = None
+    _listener = None
     
     def __new__(cls):
         """单例模式"""
@@ -31,24 +91,69 @@ class Logger:
         
         # 避免重复添加处理器
         if not self.logger.handlers:
-            # 控制台处理器
-            console_handler = logging.StreamHandler(sys.stdout)
-            console_handler.setLevel(logging.INFO)
-            console_formatter = logging.Formatter(
-                '%(asctime)s - %(levelname)s - %(message)s',
-                datefmt='%Y-%m-%d %H:%M:%S'
-            )
-            console_handler.setFormatter(console_formatter)
-            
-            # 文件处理器
-            log_file = Config.LOGS_DIR / 'automation.log'
-            file_handler = logging.FileHandler(log_file, encoding='utf-8')
-            file_handler.setLevel(logging.DEBUG)
-            file_formatter = logging.Formatter(Config.LOG_FORMAT)
-            file_handler.setFormatter(file_formatter)
-            
-            self.logger.addHandler(console_handler)
-            self.logger.addHandler(file_handler)
+            log_queue = queue.SimpleQueue()
+            Logger._listener = QueueListener(log_queue, *self.build_handlers(), respect_handler_level=True)
+            Logger._listener.start()
+            atexit.register(Logger.stop)
+            self.logger.addHandler(ContextQueueHandler(log_queue))
+    
+    @staticmethod
+    def log_file_stem():
+        """日志文件名（不含扩展名）：并行运行时追加 worker 编号"""
+        worker = _worker_id()
+        return f'{Config.LOG_NAME}_{worker}' if worker else Config.LOG_NAME
+    
+    @classmethod
+    def build_handlers(cls, log_dir=None):
+        """
+        创建写出日志的处理器（在后台线程中执行）
+        
+        日志目录由 Config.ensure_dirs 创建；在此之前写出日志时由文件处理器按需创建
+        
+        Args:
+            log_dir: 日志目录，默认 Config.LOGS_DIR
+        
+        Returns:
+            [控制台处理器, 文本文件处理器, JSON 文件处理器（Config.LOG_JSON 开启时）]
+        """
+        log_dir = log_dir or Config.LOGS_DIR
+        stem = cls.log_file_stem()
+        
+        # 控制台处理器
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setLevel(logging.INFO)
+        console_formatter = logging.Formatter(
+            '%(asctime)s - %(levelname)s - %(message)s',
+            datefmt='%Y-%m-%d %H:%M:%S'
+        )
+        console_handler.setFormatter(console_formatter)
+        
+        # 文件处理器
+        log_file = log_dir / f'{stem}.log'
+        file_handler = LazyFileHandler(log_file)
+        file_handler.setLevel(logging.DEBUG)
+        file_formatter = logging.Formatter(Config.LOG_FORMAT)
+        file_handler.setFormatter(file_formatter)
+        
+        handlers = [console_handler, file_handler]
+        
+        # 结构化 JSON 日志（每行一条记录，便于按用例 / worker 过滤）
+        if Config.LOG_JSON:
+            json_handler = LazyFileHandler(log_dir / f'{stem}.jsonl')
+            json_handler.setLevel(logging.DEBUG)
+            json_handler.setFormatter(JsonFormatter())
+            handlers.append(json_handler)
+        
+        return handlers
+    
+    @classmethod
+    def stop(cls):
+        """写出队列中剩余的日志并停止后台线程（进程退出时自动调用）"""
+        listener, cls._listener = cls._listener, None
+        if listener is not None:
+            listener.stop()
+            for handler in listener.handlers:
+                handler.close()
     
     def get_logger(self):
         """获取日志记录器实例"""
@@ -0,0 +1,175 @@
+"""
+按历史耗时的并行调度插件（pytest.ini 中通过 -p utils.lpt_scheduler 加载）
+
+    pytest test_cases/ -n 4 --lpt
+
+- 每次运行结束后把用例耗时记录到 reports/durations.json
+- 启用 --lpt 时，各 worker 按相同的历史耗时做最长处理时间优先（LPT）分配：
+  用例按预估耗时从长到短，依次放入当前负载最小的 worker，
+  通过 xdist_group 标记把每组分给一个 worker（需 --dist loadgroup，启用时自动切换）
+- 已带 xdist_group 标记的用例（如数据分片）作为整体参与分配，不会被拆开
+- 运行结束后在终端输出预测与实际的 makespan（最忙 worker 的用例总耗时）
+"""
+import heapq
+import os
+import re
+import time
+import pytest
+from config.config import Config
+from test_data.shard_plugin import use_loadgroup
+from utils.duration_store import DurationStore
+
+_BIN_PATTERN = re.compile(r'(?:^|_)lpt(\d+)(?:_|$)')
+
+# 主控进程（或单进程运行）汇总的状态
+_measured = {}          # nodeid -> 本次运行耗时
+_worker_busy = {}       # worker -> 用例耗时合计
+_predicted = {}         # 分组 -> 预测耗时
+_session_start = None
+
+
+def lpt_assign(costs: dict, bins: int) -> list:
+    """
+    最长处理时间优先分配
+
+    Args:
+        costs: {单元: 预估耗时}
+        bins: 分组数量（worker 数量）
+
+    Returns:
+        每个分组的单元列表，按分组编号排列
+    """
+    groups = [[] for _ in range(max(bins, 1))]
+    heap = [(0.0, index) for index in range(len(groups))]
+    # 耗时相同时按名称排序，保证所有 worker 得到相同的分配结果
+    for unit, cost in sorted(costs.items(), key=lambda item: (-item[1], item[0])):
+        load, index = heapq.heappop(heap)
+        groups[index].append(unit)
+        heapq.heappush(heap, (load + cost, index))
+    return groups
+
+
+def _available_memory_mb():
+    """可用内存（MB），无法获取时返回 None"""
+    try:
+        import psutil
+        return psutil.virtual_memory().available / 1024 / 1024
+    except ImportError:
+        pass
+    try:
+        return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE') / 1024 / 1024
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def auto_worker_count(browser=None) -> int:
+    """
+    根据 CPU 核数、可用内存和单个浏览器的内存占用估算并行 worker 数量
+
+    每个 worker 的内存 = 进程本身 + 浏览器数量（驱动池大小或 1 个，加上预热深度）× 单个浏览器内存
+
+    Args:
+        browser: 浏览器名称，默认 Config.BROWSER
+
+    Returns:
+        worker 数量（至少为 1）
+    """
+    browser = (browser or Config.BROWSER).lower()
+    browsers = (Config.DRIVER_POOL_SIZE if Config.DRIVER_POOL_ENABLED else 1) + Config.DRIVER_PREWARM_DEPTH
+    per_worker = Config.WORKER_MEMORY_MB + browsers * Config.BROWSER_MEMORY_MB.get(browser, 400)
+
+    workers = os.cpu_count() or 1
+    available = _available_memory_mb()
+    if available is not None:
+        workers = min(workers, int((available - Config.MEMORY_RESERVE_MB) // per_worker))
+    return max(1, workers)
+
+
+def _is_worker(config):
+    return hasattr(config, 'workerinput')
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        '--lpt',
+        action='store_true',
+        default=False,
+        help='并行运行时按历史耗时做最长处理时间优先（LPT）分配（历史耗时文件见 Config.TEST_DURATIONS_FILE）'
+    )
+
+
+def pytest_configure(config):
+    global _session_start
+    _session_start = time.perf_counter()
+    if config.getoption('--lpt'):
+        use_loadgroup(config)
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(config, items):
+    """在 xdist 追加分组后缀之前，为每个用例打上 LPT 分组标记（所有 worker 计算结果相同）"""
+    workers = int(os.getenv('PYTEST_XDIST_WORKER_COUNT', '1'))
+    if not config.getoption('--lpt') or not _is_worker(config) or workers <= 1:
+        return
+
+    store = DurationStore()
+    default = store.default_duration()
+    units = {}
+    for item in items:
+        groups = sorted(str(mark.args[0] if mark.args else mark.kwargs.get('name', 'default'))
+                        for mark in item.iter_markers('xdist_group'))
+        units.setdefault('@'.join(groups) if groups else item.nodeid, []).append(item)
+
+    costs = {unit: sum(store.estimate(item.nodeid, default) for item in members) for unit, members in units.items()}
+    for index, group in enumerate(lpt_assign(costs, workers)):
+        for unit in group:
+            for item in units[unit]:
+                # 用 LPT 分组替换用例自身的分组标记（同组用例已整体分配到同一个 LPT 分组）
+                item.own_markers = [mark for mark in item.own_markers if mark.name != 'xdist_group']
+                item.add_marker(pytest.mark.xdist_group(f'lpt{index}'))
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_node_collection_finished(node, ids):
+    """主控进程：根据 worker 收集到的分组计算预测负载（只计算一次）"""
+    if _predicted or not node.config.getoption('--lpt'):
+        return
+    store = DurationStore()
+    default = store.default_duration()
+    for nodeid in ids:
+        match = _BIN_PATTERN.search(nodeid.rpartition('@')[2]) if '@' in nodeid else None
+        if match:
+            group = f'lpt{match.group(1)}'
+            _predicted[group] = _predicted.get(group, 0.0) + store.estimate(nodeid, default)
+
+
+def pytest_runtest_logreport(report):
+    """汇总每个用例各阶段的耗时，以及每个 worker 的忙碌时间"""
+    _measured[report.nodeid] = _measured.get(report.nodeid, 0.0) + report.duration
+    node = getattr(report, 'node', None)
+    worker = node.gateway.id if node is not None else 'main'
+    _worker_busy[worker] = _worker_busy.get(worker, 0.0) + report.duration
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """把本次耗时写回历史记录（xdist 模式下只由主控进程写入）"""
+    if _is_worker(session.config) or session.config.option.collectonly or not _measured:
+        return
+    DurationStore().update(_measured)
+
+
+def pytest_terminal_summary(terminalreporter):
+    """并行运行时输出各 worker 的用例耗时，以及预测（启用 --lpt 时）与实际 makespan"""
+    if len(_worker_busy) <= 1:
+        return
+    actual = max(_worker_busy.values())
+    wall = time.perf_counter() - _session_start
+    predicted = f"{max(_predicted.values()):.2f}s" if _predicted else '-'
+    terminalreporter.write_sep('-', '并行调度')
+    terminalreporter.write_line(
+        f"worker 数: {len(_worker_busy)}  预测 makespan: {predicted}  "
+        f"实际 makespan: {actual:.2f}s  墙钟耗时: {wall:.2f}s"
+    )
+    terminalreporter.write_line(
+        "各 worker 用例耗时: " + '  '.join(f"{w}={t:.2f}s" for w, t in sorted(_worker_busy.items()))
+    )
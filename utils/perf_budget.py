@@ -0,0 +1,249 @@
+"""
+性能预算插件（pytest.ini 中通过 -p utils.perf_budget 加载）
+
+- 页面对象在导航、登录后通过 PerfMetrics（utils/perf_metrics.py）采集 Navigation Timing / Paint Timing 指标，
+  插件另外记录用例执行耗时
+- 每个指标与历史基线（最近 Config.PERF_BASELINE_WINDOW 次通过运行的中位数）比较，
+  按用例标记（smoke / critical）取 Config.PERF_BUDGETS 中最严格的阈值：超过 warn 记为警告，
+  超过 fail 记为超出，Config.PERF_BUDGET_FAIL 开启时（CI）判定用例失败
+- 历史记录按 浏览器 + 用例 保存在 Config.PERF_HISTORY_FILE，运行结束后输出终端汇总和趋势报告 Config.PERF_TREND_FILE，
+  并把每个用例的指标附加到 pytest-html / Allure 报告
+"""
+import html
+import json
+import os
+import time
+from statistics import median
+import pytest
+from config.config import Config
+from utils.duration_store import DurationStore
+from utils.perf_metrics import PerfMetrics
+
+_STATUS_ORDER = {'ok': 0, 'new': 0, 'warn': 1, 'fail': 2}
+
+# 主控进程（或单进程运行）汇总的结果：历史键 -> {指标: (状态, 基线, 当前值)}
+_results = {}
+_passed_metrics = {}    # 历史键 -> {指标: 当前值}，只记录通过的用例，写入历史
+_history = None
+
+
+def history_key(nodeid):
+    """历史记录的键 "浏览器 nodeid"：不同浏览器的耗时差异较大，各自建立基线"""
+    return f'{Config.BROWSER.lower()} {DurationStore.normalize(nodeid)}'
+
+
+def _load_history():
+    """历史记录 {历史键: {指标: [值, ...]}}（每个进程只读取一次）"""
+    global _history
+    if _history is None:
+        try:
+            with open(Config.PERF_HISTORY_FILE, 'r', encoding='utf-8') as f:
+                _history = json.load(f)
+        except (FileNotFoundError, ValueError):
+            _history = {}
+    return _history
+
+
+def baseline(values):
+    """滚动基线：最近 Config.PERF_BASELINE_WINDOW 个值的中位数，样本不足时返回 None"""
+    window = values[-Config.PERF_BASELINE_WINDOW:]
+    return median(window) if len(window) >= Config.PERF_MIN_SAMPLES else None
+
+
+def budget_for(markers):
+    """按用例标记取最严格的阈值 {'warn': 比例, 'fail': 比例}"""
+    budgets = [Config.PERF_BUDGETS[name] for name in markers if name in Config.PERF_BUDGETS]
+    budgets.append(Config.PERF_BUDGETS['default'])
+    return {level: min(budget[level] for budget in budgets) for level in ('warn', 'fail')}
+
+
+def evaluate(metrics, history, budget):
+    """
+    与基线比较
+
+    Returns:
+        {指标: (状态, 基线, 当前值)}，状态为 new（样本不足）/ ok / warn / fail
+    """
+    verdicts = {}
+    for name, value in metrics.items():
+        base = baseline(history.get(name, []))
+        if base is None:
+            verdicts[name] = ('new', None, value)
+            continue
+        status = 'ok'
+        # 绝对增量低于 Config.PERF_MIN_DELTA_MS 时视为抖动
+        if value - base > Config.PERF_MIN_DELTA_MS:
+            if value > base * (1 + budget['fail']):
+                status = 'fail'
+            elif value > base * (1 + budget['warn']):
+                status = 'warn'
+        verdicts[name] = (status, base, value)
+    return verdicts
+
+
+def _change(base, value):
+    """相对基线的变化；基线不大于 0（如页面未触发的 paint 指标记为 0）时只给出绝对增量"""
+    if base <= 0:
+        return f"{value - base:+.0f}ms"
+    return f"{(value / base - 1) * 100:+.0f}%"
+
+
+def _describe(verdicts, statuses):
+    return '; '.join(
+        f"{name} {value:.0f}ms（基线 {base:.0f}ms，{_change(base, value)}）"
+        for name, (status, base, value) in sorted(verdicts.items()) if status in statuses
+    )
+
+
+def _metrics_table(verdicts):
+    rows = ''.join(
+        f"<tr><td>{html.escape(name)}</td><td>{value:.0f}</td>"
+        f"<td>{'-' if base is None else f'{base:.0f}'}</td><td>{status}</td></tr>"
+        for name, (status, base, value) in sorted(verdicts.items())
+    )
+    return f"<table><tr><th>指标</th><th>当前(ms)</th><th>基线(ms)</th><th>状态</th></tr>{rows}</table>"
+
+
+def _attach_to_reports(report, verdicts):
+    """把指标附加到 pytest-html 报告行和 Allure 用例（未安装时跳过）"""
+    try:
+        import pytest_html
+        report.extras = [*getattr(report, 'extras', []), pytest_html.extras.html(_metrics_table(verdicts))]
+    except ImportError:
+        pass
+    try:
+        import allure
+        allure.attach(
+            json.dumps({name: {'status': s, 'baseline_ms': b, 'value_ms': v} for name, (s, b, v) in verdicts.items()},
+                       ensure_ascii=False, indent=2),
+            name='性能指标', attachment_type=allure.attachment_type.JSON
+        )
+    except ImportError:
+        pass
+
+
+def pytest_runtest_setup(item):
+    PerfMetrics.reset()
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """用例执行阶段结束后比较性能指标，超出 fail 阈值时把通过的用例改判为失败"""
+    outcome = yield
+    report = outcome.get_result()
+    if report.when != 'call' or not PerfMetrics.enabled:
+        return
+
+    metrics = PerfMetrics.take()
+    metrics['test.wall'] = round(call.duration * 1000, 1)
+    history = _load_history().get(history_key(item.nodeid), {})
+    verdicts = evaluate(metrics, history, budget_for({mark.name for mark in item.iter_markers()}))
+    report.user_properties.append(('perf_verdicts', verdicts))
+    _attach_to_reports(report, verdicts)
+
+    if report.passed and Config.PERF_BUDGET_FAIL and any(v[0] == 'fail' for v in verdicts.values()):
+        report.outcome = 'failed'
+        # 改判后的测量值不会写入历史（只记录通过的用例），避免回归被逐步吸收进基线
+        report.longrepr = f"超出性能预算: {_describe(verdicts, ('fail',))}"
+
+
+def pytest_runtest_logreport(report):
+    """汇总各用例的性能指标（xdist 模式下在主控进程汇总各 worker 的结果）"""
+    if report.when != 'call':
+        return
+    properties = dict(report.user_properties)
+    verdicts = properties.get('perf_verdicts')
+    if verdicts is None:
+        return
+    key = history_key(report.nodeid)
+    _results[key] = {name: tuple(verdict) for name, verdict in verdicts.items()}
+    if report.passed:
+        _passed_metrics[key] = {name: verdict[2] for name, verdict in verdicts.items()}
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """写入历史记录和趋势报告（xdist 模式下只由主控进程写入）"""
+    if hasattr(session.config, 'workerinput') or session.config.option.collectonly or not _results:
+        return
+    previous = _load_history()
+    history = {test: {name: list(values) for name, values in metrics.items()} for test, metrics in previous.items()}
+    for test, metrics in _passed_metrics.items():
+        for name, value in metrics.items():
+            values = history.setdefault(test, {}).setdefault(name, [])
+            values.append(value)
+            del values[:-Config.PERF_HISTORY_SIZE]
+
+    path = Config.PERF_HISTORY_FILE
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(history, f, ensure_ascii=False, indent=1, sort_keys=True)
+    os.replace(tmp_file, path)
+    write_trend_report(_results, previous)
+
+
+def _sparkline(values, width=120, height=24):
+    """历史值折线（内联 SVG）"""
+    if len(values) < 2:
+        return ''
+    low, high = min(values), max(values)
+    span = (high - low) or 1
+    step = width / (len(values) - 1)
+    points = ' '.join(f"{i * step:.1f},{height - (v - low) / span * (height - 4) - 2:.1f}" for i, v in enumerate(values))
+    return (f'<svg width="{width}" height="{height}"><polyline points="{points}" '
+            f'fill="none" stroke="#3b82f6" stroke-width="1.5"/></svg>')
+
+
+def write_trend_report(results, history, output=None):
+    """
+    生成性能趋势报告（与 pytest-html 报告放在同一目录）
+
+    Args:
+        results: {历史键: {指标: (状态, 基线, 当前值)}}
+        history: 本次运行之前的历史记录
+        output: 输出路径，默认 Config.PERF_TREND_FILE（reports/html/perf_trend.html）
+    """
+    output = output or Config.PERF_TREND_FILE
+    colors = {'fail': '#fecaca', 'warn': '#fef08a', 'ok': '', 'new': '#e5e7eb'}
+    rows = []
+    for test in sorted(results, key=lambda t: (-max(_STATUS_ORDER[v[0]] for v in results[t].values()), t)):
+        for name, (status, base, value) in sorted(results[test].items()):
+            change = '-' if base is None else _change(base, value)
+            trend = history.get(test, {}).get(name, [])[-Config.PERF_HISTORY_SIZE:] + [value]
+            rows.append(
+                f'<tr style="background:{colors[status]}"><td>{html.escape(test)}</td><td>{html.escape(name)}</td>'
+                f"<td>{value:.0f}</td><td>{'-' if base is None else f'{base:.0f}'}</td><td>{change}</td>"
+                f"<td>{status}</td><td>{_sparkline(trend)}</td></tr>"
+            )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        f.write(
+            '<!DOCTYPE html><html><head><meta charset="utf-8"><title>性能趋势</title>'
+            '<style>body{font-family:sans-serif}table{border-collapse:collapse}'
+            'td,th{border:1px solid #ccc;padding:4px 8px;font-size:13px}</style></head><body>'
+            f"<h2>性能趋势 {time.strftime('%Y-%m-%d %H:%M:%S')}</h2>"
+            f"<p>基线为最近 {Config.PERF_BASELINE_WINDOW} 次通过运行的中位数，单位毫秒</p>"
+            '<table><tr><th>用例</th><th>指标</th><th>当前</th><th>基线</th><th>变化</th><th>状态</th><th>趋势</th></tr>'
+            f"{''.join(rows)}</table></body></html>"
+        )
+    return output
+
+
+def pytest_terminal_summary(terminalreporter):
+    """输出超出预算的指标"""
+    if not _results:
+        return
+    counts = {'ok': 0, 'new': 0, 'warn': 0, 'fail': 0}
+    for verdicts in _results.values():
+        for status, _, _ in verdicts.values():
+            counts[status] += 1
+    terminalreporter.write_sep('-', '性能预算')
+    terminalreporter.write_line(
+        f"指标数: {sum(counts.values())}  正常: {counts['ok']}  样本不足: {counts['new']}  "
+        f"警告: {counts['warn']}  超出: {counts['fail']}  趋势报告: {os.path.relpath(Config.PERF_TREND_FILE, Config.BASE_DIR)}"
+    )
+    for test, verdicts in sorted(_results.items()):
+        for level in ('fail', 'warn'):
+            described = _describe(verdicts, (level,))
+            if described:
+                terminalreporter.write_line(f"  [{level}] {test}: {described}")
@@ -0,0 +1,123 @@
+"""
+性能指标采集模块
+页面对象在导航、登录等关键步骤后记录当前用例的性能指标，由性能预算插件（utils/perf_budget.py）与历史基线比较
+
+不依赖 pytest，页面对象导入时不会连带导入测试框架
+"""
+from config.config import Config
+
+# 当前页面的导航与绘制耗时（毫秒，相对导航开始）
+PAGE_TIMING_JS = """
+function pageTiming() {
+    var nav = performance.getEntriesByType('navigation')[0];
+    if (!nav) return null;
+    var timing = {
+        ttfb: nav.responseStart,
+        dom_content_loaded: nav.domContentLoadedEventEnd,
+        load: nav.loadEventEnd
+    };
+    performance.getEntriesByType('paint').forEach(function (paint) {
+        timing[paint.name.replace(/-/g, '_')] = paint.startTime;
+    });
+    return timing;
+}
+"""
+
+# 操作开始时在页面中打点
+MARK_JS = "performance.clearMarks(arguments[0]); performance.mark(arguments[0]);"
+
+# 操作耗时（毫秒，相对打点）：同一文档内（含 pushState 路由切换）统计打点之后发起的 XHR / fetch 请求，
+# 打点随旧页面销毁时说明发生了整页跳转，此时新页面的导航记录才对应本次操作
+ACTION_TIMING_JS = PAGE_TIMING_JS + """
+var mark = performance.getEntriesByName(arguments[0], 'mark')[0];
+if (!mark) return pageTiming();
+var requests = performance.getEntriesByType('resource').filter(function (entry) {
+    return (entry.initiatorType === 'xmlhttprequest' || entry.initiatorType === 'fetch')
+        && entry.startTime >= mark.startTime;
+});
+var timing = {requests: requests.length};
+if (requests.length) {
+    var end = Math.max.apply(null, requests.map(function (entry) { return entry.responseEnd; }));
+    performance.measure(arguments[0] + ':api', {start: mark.startTime, end: end});
+    timing.api = end - mark.startTime;
+}
+performance.clearMarks(arguments[0]);
+return timing;
+"""
+
+
+class PerfMetrics:
+    """
+    当前用例的性能指标（毫秒）
+
+    使用示例：
+        PerfMetrics.capture_page_timing(driver, 'navigate')
+        PerfMetrics.mark(driver, 'login')
+        ...（点击登录）
+        PerfMetrics.capture_action_timing(driver, 'login')
+        PerfMetrics.record('login.feedback', 820.5)
+    """
+
+    enabled = Config.PERF_BUDGET_ENABLED
+    _current = {}
+
+    @classmethod
+    def reset(cls):
+        cls._current = {}
+
+    @classmethod
+    def record(cls, name, value_ms):
+        """记录一个指标（同名指标以最后一次为准）"""
+        if cls.enabled and value_ms is not None and value_ms > 0:
+            cls._current[name] = round(value_ms, 1)
+
+    @classmethod
+    def capture_page_timing(cls, driver, label):
+        """
+        通过一次 execute_script 读取当前页面的 Navigation Timing / Paint Timing 指标
+
+        Args:
+            driver: WebDriver 实例
+            label: 指标前缀，如 'navigate' -> navigate.ttfb / navigate.first_contentful_paint
+        """
+        cls._capture(driver, label, PAGE_TIMING_JS + 'return pageTiming();')
+
+    @classmethod
+    def mark(cls, driver, label):
+        """操作开始前在页面中打点（performance.mark），与 capture_action_timing 配合使用"""
+        if not cls.enabled:
+            return
+        try:
+            driver.execute_script(MARK_JS, f'perf:{label}')
+        except Exception:
+            pass
+
+    @classmethod
+    def capture_action_timing(cls, driver, label):
+        """
+        读取 mark() 之后的操作耗时
+
+        单页应用通过 pushState 切换路由时导航记录仍是最初的页面加载，不能代表本次操作，因此：
+        - 仍在打点的文档中：记录 <label>.api（打点到最后一个 XHR / fetch 响应结束）
+        - 打点已随旧页面销毁（整页跳转）：记录新页面的导航耗时 <label>.ttfb 等
+        """
+        cls._capture(driver, label, ACTION_TIMING_JS, f'perf:{label}')
+
+    @classmethod
+    def _capture(cls, driver, label, script, *args):
+        if not cls.enabled:
+            return
+        try:
+            timing = driver.execute_script(script, *args)
+        except Exception:
+            return
+        # eager 加载策略下 load 事件可能尚未发生（值为 0），record 会忽略；请求数不作为指标
+        for key, value in (timing or {}).items():
+            if key != 'requests':
+                cls.record(f'{label}.{key}', value)
+
+    @classmethod
+    def take(cls):
+        """取出并清空当前用例的指标"""
+        metrics, cls._current = cls._current, {}
+        return metrics
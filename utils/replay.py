@@ -0,0 +1,267 @@
+"""
+录制 / 回放模块（REPLAY_MODE=record / replay）
+
+在本地随机端口启动 HTTP 替身服务，并把 Config.BASE_URL 改写为本地地址：
+- record：请求转发到原始站点（BASE_URL 的源），页面、CSS、JS、XHR 响应按请求保存到回放包（Config.REPLAY_BUNDLE）
+- replay：只从回放包返回响应，不访问网络；未录制的请求返回 404 并记录警告
+响应中的原站点地址改写为本地地址，Set-Cookie 去掉 Domain / Secure 属性；可通过 REPLAY_LATENCY_MS 注入固定延迟
+
+回放包结构：index.json（请求 -> 状态码、响应头、响应体哈希）+ bodies/<sha1>（按内容去重的响应体）
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlencode, urlsplit
+from config.config import Config
+from utils.file_lock import FileLock
+from utils.logger import Logger
+
+# 不转发给原站点的请求头
+SKIPPED_REQUEST_HEADERS = {'host', 'connection', 'keep-alive', 'accept-encoding', 'content-length',
+                           'proxy-connection', 'upgrade-insecure-requests'}
+
+# 不保存的响应头：逐跳头部、已解压的编码，以及会阻止本地地址加载资源的安全策略
+SKIPPED_RESPONSE_HEADERS = {'connection', 'keep-alive', 'transfer-encoding', 'content-encoding', 'content-length',
+                            'strict-transport-security', 'content-security-policy', 'alt-svc'}
+
+TEXT_TYPES = ('text/', 'javascript', 'json', 'xml')
+
+
+def request_key(method, url, body=b''):
+    """
+    请求的回放键：方法 + 路径 + 排序后的查询参数（去掉 Config.REPLAY_IGNORE_PARAMS）+ 请求体哈希
+    """
+    parts = urlsplit(url)
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                   if k not in Config.REPLAY_IGNORE_PARAMS)
+    key = f"{method} {parts.path or '/'}" + (f"?{urlencode(query)}" if query else '')
+    if body:
+        key += f" #{hashlib.sha1(body).hexdigest()[:12]}"
+    return key
+
+
+def _local_cookie(value):
+    """去掉 Domain / Secure / SameSite 属性，使 Cookie 能写入本地地址"""
+    name_value, *attributes = value.split(';')
+    kept = [attr.strip() for attr in attributes
+            if attr.strip().split('=')[0].lower() not in ('domain', 'secure', 'samesite')]
+    return '; '.join([name_value.strip(), *kept])
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    """重定向原样录制，由浏览器跟随（Location 会改写为本地地址）"""
+
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class ReplayBundle:
+    """回放包：index.json + 按内容去重的响应体"""
+
+    def __init__(self, path):
+        self.path = path
+        self.index_file = path / 'index.json'
+        self.bodies_dir = path / 'bodies'
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except FileNotFoundError:
+            self.entries = {}
+        self._recorded = {}
+        self._bodies = {}
+
+    def get(self, key):
+        """
+        录制的响应
+
+        Returns:
+            (状态码, [[响应头, 值], ...], 响应体) ，未录制时返回 None
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        digest = entry['body']
+        if digest and digest not in self._bodies:
+            self._bodies[digest] = (self.bodies_dir / digest).read_bytes()
+        return entry['status'], entry['headers'], self._bodies.get(digest, b'')
+
+    def put(self, key, status, headers, body):
+        """保存响应（响应体立即写盘，索引在 save() 时合并写入）"""
+        digest = None
+        if body:
+            digest = hashlib.sha1(body).hexdigest()
+            body_file = self.bodies_dir / digest
+            if not body_file.exists():
+                self.bodies_dir.mkdir(parents=True, exist_ok=True)
+                tmp_file = body_file.with_name(f'{digest}.{os.getpid()}.{threading.get_ident()}.tmp')
+                tmp_file.write_bytes(body)
+                os.replace(tmp_file, body_file)
+        self._recorded[key] = self.entries[key] = {'status': status, 'headers': headers, 'body': digest}
+
+    def save(self):
+        """把本进程录制的响应合并写入 index.json（并行录制时多个进程依次合并）"""
+        if not self._recorded:
+            return
+        self.path.mkdir(parents=True, exist_ok=True)
+        with FileLock(self.path / 'index.lock'):
+            try:
+                with open(self.index_file, 'r', encoding='utf-8') as f:
+                    merged = json.load(f)
+            except FileNotFoundError:
+                merged = {}
+            merged.update(self._recorded)
+            tmp_file = self.index_file.with_name(f'index.json.{os.getpid()}.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(merged, f, ensure_ascii=False, indent=1, sort_keys=True)
+            os.replace(tmp_file, self.index_file)
+
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _handle(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        self.server.replay.handle(self, self.rfile.read(length) if length else b'')
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_HEAD = do_OPTIONS = _handle
+
+
+class ReplayServer:
+    """
+    录制 / 回放替身服务
+
+    使用示例：
+        server = ReplayServer('replay', Config.REPLAY_BUNDLE, 'https://aiot.aiysyd.cn').start()
+        Config.BASE_URL = server.rewrite(Config.BASE_URL)
+        ...
+        server.stop()
+    """
+
+    def __init__(self, mode, bundle_dir, upstream, latency_ms=0):
+        """
+        Args:
+            mode: record / replay
+            bundle_dir: 回放包目录
+            upstream: 原始站点的源，如 https://aiot.aiysyd.cn
+            latency_ms: 每个响应注入的延迟（毫秒）
+        """
+        self.mode = mode
+        self.bundle = ReplayBundle(bundle_dir)
+        self.upstream = upstream.rstrip('/')
+        self.latency = latency_ms / 1000
+        self.misses = []
+        self.logger = Logger().get_logger()
+        self._opener = urllib.request.build_opener(_NoRedirect)
+        self._server = None
+        self.origin = None
+
+    @classmethod
+    def from_config(cls):
+        """按 Config.REPLAY_MODE / REPLAY_BUNDLE / REPLAY_LATENCY_MS 创建，原始站点取 Config.BASE_URL 的源"""
+        parts = urlsplit(Config.BASE_URL)
+        return cls(Config.REPLAY_MODE, Config.REPLAY_BUNDLE, f'{parts.scheme}://{parts.netloc}',
+                   Config.REPLAY_LATENCY_MS)
+
+    def start(self):
+        if self.mode == 'replay' and not self.bundle.entries:
+            raise FileNotFoundError(f"回放包为空: {self.bundle.index_file}，请先以 REPLAY_MODE=record 运行一次")
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), _ReplayHandler)
+        self._server.daemon_threads = True
+        self._server.replay = self
+        self.origin = f'http://127.0.0.1:{self._server.server_address[1]}'
+        threading.Thread(target=self._server.serve_forever, name='replay-server', daemon=True).start()
+        self.logger.info("%s 服务已启动: %s -> %s（回放包 %s）",
+                         '录制' if self.mode == 'record' else '回放', self.origin, self.upstream, self.bundle.path)
+        return self
+
+    def stop(self):
+        """停止服务；录制模式下写入回放包索引"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self.mode == 'record':
+            self.bundle.save()
+        if self.misses:
+            self.logger.warning("回放未命中 %s 个请求: %s", len(self.misses), self.misses[:10])
+
+    def rewrite(self, url):
+        """把原始站点地址改写为本地服务地址"""
+        return url.replace(self.upstream, self.origin, 1) if url.startswith(self.upstream) else url
+
+    def _localize(self, headers, body):
+        """响应中的原站点地址改写为本地地址，Cookie 去掉 Domain / Secure 属性"""
+        localized = []
+        content_type = ''
+        for name, value in headers:
+            lower = name.lower()
+            if lower == 'location':
+                value = self.rewrite(value)
+            elif lower == 'set-cookie':
+                value = _local_cookie(value)
+            elif lower == 'content-type':
+                content_type = value.lower()
+            localized.append((name, value))
+        if body and any(kind in content_type for kind in TEXT_TYPES):
+            upstream = self.upstream.encode()
+            origin = self.origin.encode()
+            body = body.replace(upstream, origin).replace(upstream.replace(b'/', b'\\/'), origin.replace(b'/', b'\\/'))
+        return localized, body
+
+    def _fetch(self, handler, body):
+        """转发到原始站点，返回 (状态码, 响应头, 响应体)"""
+        headers = {}
+        for name, value in handler.headers.items():
+            if name.lower() in SKIPPED_REQUEST_HEADERS:
+                continue
+            if name.lower() in ('origin', 'referer'):
+                value = value.replace(self.origin, self.upstream)
+            headers[name] = value
+        headers['Accept-Encoding'] = 'identity'
+        request = urllib.request.Request(self.upstream + handler.path, data=body or None, headers=headers,
+                                         method=handler.command)
+        try:
+            with self._opener.open(request, timeout=Config.PAGE_LOAD_TIMEOUT) as response:
+                return response.status, list(response.headers.items()), response.read()
+        except urllib.error.HTTPError as e:
+            return e.code, list(e.headers.items()), e.read()
+
+    def handle(self, handler, body):
+        """处理一个请求（在服务线程中执行）"""
+        key = request_key(handler.command, handler.path, body)
+        if self.mode == 'record':
+            try:
+                status, headers, content = self._fetch(handler, body)
+            except (urllib.error.URLError, OSError) as e:
+                self.logger.error("录制请求失败: %s, 错误: %s", key, e)
+                status, headers, content = 502, [], str(e).encode()
+            else:
+                headers = [[name, value] for name, value in headers if name.lower() not in SKIPPED_RESPONSE_HEADERS]
+                self.bundle.put(key, status, headers, content)
+        else:
+            recorded = self.bundle.get(key)
+            if recorded is None:
+                self.misses.append(key)
+                self.logger.warning("回放未命中: %s", key)
+                status, headers, content = 404, [['Content-Type', 'text/plain; charset=utf-8']], b'replay miss'
+            else:
+                status, headers, content = recorded
+
+        if self.latency:
+            time.sleep(self.latency)
+        headers, content = self._localize(headers, content)
+        handler.send_response(status)
+        for name, value in headers:
+            handler.send_header(name, value)
+        handler.send_header('Content-Length', str(len(content)))
+        handler.end_headers()
+        if handler.command != 'HEAD':
+            handler.wfile.write(content)
@@ -1,11 +1,18 @@
 """
 截图工具模块
 提供测试失败时的截图功能
+
+截图数据在测试线程中获取后交给后台写盘线程处理，测试线程不再等待解码和磁盘 IO；
+写盘由 ScreenshotStore 完成（内容寻址去重、可选压缩、容量淘汰）
 """
-import os
-from datetime import datetime
+import atexit
+import base64
+import queue
+import threading
+import time
 from config.config import Config
 from utils.logger import Logger
+from utils.screenshot_store import ScreenshotStore
 
 
 class Screenshot:
@@ -13,32 +20,129 @@ class Screenshot:
     
     logger = Logger().get_logger()
     
-    @staticmethod
-    def take_screenshot(driver, test_name):
+    # 后台写盘：有界队列 + 固定数量的写盘线程
+    _queue = None
+    _workers = []
+    _lock = threading.Lock()
+    _store = None
+    
+    # 去重状态：当前用例、当前用例已保存的失败截图、(用例, 内容摘要) -> 文件路径
+    _current_test = None
+    _failure_paths = {}
+    _digests = {}
+    
+    # 统计：测试线程耗时、后台写盘耗时、截图数量、跳过的重复截图数量
+    stats = {'capture_seconds': 0.0, 'write_seconds': 0.0, 'saved': 0, 'skipped': 0}
+    _reported = 0
+    
+    @classmethod
+    def get_store(cls):
+        """获取截图存储（首次使用时按当前配置创建）"""
+        with cls._lock:
+            if cls._store is None:
+                cls._store = ScreenshotStore()
+            return cls._store
+    
+    @classmethod
+    def _ensure_workers(cls):
+        """按需启动后台写盘线程"""
+        with cls._lock:
+            if cls._queue is not None:
+                return
+            cls._queue = queue.Queue(maxsize=Config.SCREENSHOT_QUEUE_SIZE)
+            for i in range(Config.SCREENSHOT_WRITERS):
+                worker = threading.Thread(target=cls._write_loop, name=f'screenshot-writer-{i}', daemon=True)
+                worker.start()
+                cls._workers.append(worker)
+            atexit.register(cls.flush)
+    
+    @classmethod
+    def _write_loop(cls):
+        """后台线程：解码截图数据并写入截图存储"""
+        while True:
+            name, test_id, digest, encoded = cls._queue.get()
+            start = time.perf_counter()
+            try:
+                filepath = cls.get_store().put(base64.b64decode(encoded), name, test_id, digest)
+                cls.logger.info("截图已保存: %s -> %s", name, filepath)
+            except Exception as e:
+                cls.logger.error("截图写入失败: %s, 错误: %s", name, e)
+            finally:
+                with cls._lock:
+                    cls.stats['write_seconds'] += time.perf_counter() - start
+                cls._queue.task_done()
+    
+    @classmethod
+    def _submit(cls, name, test_id, digest, encoded, start):
+        """
+        把截图交给后台线程写盘（队列满时阻塞等待，起到背压作用）
+        
+        Returns:
+            截图对象文件路径
+        """
+        cls._ensure_workers()
+        cls._queue.put((name, test_id, digest, encoded))
+        with cls._lock:
+            cls.stats['saved'] += 1
+            cls.stats['capture_seconds'] += time.perf_counter() - start
+        return str(cls.get_store().object_path(digest))
+    
+    @classmethod
+    def set_current_test(cls, test_id):
+        """
+        设置当前用例，同一用例的重复截图会被去重
+        
+        Args:
+            test_id: 用例标识（如 pytest nodeid），None 表示不在用例中
+        """
+        cls._current_test = test_id
+        if test_id is None:
+            cls._failure_paths.clear()
+            cls._digests.clear()
+    
+    @classmethod
+    def take_screenshot(cls, driver, test_name, failure=False):
         """
         截取当前页面截图
         
         Args:
             driver: WebDriver 实例
             test_name: 测试用例名称
+            failure: 是否为失败截图；同一用例只保留第一张失败截图
         
         Returns:
-            截图文件路径
+            截图文件路径（文件由后台线程写入，调用 flush() 可等待写盘完成；
+            画面相同的截图共用同一个文件，清单见 reports/screenshots/manifest.jsonl）
         """
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"{test_name}_{timestamp}.png"
-        filepath = Config.SCREENSHOTS_DIR / filename
+        test_id = cls._current_test
+        if failure and test_id is not None and test_id in cls._failure_paths:
+            cls.stats['skipped'] += 1
+            return cls._failure_paths[test_id]
         
+        start = time.perf_counter()
         try:
-            driver.save_screenshot(str(filepath))
-            Screenshot.logger.info(f"截图已保存: {filepath}")
-            return str(filepath)
+            encoded = driver.get_screenshot_as_base64()
         except Exception as e:
-            Screenshot.logger.error(f"截图失败: {e}")
+            cls.logger.error("截图失败: %s", e)
             return None
+        digest = ScreenshotStore.digest(encoded)
+        
+        # 同一用例内画面完全相同的截图只登记一次
+        if test_id is not None:
+            key = (test_id, digest)
+            if key in cls._digests:
+                cls.stats['skipped'] += 1
+                return cls._digests[key]
+        
+        filepath = cls._submit(test_name, test_id, digest, encoded, start)
+        if test_id is not None:
+            cls._digests[key] = filepath
+            if failure:
+                cls._failure_paths[test_id] = filepath
+        return filepath
     
-    @staticmethod
-    def take_element_screenshot(element, test_name):
+    @classmethod
+    def take_element_screenshot(cls, element, test_name):
         """
         截取指定元素的截图
         
@@ -49,14 +153,34 @@ class Screenshot:
         Returns:
             截图文件路径
         """
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"{test_name}_element_{timestamp}.png"
-        filepath = Config.SCREENSHOTS_DIR / filename
-        
+        start = time.perf_counter()
         try:
-            element.screenshot(str(filepath))
-            Screenshot.logger.info(f"元素截图已保存: {filepath}")
-            return str(filepath)
+            encoded = element.screenshot_as_base64
         except Exception as e:
-            Screenshot.logger.error(f"元素截图失败: {e}")
+            cls.logger.error("元素截图失败: %s", e)
             return None
+        
+        return cls._submit(
+            f"{test_name}_element", cls._current_test, ScreenshotStore.digest(encoded), encoded, start
+        )
+    
+    @classmethod
+    def flush(cls):
+        """
+        等待所有截图写盘完成，并输出耗时统计
+        
+        Returns:
+            统计信息字典
+        """
+        if cls._queue is None:
+            return dict(cls.stats)
+        cls._queue.join()
+        stats = dict(cls.stats)
+        if stats['saved'] != cls._reported:
+            cls._reported = stats['saved']
+            cls.logger.info(
+                f"截图 {stats['saved']} 张（跳过重复 {stats['skipped']} 张），"
+                f"测试线程耗时 {stats['capture_seconds']:.3f}s，"
+                f"后台写盘耗时 {stats['write_seconds']:.3f}s（已从测试线程移出）"
+            )
+        return stats
@@ -0,0 +1,209 @@
+"""
+截图存储模块
+内容寻址存储：按截图内容的哈希保存，相同画面只保存一份；
+每次截图在清单中登记唯一名称，支持缩放、重新编码（WebP/JPEG）和按容量的 LRU 淘汰
+"""
+import base64
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from itertools import count
+from pathlib import Path
+from config.config import Config
+from utils.logger import Logger
+
+
+class ScreenshotStore:
+    """
+    内容寻址截图存储
+
+    目录结构：
+        reports/screenshots/
+        ├── objects/ab/cdef....png   # 按内容哈希保存的唯一截图
+        └── manifest.jsonl           # 截图清单，每行一条：用例 -> 截图名称 -> 对象文件
+
+    清单为追加写入的 JSON Lines，多个 xdist worker 同时写入也不会互相覆盖
+    """
+
+    logger = Logger().get_logger()
+
+    # Pillow 保存格式名称
+    _PIL_FORMATS = {'png': 'PNG', 'webp': 'WEBP', 'jpeg': 'JPEG'}
+
+    def __init__(self, root=None, image_format=None, quality=None, max_width=None, max_bytes=None):
+        """
+        初始化截图存储
+
+        Args:
+            root: 存储根目录，默认 Config.SCREENSHOTS_DIR
+            image_format: 保存格式 png / webp / jpeg，默认 Config.SCREENSHOT_FORMAT
+            quality: WebP / JPEG 压缩质量（1-100），默认 Config.SCREENSHOT_QUALITY
+            max_width: 最大宽度（像素），超出时等比缩小，0 表示不缩放
+            max_bytes: 存储容量上限（字节），超出时按最近使用时间淘汰，0 表示不限制
+        """
+        self.root = Path(root or Config.SCREENSHOTS_DIR)
+        self.objects_dir = self.root / 'objects'
+        self.manifest_file = self.root / 'manifest.jsonl'
+        self.quality = quality or Config.SCREENSHOT_QUALITY
+        self.max_width = Config.SCREENSHOT_MAX_WIDTH if max_width is None else max_width
+        self.max_bytes = Config.SCREENSHOT_STORE_MAX_MB * 1024 * 1024 if max_bytes is None else max_bytes
+        self.image_format = self._resolve_format((image_format or Config.SCREENSHOT_FORMAT).lower())
+        self._lock = threading.Lock()
+        self._seq = count(1)
+        self._total_bytes = None
+
+    def _resolve_format(self, image_format):
+        """确定实际保存格式：缩放或重新编码需要 Pillow，未安装时退回 PNG 原图"""
+        if image_format not in self._PIL_FORMATS:
+            raise ValueError(f"不支持的截图格式: {image_format}，支持：png, webp, jpeg")
+        if image_format == 'png' and not self.max_width:
+            return image_format
+        try:
+            import PIL  # noqa: F401
+        except ImportError:
+            self.logger.warning("未安装 Pillow，截图按 PNG 原图保存（pip install Pillow 后可缩放和压缩）")
+            self.max_width = 0
+            return 'png'
+        return image_format
+
+    @property
+    def extension(self):
+        return 'jpg' if self.image_format == 'jpeg' else self.image_format
+
+    def object_path(self, digest):
+        """内容哈希对应的对象文件路径"""
+        return self.objects_dir / digest[:2] / f'{digest[2:]}.{self.extension}'
+
+    @staticmethod
+    def digest(data):
+        """
+        计算截图内容哈希
+
+        统一对 base64 文本计算，测试线程拿到 WebDriver 返回的 base64 后无需解码即可得到哈希；
+        传入 PNG 字节时先编码为 base64，结果一致
+        """
+        if isinstance(data, bytes):
+            data = base64.b64encode(data)
+        else:
+            data = data.encode()
+        return hashlib.sha256(data).hexdigest()
+
+    def capture_name(self, name):
+        """生成唯一的截图名称：名称_毫秒时间戳_进程号_序号"""
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')[:-3]
+        return f"{name}_{timestamp}_{os.getpid()}_{next(self._seq)}"
+
+    def _encode(self, png_bytes):
+        """按配置缩放并重新编码，返回要写入磁盘的字节"""
+        if self.image_format == 'png' and not self.max_width:
+            return png_bytes
+        from PIL import Image
+        image = Image.open(io.BytesIO(png_bytes))
+        if self.max_width and image.width > self.max_width:
+            height = round(image.height * self.max_width / image.width)
+            image = image.resize((self.max_width, height), Image.LANCZOS)
+        if self.image_format == 'jpeg' and image.mode != 'RGB':
+            image = image.convert('RGB')
+        buffer = io.BytesIO()
+        options = {} if self.image_format == 'png' else {'quality': self.quality}
+        image.save(buffer, self._PIL_FORMATS[self.image_format], **options)
+        return buffer.getvalue()
+
+    def put(self, png_bytes, name, test_id=None, digest=None):
+        """
+        保存一次截图
+
+        Args:
+            png_bytes: PNG 截图字节
+            name: 截图名称（如 failed_test_login）
+            test_id: 所属用例（pytest nodeid）
+            digest: 预先计算好的内容哈希，默认对 png_bytes 计算
+
+        Returns:
+            对象文件路径
+        """
+        digest = digest or self.digest(png_bytes)
+        path = self.object_path(digest)
+        with self._lock:
+            if path.exists():
+                # 命中已有画面：刷新修改时间作为 LRU 的最近使用时间
+                os.utime(path)
+            else:
+                data = self._encode(png_bytes)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+                tmp_path.write_bytes(data)
+                os.replace(tmp_path, path)
+                self._add_bytes(len(data))
+            self._append_manifest({
+                'test': test_id,
+                'name': self.capture_name(name),
+                'object': digest,
+                'file': path.relative_to(self.root).as_posix(),
+                'time': datetime.now().isoformat(timespec='milliseconds'),
+            })
+        return path
+
+    def _append_manifest(self, entry):
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.manifest_file, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+    def _object_files(self):
+        if not self.objects_dir.exists():
+            return []
+        return [p for p in self.objects_dir.glob('*/*') if p.suffix != '.tmp']
+
+    def disk_usage(self):
+        """对象文件总字节数"""
+        return sum(p.stat().st_size for p in self._object_files())
+
+    def _add_bytes(self, size):
+        """累计容量，超出上限时淘汰最久未使用的对象（淘汰到上限的 90%）"""
+        if not self.max_bytes:
+            return
+        if self._total_bytes is None:
+            self._total_bytes = self.disk_usage()
+        else:
+            self._total_bytes += size
+        if self._total_bytes <= self.max_bytes:
+            return
+
+        files = sorted(self._object_files(), key=lambda p: p.stat().st_mtime)
+        self._total_bytes = sum(p.stat().st_size for p in files)
+        target = self.max_bytes * 0.9
+        evicted = 0
+        for path in files[:-1]:  # 至少保留刚写入的最新对象
+            if self._total_bytes <= target:
+                break
+            size = path.stat().st_size
+            path.unlink(missing_ok=True)
+            self._total_bytes -= size
+            evicted += 1
+        self.logger.info("截图存储超出容量上限，已淘汰 %s 个最久未使用的截图", evicted)
+
+    def captures(self, test_id=None):
+        """
+        读取清单
+
+        Args:
+            test_id: 只返回指定用例的截图，None 返回全部
+
+        Returns:
+            {用例: [清单条目]}，已被淘汰的截图不返回
+        """
+        result = {}
+        if not self.manifest_file.exists():
+            return result
+        with open(self.manifest_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                entry = json.loads(line)
+                if test_id is not None and entry['test'] != test_id:
+                    continue
+                if (self.root / entry['file']).exists():
+                    result.setdefault(entry['test'], []).append(entry)
+        return result
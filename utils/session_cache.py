@@ -0,0 +1,196 @@
+"""
+登录状态缓存模块
+每个进程（xdist worker）内按用户只通过 LoginPage 登录一次，保存 Cookie、localStorage、sessionStorage 快照，
+之后的用例把快照恢复到新建或驱动池中的浏览器，直接打开登录后的页面，跳过界面登录和提示框等待
+
+- 快照超过 Config.SESSION_CACHE_TTL 或其中的 Cookie 已过期时重新登录
+- 恢复后页面被重定向回登录页（服务端拒绝该会话）时自动重新登录并更新快照
+"""
+import json
+import threading
+import time
+from config.config import Config
+from utils.logger import Logger
+
+# 当前页面的源、地址和两种 Storage 内容
+CAPTURE_STORAGE_JS = """
+function dump(storage) {
+    var items = {};
+    for (var i = 0; i < storage.length; i++) {
+        var key = storage.key(i);
+        items[key] = storage.getItem(key);
+    }
+    return items;
+}
+return {origin: location.origin, url: location.href, local: dump(localStorage), session: dump(sessionStorage)};
+"""
+
+# 写入 Storage：arguments[0] 为 localStorage 内容，arguments[1] 为 sessionStorage 内容
+RESTORE_STORAGE_JS = """
+var local = arguments[0], session = arguments[1];
+Object.keys(local).forEach(function (key) { localStorage.setItem(key, local[key]); });
+Object.keys(session).forEach(function (key) { sessionStorage.setItem(key, session[key]); });
+"""
+
+# CDP 新文档脚本：在应用自身脚本执行前写入 Storage（只对快照所在源生效）
+RESTORE_ON_NEW_DOCUMENT_JS = """
+(function (snapshot) {
+    if (location.origin !== snapshot.origin) return;
+    Object.keys(snapshot.local).forEach(function (key) { localStorage.setItem(key, snapshot.local[key]); });
+    Object.keys(snapshot.session).forEach(function (key) { sessionStorage.setItem(key, snapshot.session[key]); });
+})(%s);
+"""
+
+
+class SessionCache:
+    """
+    登录状态快照缓存（进程内，按用户名）
+
+    使用示例：
+        SessionCache.open_logged_in(driver, 'jkcsdw', '123456')          # 打开登录后的首页
+        SessionCache.open_logged_in(driver, 'jkcsdw', '123456', url)     # 打开指定页面
+    """
+
+    logger = Logger().get_logger()
+
+    _snapshots = {}
+    _lock = threading.Lock()
+
+    # 统计：命中、界面登录、会话被拒后重新登录
+    stats = {'hits': 0, 'logins': 0, 'rejected': 0}
+
+    @classmethod
+    def capture(cls, driver, username):
+        """
+        保存当前浏览器的登录状态
+
+        Returns:
+            快照 {'user', 'origin', 'url', 'cookies', 'local', 'session', 'expires'}
+        """
+        storage = driver.execute_script(CAPTURE_STORAGE_JS)
+        cookies = driver.get_cookies()
+        expires = time.time() + Config.SESSION_CACHE_TTL
+        cookie_expiry = [cookie['expiry'] for cookie in cookies if cookie.get('expiry')]
+        if cookie_expiry:
+            expires = min(expires, min(cookie_expiry))
+        snapshot = {'user': username, 'cookies': cookies, 'expires': expires, **storage}
+        with cls._lock:
+            cls._snapshots[username] = snapshot
+        return snapshot
+
+    @classmethod
+    def get(cls, username):
+        """未过期的快照，没有或已过期时返回 None"""
+        with cls._lock:
+            snapshot = cls._snapshots.get(username)
+            if snapshot is not None and time.time() >= snapshot['expires']:
+                del cls._snapshots[username]
+                cls.logger.info("用户 %s 的登录状态快照已过期", username)
+                snapshot = None
+        return snapshot
+
+    @classmethod
+    def invalidate(cls, username=None):
+        """丢弃指定用户（默认全部）的快照"""
+        with cls._lock:
+            if username is None:
+                cls._snapshots.clear()
+            else:
+                cls._snapshots.pop(username, None)
+
+    @classmethod
+    def restore(cls, driver, snapshot, url=None):
+        """
+        把快照恢复到浏览器并打开页面
+
+        Chrome / Edge 通过 CDP 写入 Cookie，并注册新文档脚本在页面脚本执行前写入 Storage，只需一次页面加载；
+        其他浏览器先打开同源的轻量地址写入 Cookie 和 Storage，再打开目标页面
+
+        Args:
+            driver: WebDriver 实例
+            snapshot: capture() 返回的快照
+            url: 目标页面，默认登录后落地的页面
+        """
+        url = url or snapshot['url']
+        if hasattr(driver, 'execute_cdp_cmd'):
+            driver.execute_cdp_cmd('Network.setCookies', {'cookies': [
+                {**{k: v for k, v in cookie.items() if k != 'expiry'},
+                 **({'expires': cookie['expiry']} if cookie.get('expiry') else {}),
+                 'url': snapshot['origin']}
+                for cookie in snapshot['cookies']
+            ]})
+            script = driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
+                'source': RESTORE_ON_NEW_DOCUMENT_JS % json.dumps(
+                    {key: snapshot[key] for key in ('origin', 'local', 'session')}, ensure_ascii=False
+                )
+            })
+            try:
+                driver.get(url)
+            finally:
+                driver.execute_cdp_cmd('Page.removeScriptToEvaluateOnNewDocument',
+                                       {'identifier': script['identifier']})
+            return
+
+        # 同源下不存在的资源也能建立该源的文档，足以写入 Cookie 和 Storage
+        driver.get(f"{snapshot['origin']}/favicon.ico")
+        for cookie in snapshot['cookies']:
+            driver.add_cookie({k: v for k, v in cookie.items() if k in ('name', 'value', 'path', 'domain',
+                                                                      'secure', 'httpOnly', 'expiry', 'sameSite')})
+        driver.execute_script(RESTORE_STORAGE_JS, snapshot['local'], snapshot['session'])
+        driver.get(url)
+
+    @staticmethod
+    def is_rejected(driver):
+        """恢复后被重定向回登录页，说明服务端不再接受该会话"""
+        return driver.current_url.split('?')[0] == Config.BASE_URL.split('?')[0]
+
+    @classmethod
+    def login(cls, driver, username, password):
+        """
+        通过 LoginPage 界面登录并保存快照
+
+        Returns:
+            快照
+        """
+        from pages.login_page import LoginPage
+
+        login_page = LoginPage(driver)
+        login_page.navigate_to_login()
+        login_page.login(username, password)
+        if not login_page.is_login_successful():
+            raise RuntimeError(f"用户 {username} 登录失败，无法建立登录状态快照")
+        # 登录成功提示出现后页面才跳转，等落地页加载后再保存（落地页地址作为之后的默认目标页面）
+        login_page.waiter.check(lambda d: d.current_url != login_page.url, timeout=Config.EXPLICIT_WAIT)
+        cls.stats['logins'] += 1
+        cls.logger.info("用户 %s 界面登录完成，保存登录状态快照", username)
+        return cls.capture(driver, username)
+
+    @classmethod
+    def open_logged_in(cls, driver, username, password, url=None):
+        """
+        以指定用户的登录状态打开页面：有可用快照时恢复快照，否则界面登录
+
+        Args:
+            driver: WebDriver 实例（新建或驱动池重置后的浏览器）
+            username: 用户名
+            password: 密码
+            url: 目标页面，默认登录后落地的页面
+
+        Returns:
+            WebDriver 实例
+        """
+        snapshot = cls.get(username) if Config.SESSION_CACHE_ENABLED else None
+        if snapshot is not None:
+            cls.restore(driver, snapshot, url)
+            if not cls.is_rejected(driver):
+                cls.stats['hits'] += 1
+                return driver
+            cls.stats['rejected'] += 1
+            cls.logger.warning("用户 %s 的登录状态快照被拒绝，重新登录", username)
+            cls.invalidate(username)
+            driver.delete_all_cookies()
+
+        cls.login(driver, username, password)
+        if url and driver.current_url != url:
+            driver.get(url)
+        return driver
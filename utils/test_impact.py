@@ -0,0 +1,537 @@
+"""
+用例影响分析模块（pytest.ini 中通过 -p utils.test_impact 加载运行时追踪插件）
+
+依赖索引由两部分组成：
+    1. 静态分析：解析用例文件的 import 和 get_test_data('<module>') 调用，
+       得到每个用例函数依赖的页面对象、定位器、工具模块（含传递依赖、conftest）和数据文件
+    2. 运行时追踪（pytest --impact-trace）：记录每个用例实际调用的 BasePage 方法和使用的定位器，
+       保存在 reports/test_impact.json
+
+选择规则（run_tests.py changed --since <git-ref>）：
+    - 改动的文件不在用例的静态依赖中 → 不受影响
+    - pages/ locators/ 中只改动了某些方法或定位器，且用例有运行时记录 → 只有调用过这些方法/定位器的用例受影响
+    - 其他情况（模块级代码改动、页面类的属性改动、改动的方法无法追踪、无运行时记录）→ 按文件级依赖判定
+    - 改动了项目根目录下的配置文件（requirements.txt、pytest.ini 等）→ 全部用例受影响
+"""
+import ast
+import functools
+import json
+import subprocess
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+import pytest
+from config.config import Config
+
+PROJECT_ROOT = Config.BASE_DIR
+INDEX_FILE = Config.REPORTS_DIR / 'test_impact.json'
+# 追踪记录中保存可追踪符号全集的键：改动的符号不在其中时（如页面类以外的类、魔术方法、新增方法）按文件级依赖判定
+TRACED_KEY = '__traced__'
+
+# 获取测试数据的函数名，第一个字符串参数为数据模块名
+DATA_FUNCTIONS = {'get_test_data', 'get_sharded_test_data', 'iter_test_data', 'load_test_data', 'load_sharded_test_data'}
+# 支持按方法/定位器细分的目录
+SYMBOL_DIRS = ('pages', 'locators')
+# 不影响用例执行的文件后缀
+IGNORED_SUFFIXES = {'.md', '.txt', '.rst'}
+# 影响全部用例的文件（依赖、pytest 配置）
+GLOBAL_FILES = {'requirements.txt', 'pytest.ini', 'setup.cfg', 'pyproject.toml', 'conftest.py'}
+
+
+def _relative(path) -> str:
+    return Path(path).resolve().relative_to(PROJECT_ROOT).as_posix()
+
+
+# ---------- 静态分析 ----------
+
+def _module_file(module: str) -> Optional[Path]:
+    """项目内模块名 -> 文件路径，第三方模块返回 None"""
+    base = PROJECT_ROOT.joinpath(*module.split('.'))
+    for candidate in (base.with_suffix('.py'), base / '__init__.py'):
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+def _resolve_from(node: ast.ImportFrom, current: Path) -> str:
+    """处理相对导入，返回绝对模块名"""
+    if not node.level:
+        return node.module or ''
+    package = Path(current).resolve().parent
+    for _ in range(node.level - 1):
+        package = package.parent
+    parts = list(package.relative_to(PROJECT_ROOT).parts)
+    return '.'.join(parts + ([node.module] if node.module else []))
+
+
+def _import_table(tree: ast.AST, current: Path) -> Dict[str, Path]:
+    """模块中所有导入：{绑定的名称: 项目内文件}"""
+    table = {}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                path = _module_file(alias.name)
+                if path:
+                    table[alias.asname or alias.name.split('.')[0]] = path
+        elif isinstance(node, ast.ImportFrom):
+            module = _resolve_from(node, current)
+            for alias in node.names:
+                # from package import submodule 时依赖子模块，否则依赖模块本身
+                path = _module_file(f'{module}.{alias.name}') or _module_file(module)
+                if path:
+                    table[alias.asname or alias.name] = path
+    return table
+
+
+@functools.lru_cache(maxsize=None)
+def _parse(path: Path) -> ast.AST:
+    return ast.parse(Path(path).read_text(encoding='utf-8'), filename=str(path))
+
+
+@functools.lru_cache(maxsize=None)
+def module_closure(path: Path) -> frozenset:
+    """文件及其传递导入的所有项目内文件"""
+    seen, stack = set(), [Path(path).resolve()]
+    while stack:
+        current = stack.pop()
+        if current in seen:
+            continue
+        seen.add(current)
+        stack.extend(p.resolve() for p in _import_table(_parse(current), current).values())
+    return frozenset(seen)
+
+
+def _data_modules(node: ast.AST) -> Set[str]:
+    """节点中 get_test_data('<module>', ...) 等调用引用的数据模块名"""
+    modules = set()
+    for call in ast.walk(node):
+        if not isinstance(call, ast.Call):
+            continue
+        func = call.func
+        name = func.id if isinstance(func, ast.Name) else func.attr if isinstance(func, ast.Attribute) else None
+        if name in DATA_FUNCTIONS and call.args and isinstance(call.args[0], ast.Constant):
+            modules.add(str(call.args[0].value))
+    return modules
+
+
+def _data_files(modules: Iterable[str]) -> Set[str]:
+    """数据模块名 -> 所有格式的数据文件（新增高优先级格式的文件也算改动）"""
+    from test_data.test_data_config import TestDataConfig
+    index = TestDataConfig.get_registry().index()
+    return {_relative(path) for (module, _), path in index.items() if module in modules}
+
+
+def _conftests(test_file: Path) -> List[Path]:
+    """用例文件所在目录直到项目根目录的所有 conftest.py"""
+    found = []
+    directory = test_file.resolve().parent
+    while True:
+        candidate = directory / 'conftest.py'
+        if candidate.is_file():
+            found.append(candidate)
+        if directory == PROJECT_ROOT or PROJECT_ROOT not in directory.parents:
+            break
+        directory = directory.parent
+    return found
+
+
+def _test_functions(tree: ast.Module):
+    """遍历用例函数，产出 (测试 ID 后缀, 函数节点, 所在类节点)"""
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name.startswith('test'):
+            yield node.name, node, None
+        elif isinstance(node, ast.ClassDef) and node.name.startswith('Test'):
+            for item in node.body:
+                if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)) and item.name.startswith('test'):
+                    yield f'{node.name}::{item.name}', item, node
+
+
+def build_static_index(test_root=None) -> Dict[str, dict]:
+    """
+    静态分析用例依赖
+
+    Args:
+        test_root: 用例目录，默认 test_cases/（跳过 examples 示例目录）
+
+    Returns:
+        {用例函数 ID: {'files': [依赖文件], 'data': [数据文件]}}
+    """
+    test_root = Path(test_root or PROJECT_ROOT / 'test_cases')
+    index = {}
+    for test_file in sorted(test_root.rglob('test_*.py')):
+        if any(part.startswith('examples') for part in test_file.relative_to(test_root).parts):
+            continue
+        tree = _parse(test_file.resolve())
+        imports = _import_table(tree, test_file)
+        shared = {test_file.resolve()}
+        for conftest in _conftests(test_file):
+            shared |= module_closure(conftest.resolve())
+
+        for name, func, cls in _test_functions(tree):
+            # 函数体、装饰器和所在类（含类装饰器）中引用的名称
+            scopes = [func] + ([cls] if cls is not None else [])
+            used = {n.id for scope in scopes for n in ast.walk(scope) if isinstance(n, ast.Name)}
+            files = set(shared)
+            for used_name in used & imports.keys():
+                files |= module_closure(imports[used_name].resolve())
+            index[f'{_relative(test_file)}::{name}'] = {
+                'files': sorted(_relative(path) for path in files),
+                'data': sorted(_data_files(set().union(*(_data_modules(scope) for scope in scopes)))),
+            }
+    return index
+
+
+# ---------- 改动分析 ----------
+
+def _git(*args) -> str:
+    return subprocess.run(
+        ['git', '-c', 'core.quotepath=off', *args], cwd=PROJECT_ROOT, capture_output=True, text=True, encoding='utf-8', check=True
+    ).stdout
+
+
+def changed_files(since: str, until: Optional[str] = None) -> List[str]:
+    """
+    改动的文件列表
+
+    Args:
+        since: 起始 git 引用
+        until: 结束 git 引用，None 表示当前工作区（含未提交改动和未跟踪文件）
+    """
+    files = set(_git('diff', '--name-only', since, *([until] if until else [])).splitlines())
+    if until is None:
+        files |= set(_git('ls-files', '--others', '--exclude-standard').splitlines())
+    return sorted(filter(None, files))
+
+
+def _source_at(path: str, ref: Optional[str]) -> Optional[str]:
+    """读取文件在指定引用（None 为工作区）下的内容，不存在返回 None"""
+    try:
+        if ref is None:
+            return (PROJECT_ROOT / path).read_text(encoding='utf-8')
+        return _git('show', f'{ref}:{path}')
+    except (FileNotFoundError, subprocess.CalledProcessError):
+        return None
+
+
+def _is_locator(value: ast.AST) -> bool:
+    """二元组字面量，如 (By.ID, "tab-password")"""
+    return isinstance(value, ast.Tuple) and len(value.elts) == 2
+
+
+def _symbols(source: str, locator_attrs: bool = False):
+    """
+    拆分模块：类中的方法按 "类.名称" 单独记录，其余代码合并为一项
+
+    运行时追踪只记录方法调用和定位器取值，因此只有 locators/ 中的定位器属性（locator_attrs=True）单独记录；
+    其他类属性（如页面类中的脚本、超时配置、定位器别名）改动时按文件级依赖判定
+
+    Returns:
+        ({符号: 语法树转储}, 模块级代码转储)
+    """
+    symbols, other = {}, []
+    for node in ast.parse(source).body:
+        if isinstance(node, ast.ClassDef):
+            for item in node.body:
+                if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    # property 的 getter / setter 同名，合并为一个符号
+                    key = f'{node.name}.{item.name}'
+                    symbols[key] = symbols.get(key, '') + ast.dump(item)
+                elif (locator_attrs and isinstance(item, ast.Assign) and _is_locator(item.value)
+                      and all(isinstance(t, ast.Name) for t in item.targets)):
+                    for target in item.targets:
+                        symbols[f'{node.name}.{target.id}'] = ast.dump(item.value)
+                elif not isinstance(item, ast.Expr):  # 忽略文档字符串
+                    other.append(ast.dump(item))
+            other.append(ast.dump(ast.ClassDef(
+                name=node.name, bases=node.bases, keywords=node.keywords, body=[], decorator_list=node.decorator_list
+            )))
+        elif not (isinstance(node, ast.Expr) and isinstance(node.value, ast.Constant)):
+            other.append(ast.dump(node))
+    return symbols, other
+
+
+def changed_symbols(path: str, since: str, until: Optional[str] = None) -> Optional[Set[str]]:
+    """
+    pages/ locators/ 文件中改动的方法和定位器（"文件::类.名称"）
+
+    Returns:
+        改动的符号集合；模块级代码或非定位器属性改动、新增/删除文件或无法解析时返回 None（按文件级依赖判定）
+    """
+    old, new = _source_at(path, since), _source_at(path, until)
+    if old is None or new is None:
+        return None
+    locator_attrs = path.split('/')[0] == 'locators'
+    try:
+        old_symbols, old_other = _symbols(old, locator_attrs)
+        new_symbols, new_other = _symbols(new, locator_attrs)
+    except SyntaxError:
+        return None
+    if old_other != new_other:
+        return None
+    names = old_symbols.keys() | new_symbols.keys()
+    return {f'{path}::{name}' for name in names if old_symbols.get(name) != new_symbols.get(name)}
+
+
+# ---------- 选择 ----------
+
+def load_trace() -> Dict[str, List[str]]:
+    """运行时追踪记录 {用例函数 ID: [符号]}"""
+    try:
+        with open(INDEX_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def select_impacted(since: str, until: Optional[str] = None, static_index=None, trace=None,
+                    changes: Optional[List[str]] = None) -> Dict[str, str]:
+    """
+    选出受改动影响的用例函数
+
+    Args:
+        since: 起始 git 引用
+        until: 结束 git 引用，None 表示当前工作区
+        static_index: 静态依赖索引，默认重新分析
+        trace: 运行时追踪记录，默认读取 reports/test_impact.json
+        changes: 只考虑这些改动的文件，默认为 since..until 之间的所有改动
+
+    Returns:
+        {用例函数 ID: 受影响原因}
+    """
+    changes = changed_files(since, until) if changes is None else changes
+    if any(path in GLOBAL_FILES for path in changes):
+        return {test: '项目配置改动' for test in (build_static_index() if static_index is None else static_index)}
+    changes = [path for path in changes if Path(path).suffix not in IGNORED_SUFFIXES]
+
+    # pages/ locators/ 下只改动了方法或定位器的文件：{文件: 改动的符号}
+    symbol_changes = {}
+    for path in changes:
+        if path.endswith('.py') and path.split('/')[0] in SYMBOL_DIRS:
+            symbols = changed_symbols(path, since, until)
+            if symbols is not None:
+                symbol_changes[path] = symbols
+    return match_impacted(
+        changes, symbol_changes,
+        build_static_index() if static_index is None else static_index,
+        load_trace() if trace is None else trace,
+    )
+
+
+def match_impacted(changes: List[str], symbol_changes: Dict[str, Set[str]], static_index, trace) -> Dict[str, str]:
+    """
+    按改动的文件和符号匹配用例
+
+    Args:
+        changes: 改动的文件
+        symbol_changes: {文件: 改动的符号}，不在其中的文件按文件级依赖判定
+        static_index: 静态依赖索引
+        trace: 运行时追踪记录（含 TRACED_KEY 可追踪符号全集）
+
+    Returns:
+        {用例函数 ID: 受影响原因}
+    """
+    traceable = set(trace.get(TRACED_KEY, ()))
+    impacted = {}
+    for test, deps in static_index.items():
+        touched = set(deps['files'] + deps['data'])
+        for path in changes:
+            if path not in touched:
+                continue
+            symbols = symbol_changes.get(path)
+            # 有无法追踪的符号时，追踪记录里不会出现它，只能按文件判定
+            if symbols is None or test not in trace or not symbols <= traceable:
+                impacted[test] = path
+                break
+            hit = symbols & set(trace[test])
+            if hit:
+                impacted[test] = sorted(hit)[0]
+                break
+    return impacted
+
+
+def estimate_seconds(tests: Iterable[str], store=None) -> float:
+    """按历史耗时估算用例函数（含所有参数化实例）的总耗时"""
+    from utils.duration_store import DurationStore
+    store = store or DurationStore()
+    total = 0.0
+    for test in tests:
+        matched = [v for nodeid, v in store.durations.items() if nodeid == test or nodeid.startswith(test + '[')]
+        total += sum(matched) if matched else store.default_duration()
+    return total
+
+
+# ---------- 运行时追踪插件 ----------
+
+_trace_results = {}   # 主控进程汇总：用例函数 ID -> 符号集合
+_trace_failed = set() # 有参数化实例失败的用例函数（记录可能不完整，与已有记录合并）
+_current = None       # 当前用例记录到的符号
+
+
+def _locator_symbols() -> Dict[tuple, Set[str]]:
+    """定位器取值 -> 定义位置（locators/ 下所有类的二元组属性）"""
+    import importlib
+    mapping = {}
+    for path in sorted((PROJECT_ROOT / 'locators').glob('*.py')):
+        if path.name == '__init__.py':
+            continue
+        module = importlib.import_module(f'locators.{path.stem}')
+        for cls_name, cls in vars(module).items():
+            if not isinstance(cls, type) or cls.__module__ != module.__name__:
+                continue
+            for attr, value in vars(cls).items():
+                if isinstance(value, tuple) and len(value) == 2:
+                    mapping.setdefault(value, set()).add(f'{_relative(path)}::{cls_name}.{attr}')
+    return mapping
+
+
+def _locators_in(value, depth=2):
+    """参数中出现的定位器（query_many 的 spec 中定位器嵌套在字典和元组里）"""
+    if isinstance(value, tuple) and len(value) == 2 and all(isinstance(v, str) for v in value):
+        yield value
+    elif depth > 0 and isinstance(value, (tuple, list)):
+        for item in value:
+            yield from _locators_in(item, depth - 1)
+    elif depth > 0 and isinstance(value, dict):
+        for item in value.values():
+            yield from _locators_in(item, depth - 1)
+
+
+def _page_classes():
+    """pages/ 下所有模块中的 BasePage 及其子类"""
+    import importlib
+    import pkgutil
+    for module_info in pkgutil.iter_modules([str(PROJECT_ROOT / 'pages')]):
+        importlib.import_module(f'pages.{module_info.name}')
+    from pages.base_page import BasePage
+    classes, stack = [], [BasePage]
+    while stack:
+        cls = stack.pop()
+        classes.append(cls)
+        stack.extend(cls.__subclasses__())
+    return classes
+
+
+def _traceable_members(cls):
+    """类中可追踪的成员（普通方法、staticmethod、classmethod、property），产出 (符号, 名称, 成员)"""
+    import inspect
+    path = _relative(inspect.getfile(cls))
+    for name, member in list(vars(cls).items()):
+        if not name.startswith('__') and (inspect.isfunction(member)
+                                          or isinstance(member, (staticmethod, classmethod, property))):
+            yield f'{path}::{cls.__name__}.{name}', name, member
+
+
+def traceable_symbols() -> Set[str]:
+    """运行时追踪能够记录到的全部符号：页面类的方法和 locators/ 下的定位器"""
+    symbols = {symbol for cls in _page_classes() for symbol, _, _ in _traceable_members(cls)}
+    for locator_symbols in _locator_symbols().values():
+        symbols |= locator_symbols
+    return symbols
+
+
+def _install_tracer():
+    """包装 BasePage 及其子类中定义的方法（含 staticmethod / classmethod / property），记录调用的方法和使用的定位器"""
+    locators = _locator_symbols()
+
+    def wrap(symbol, func, skip=1):
+        """skip: 位置参数中不检查定位器的个数（self / cls）"""
+        if func is None or getattr(func, '__impact_traced__', False):
+            return func
+
+        @functools.wraps(func)
+        def traced(*args, **kwargs):
+            if _current is not None:
+                _current.add(symbol)
+                for value in list(args[skip:]) + list(kwargs.values()):
+                    for locator in _locators_in(value):
+                        _current.update(locators.get(locator, ()))
+            return func(*args, **kwargs)
+        traced.__impact_traced__ = True
+        return traced
+
+    for cls in _page_classes():
+        for symbol, name, member in _traceable_members(cls):
+            if isinstance(member, staticmethod):
+                member = staticmethod(wrap(symbol, member.__func__, skip=0))
+            elif isinstance(member, classmethod):
+                member = classmethod(wrap(symbol, member.__func__))
+            elif isinstance(member, property):
+                member = property(wrap(symbol, member.fget), wrap(symbol, member.fset), wrap(symbol, member.fdel),
+                                  member.__doc__)
+            else:
+                member = wrap(symbol, member)
+            setattr(cls, name, member)
+
+
+def _function_id(nodeid: str) -> str:
+    """节点 ID 去掉参数化部分和 xdist 分组后缀，得到用例函数 ID"""
+    from utils.duration_store import DurationStore
+    return DurationStore.normalize(nodeid).split('[')[0]
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        '--impact-trace',
+        action='store_true',
+        default=False,
+        help='记录每个用例调用的页面方法和定位器，写入 reports/test_impact.json（供 run_tests.py changed 使用）'
+    )
+
+
+def pytest_collection_finish(session):
+    if session.config.getoption('--impact-trace') and not session.config.option.collectonly:
+        _install_tracer()
+
+
+def _trace_phase(item):
+    """记录一个执行阶段中调用的符号（用例的 call 报告包含 setup 阶段追加的记录）"""
+    global _current
+    if not item.config.getoption('--impact-trace'):
+        yield
+        return
+    _current = set()
+    try:
+        yield
+    finally:
+        item.user_properties.append(('impact_symbols', sorted(_current)))
+        _current = None
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_setup(item):
+    """fixture 在 setup 阶段调用的页面方法（如 logged_in_driver 中的 LoginPage.login）"""
+    yield from _trace_phase(item)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    yield from _trace_phase(item)
+
+
+def pytest_runtest_logreport(report):
+    """汇总各 worker 上报的追踪记录（同一用例函数的多个参数化实例合并）"""
+    if report.when != 'call':
+        return
+    for name, value in report.user_properties:
+        if name == 'impact_symbols':
+            _trace_results.setdefault(_function_id(report.nodeid), set()).update(value)
+            if report.failed:
+                _trace_failed.add(_function_id(report.nodeid))
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """
+    合并写入追踪记录（xdist 模式下只由主控进程写入）
+
+    通过的用例以本次记录替换旧记录；失败的用例在失败处之后的调用没有记录，与旧记录合并，避免之后漏选
+    """
+    if hasattr(session.config, 'workerinput') or not _trace_results:
+        return
+    trace = load_trace()
+    for test, symbols in _trace_results.items():
+        if test in _trace_failed:
+            symbols = symbols | set(trace.get(test, ()))
+        trace[test] = sorted(symbols)
+    trace[TRACED_KEY] = sorted(traceable_symbols())
+    INDEX_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with open(INDEX_FILE, 'w', encoding='utf-8') as f:
+        json.dump(trace, f, ensure_ascii=False, indent=2, sort_keys=True)
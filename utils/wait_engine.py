@@ -0,0 +1,127 @@
+"""
+等待引擎模块
+统一负责页面对象中的所有等待：隐式等待固定为 0，显式等待使用自适应退避轮询
+"""
+import time
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+)
+from config.config import Config
+from utils.instrumentation import Instrumentation
+
+
+class WaitEngine:
+    """
+    统一等待引擎
+
+    - 每个页面对象持有一个可复用的实例，不再为每次调用新建 WebDriverWait
+    - 轮询间隔从 poll_interval 开始按 backoff 倍数递增，最大不超过 max_poll_interval，
+      元素很快出现时响应及时，长时间等待时减少对 WebDriver 的请求次数
+    - 超时优先级：调用时显式传入 > 定位器超时预算 > 默认超时
+
+    使用示例：
+        waiter = WaitEngine(driver, budgets={LoginPageLocators.PROMPT_MESSAGE: 3})
+        element = waiter.until(EC.presence_of_element_located(locator), locator=locator)
+    """
+
+    IGNORED_EXCEPTIONS = (NoSuchElementException, StaleElementReferenceException)
+
+    def __init__(self, driver, timeout=None, poll_interval=None, max_poll_interval=None,
+                 backoff=None, budgets=None):
+        """
+        初始化等待引擎
+
+        Args:
+            driver: WebDriver 实例
+            timeout: 默认超时时间（秒），默认读取 Config.EXPLICIT_WAIT
+            poll_interval: 初始轮询间隔（秒），默认读取 Config.WAIT_POLL_INTERVAL
+            max_poll_interval: 最大轮询间隔（秒），默认读取 Config.WAIT_MAX_POLL_INTERVAL
+            backoff: 轮询间隔递增倍数，默认读取 Config.WAIT_BACKOFF
+            budgets: 定位器超时预算 {locator: 秒}
+        """
+        self.driver = driver
+        self.timeout = Config.EXPLICIT_WAIT if timeout is None else timeout
+        self.poll_interval = Config.WAIT_POLL_INTERVAL if poll_interval is None else poll_interval
+        self.max_poll_interval = Config.WAIT_MAX_POLL_INTERVAL if max_poll_interval is None else max_poll_interval
+        self.backoff = Config.WAIT_BACKOFF if backoff is None else backoff
+        self.budgets = dict(budgets or {})
+
+    def budget_for(self, locator=None, timeout=None):
+        """
+        计算本次等待的超时时间
+
+        Args:
+            locator: 元素定位器
+            timeout: 调用时显式传入的超时时间
+
+        Returns:
+            超时时间（秒）
+        """
+        if timeout is not None:
+            return timeout
+        if locator is not None and locator in self.budgets:
+            return self.budgets[locator]
+        return self.timeout
+
+    def _poll(self, method, timeout, locator, expect_truthy):
+        """轮询 method 直到结果满足期望，返回 (是否满足, 最后一次结果)"""
+        deadline = time.monotonic() + self.budget_for(locator, timeout)
+        interval = self.poll_interval
+        name = getattr(method, '__qualname__', type(method).__name__).split('.')[0]
+        with Instrumentation.waiting(name, locator) as span:
+            while True:
+                try:
+                    value = method(self.driver)
+                except self.IGNORED_EXCEPTIONS:
+                    value = False
+                span['polls'] = span.get('polls', 0) + 1
+                if bool(value) == expect_truthy:
+                    span['ok'] = True
+                    return True, value
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False, value
+                time.sleep(min(interval, remaining))
+                interval = min(interval * self.backoff, self.max_poll_interval)
+
+    def until(self, method, message='', timeout=None, locator=None):
+        """
+        等待 method(driver) 返回真值，超时抛出 TimeoutException
+
+        Args:
+            method: 等待条件，如 expected_conditions 中的条件
+            message: 超时异常信息
+            timeout: 超时时间（秒），0 表示只检查一次
+            locator: 元素定位器，用于查找超时预算
+
+        Returns:
+            method 的返回值
+        """
+        ok, value = self._poll(method, timeout, locator, expect_truthy=True)
+        if not ok:
+            raise TimeoutException(message)
+        return value
+
+    def until_not(self, method, message='', timeout=None, locator=None):
+        """
+        等待 method(driver) 返回假值，超时抛出 TimeoutException
+
+        Returns:
+            method 的返回值
+        """
+        ok, value = self._poll(method, timeout, locator, expect_truthy=False)
+        if not ok:
+            raise TimeoutException(message)
+        return value
+
+    def check(self, method, timeout=None, locator=None):
+        """
+        在超时时间内等待条件成立，不抛异常
+
+        Returns:
+            条件成立时返回 method 的返回值，否则返回 False
+        """
+        ok, value = self._poll(method, timeout, locator, expect_truthy=True)
+        return value if ok else False